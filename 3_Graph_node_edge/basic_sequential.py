@@ -39,4 +39,5 @@ def run_graph():
     result = app.invoke({"input": "테스트", "output": "", "step": 0})
     return result
 
-print(run_graph())
\ No newline at end of file
+if __name__ == "__main__":
+    print(run_graph())
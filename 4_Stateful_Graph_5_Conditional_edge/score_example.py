@@ -1,7 +1,26 @@
 # 필요한 라이브러리를 가져옵니다.
+import re
+import sys
+from pathlib import Path
 from typing import TypedDict
 from langgraph.graph import StateGraph, END
 
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.subject_index import SubjectIndex
+
+# 과목명 정규화 인덱스: 동의어("kor", "math")와 오타("수핵", "국 어")도 정식 과목명으로 바꿉니다.
+subject_index = SubjectIndex({
+    "국어": ["korean", "kor"],
+    "수학": ["math", "mathematics"],
+})
+
+# 점수(숫자)를 찾는 패턴. 나머지 텍스트를 과목명으로 봅니다. (예: "국 어 85점")
+# 부호와 소수점까지 숫자 전체를 잡아서, "85.5" / "-5" / "1000" 이 일부 숫자만 떼어져 채점되지 않게 합니다.
+SCORE_PATTERN = re.compile(r"(?<![\d.])([+-]?\d+(?:\.\d+)?)\s*점?(?![\d.])")
+# 과목명에 남아 있으면 안 되는 문자 (두 번째 숫자, 부호)
+INVALID_SUBJECT_PATTERN = re.compile(r"[\d+-]")
+
 # --- 1. State 정의 ---
 # 그래프 전체에서 공유될 데이터의 형태를 정의합니다.
 class GradeReportState(TypedDict):
@@ -17,16 +36,17 @@ def input_parser_node(state: GradeReportState) -> dict:
     print("🧠 1. 입력 분석 노드 실행!")
     raw_input = state['raw_input']
     
-    try:
-        # 공백을 기준으로 입력을 분리합니다.
-        parts = raw_input.split()
-        subject = parts[0]
-        score = int(parts[1])
-        print(f"   - 분석 완료: 과목='{subject}', 점수={score}")
-        return {"subject": subject, "score": score}
-    except (IndexError, ValueError):
+    # 점수를 찾고, 점수를 뺀 나머지를 과목명으로 사용합니다. (과목명 안의 공백 허용)
+    # 점수는 0~100 의 정수만 받고, 과목명에 숫자나 부호가 남으면 오타 보정 전에 거절합니다.
+    match = SCORE_PATTERN.search(raw_input)
+    subject = (raw_input[:match.start()] + raw_input[match.end():]).strip() if match else ""
+    number = match.group(1) if match else ""
+    if not subject or INVALID_SUBJECT_PATTERN.search(subject) or not number.isdigit() or int(number) > 100:
         # "국어 85" 형식이 아닐 경우 에러 처리
         return {"subject": "error", "result": "입력 형식 오류입니다. '과목 점수' 형태로 입력해주세요."}
+    score = int(number)
+    print(f"   - 분석 완료: 과목='{subject}', 점수={score}")
+    return {"subject": subject, "score": score}
 
 def evaluate_korean_node(state: GradeReportState) -> dict:
     """'국어' 과목의 점수를 평가하는 노드"""
@@ -54,8 +74,9 @@ def evaluate_math_node(state: GradeReportState) -> dict:
 
 def router(state: GradeReportState) -> str:
     """State의 'subject' 값에 따라 다음 노드를 결정합니다."""
-    subject = state['subject']
-    print(f"📌 2. 라우터 실행: '{subject}' 과목에 따라 경로를 결정합니다.")
+    # 오타/동의어를 정식 과목명으로 정규화합니다. (알 수 없으면 None)
+    subject = subject_index.normalize(state['subject'])
+    print(f"📌 2. 라우터 실행: '{state['subject']}' → '{subject}' 과목에 따라 경로를 결정합니다.")
     
     if subject == "국어":
         return "korean_node"
@@ -104,5 +125,5 @@ while True:
     # raw_input을 State에 담아 그래프를 실행합니다.
     final_state = app.invoke({"raw_input": user_input})
     
-    # 최종 결과를 출력합니다.
-    print(f"✨ 최종 결과: {final_state['result']}\n")
\ No newline at end of file
+    # 최종 결과를 출력합니다. (지원하지 않는 과목이면 router가 바로 종료하므로 result가 없습니다)
+    print(f"✨ 최종 결과: {final_state.get('result', '지원하지 않는 과목입니다. (국어/수학)')}\n")
\ No newline at end of file
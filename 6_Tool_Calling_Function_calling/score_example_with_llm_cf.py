@@ -1,5 +1,7 @@
 # 필요한 라이브러리를 가져옵니다.
 import json
+import sys
+from pathlib import Path
 from typing import TypedDict
 
 from dotenv import load_dotenv
@@ -7,11 +9,22 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
 
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.fast_path import FastPathClassifier
+from graph_utils.memo import pure
+from graph_utils.rate_limit import governed
+from graph_utils.stream_json import parse_tool_decision_stream
+from graph_utils.subject_index import SubjectIndex
+from graph_utils.tool_registry import ToolRegistry
+
 # .env 파일에서 환경 변수를 로드합니다.
 load_dotenv()
 
 # --- 1. Tool 정의 (이 부분은 일반 파이썬 함수로 정의합니다) ---
 # @tool 데코레이터 없이 순수한 함수로 만듭니다.
+# 같은 점수에는 항상 같은 결과를 내므로 @pure 로 결과를 메모이제이션합니다.
+@pure
 def evaluate_korean(score: int) -> str:
     """'국어' 과목의 점수를 평가할 때 사용합니다. 'score' 인자가 반드시 필요합니다."""
     print("🛠️ Tool 실행: [evaluate_korean]")
@@ -20,6 +33,7 @@ def evaluate_korean(score: int) -> str:
     else:
         return "국어 과목은 재시험이 필요합니다."
 
+@pure
 def evaluate_math(score: int) -> str:
     """'수학' 과목의 점수를 평가할 때 사용합니다. 'score' 인자가 반드시 필요합니다."""
     print("🛠️ Tool 실행: [evaluate_math]")
@@ -28,6 +42,10 @@ def evaluate_math(score: int) -> str:
     else:
         return "수학 과목은 보충 학습이 필요합니다."
 
+# 도구 실행마다 딕셔너리를 새로 만들지 않도록 레지스트리를 한 번만 생성합니다.
+# (docstring으로 인자 검증기와 스키마도 미리 만들어 둡니다.)
+tool_registry = ToolRegistry([evaluate_korean, evaluate_math])
+
 # --- 2. State 정의 (가장 큰 차이점) ---
 # 리듀서 없이, 각 데이터를 담을 명확한 변수로 상태를 정의합니다.
 class AgentState(TypedDict):
@@ -38,8 +56,8 @@ class AgentState(TypedDict):
 
 # --- 3. LLM 및 Agent, 라우터 함수 정의 ---
 
-# 일반 모델을 생성합니다.
-model = ChatOpenAI(model="gpt-4o-mini")
+# 일반 모델을 생성합니다. (governed: 프로세스 전체 속도/동시성 제한 적용)
+model = governed(ChatOpenAI(model="gpt-4o-mini"))
 
 # LLM에게 도구 사용법과 응답 형식을 직접 지시하는 시스템 프롬프트
 SYSTEM_PROMPT = """
@@ -54,15 +72,56 @@ If you decide to use a tool, you MUST respond ONLY with a JSON object in the fol
 If no tool is needed or the input is invalid, just respond with a natural language message.
 """
 
+# 과목명 정규화 인덱스: 동의어("kor", "math")와 오타("수핵", "국 어")를 정식 과목명으로 바꿉니다.
+subject_index = SubjectIndex({
+    "국어": ["korean", "kor"],
+    "수학": ["math", "mathematics"],
+})
+
+# "국어 85"처럼 형식이 분명한 입력은 LLM 없이 바로 Tool 호출로 바꿉니다.
+fast_path = FastPathClassifier({
+    "국어": "evaluate_korean",
+    "수학": "evaluate_math",
+}, normalize_subject=subject_index.normalize)
+
+def pre_classifier_node(state: AgentState) -> dict:
+    """규칙 기반으로 입력을 먼저 분류하는 노드 (인식 못 하면 agent로 넘김)"""
+    print(f"⚡ 0. 사전 분류: '{state['query']}'")
+    decision = fast_path.classify(state["query"])
+    if decision is None:
+        print("   - 규칙으로 인식 불가. LLM Agent로 이동.")
+        return {}
+    print(f"   - 규칙 결정 (LLM 생략): {decision}")
+    return {"tool_name": decision["tool_name"], "tool_args": decision["arguments"]}
+
+def fast_path_router(state: AgentState) -> str:
+    """사전 분류에서 도구가 정해졌으면 바로 실행, 아니면 LLM Agent로 분기합니다."""
+    return "execute_tool" if state.get("tool_name") else "agent"
+
+# True면 모델 응답을 스트리밍으로 받으면서 Tool 결정이 완성되는 즉시 execute_tool로 넘어갑니다.
+STREAM_TOOL_DECISION = True
+
 def agent_node(state: AgentState) -> dict:
     """사용자의 query를 바탕으로 LLM을 호출하여 어떤 도구를 사용할지 결정하는 노드"""
     print(f"🤖 1. Agent: 사용자의 질문 분석 -> '{state['query']}'")
     
     # 시스템 프롬프트와 사용자 쿼리를 모델에 전달
-    response = model.invoke([
+    messages = [
         SystemMessage(content=SYSTEM_PROMPT),
         HumanMessage(content=state['query'])
-    ])
+    ]
+
+    if STREAM_TOOL_DECISION:
+        # tool_name과 arguments가 완성되는 순간 스트림을 끊고 결정을 반환
+        decision, text = parse_tool_decision_stream(model.stream(messages))
+        if decision is not None:
+            print(f"   - LLM 결정 (스트리밍 JSON): {decision}")
+            return {"tool_name": decision["tool_name"], "tool_args": decision["arguments"]}
+        # 일반 문장이거나 잘못된 JSON이면 전체 텍스트를 그대로 final_response로 사용
+        print(f"   - LLM 결정 (일반 텍스트): {text}")
+        return {"final_response": text}
+
+    response = model.invoke(messages)
     
     # LLM의 텍스트 응답을 파싱
     try:
@@ -83,14 +142,8 @@ def tool_executor_node(state: AgentState) -> dict:
     
     print(f"   - 실행할 도구: {tool_name}, 인자: {tool_args}")
 
-    available_tools = {
-        "evaluate_korean": evaluate_korean,
-        "evaluate_math": evaluate_math,
-    }
-    
-    # 이름에 맞는 함수를 찾아서 실행
-    tool_to_run = available_tools[tool_name]
-    output = tool_to_run(**tool_args) # **는 딕셔너리를 함수의 인자로 풀어주는 역할
+    # 이름에 맞는 함수를 레지스트리에서 찾아 인자를 검증한 뒤 실행
+    output = tool_registry.invoke(tool_name, tool_args)
     
     # 실행 결과를 final_response에 업데이트하기 위해 반환
     return {"final_response": output}
@@ -108,9 +161,15 @@ def tool_router(state: AgentState) -> str:
 # --- 4. 그래프 구성 ---
 workflow = StateGraph(AgentState)
 
+workflow.add_node("pre_classifier", pre_classifier_node)
 workflow.add_node("agent", agent_node)
 workflow.add_node("execute_tool", tool_executor_node)
-workflow.set_entry_point("agent")
+workflow.set_entry_point("pre_classifier")
+workflow.add_conditional_edges(
+    "pre_classifier",
+    fast_path_router,
+    {"execute_tool": "execute_tool", "agent": "agent"},
+)
 workflow.add_conditional_edges(
     "agent",
     tool_router,
@@ -133,4 +192,7 @@ while True:
     final_state = app.invoke(initial_state)
     
     # 최종 결과는 final_response 필드에 담겨 있음
-    print(f"✨ 최종 결과: {final_state['final_response']}\n")
+    print(f"✨ 최종 결과: {final_state['final_response']}")
+    print(f"📊 {fast_path.stats.summary()}")
+    memo_summary = ", ".join(tool_registry.entry(name).memo.summary() for name in tool_registry.memo_stats())
+    print(f"🗃️ {memo_summary}\n")
@@ -1,13 +1,21 @@
 # 필요한 라이브러리를 가져옵니다.
 import operator
+import sys
+from pathlib import Path
 from typing import Annotated, Sequence, TypedDict
 
 from dotenv import load_dotenv
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.tools import tool
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
-from langgraph.prebuilt import ToolExecutor
+
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.memo import pure
+from graph_utils.rate_limit import governed
+from graph_utils.runner import stream_and_collect
+from graph_utils.tool_registry import ToolRegistry
 
 # .env 파일에서 환경 변수를 로드합니다.
 load_dotenv()
@@ -17,6 +25,8 @@ load_dotenv()
 # 함수의 설명(docstring)은 LLM이 어떤 Tool을 선택할지 결정하는 중요한 근거가 됩니다.
 
 
+# 같은 점수에는 항상 같은 결과를 내는 순수 함수이므로 @pure 로 결과를 메모이제이션합니다.
+@pure
 @tool
 def evaluate_korean(score: int) -> str:
     """'국어' 과목의 점수를 평가할 때 사용합니다. 'score' 인자가 반드시 필요합니다."""
@@ -27,6 +37,7 @@ def evaluate_korean(score: int) -> str:
         return "국어 과목은 재시험이 필요합니다."
 
 
+@pure
 @tool
 def evaluate_math(score: int) -> str:
     """'수학' 과목의 점수를 평가할 때 사용합니다. 'score' 인자가 반드시 필요합니다."""
@@ -37,21 +48,22 @@ def evaluate_math(score: int) -> str:
         return "수학 과목은 보충 학습이 필요합니다."
 
 
-# --- 2. State 및 Tool Executor 정의 ---
+# --- 2. State 및 Tool 레지스트리 정의 ---
 # Agent의 상태를 정의합니다. 대화 기록(messages)을 통해 상태를 관리합니다.
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
 
 
-# 정의된 Tool들을 실행할 실행기를 생성합니다.
+# 정의된 Tool들을 실행할 레지스트리를 한 번만 생성합니다. (ToolExecutor는 제거됨)
 tools = [evaluate_korean, evaluate_math]
-tool_executor = ToolExecutor(tools)
+tool_registry = ToolRegistry(tools)
 
 # --- 3. LLM 및 Agent, 라우터 함수 정의 ---
 
 # gpt-4o-mini 모델을 사용하고, 정의된 도구들을 모델에 바인딩합니다.
 # 이를 통해 LLM은 도구의 설명과 인자를 이해하고 상황에 맞게 호출할 수 있습니다.
-model = ChatOpenAI(model="gpt-4o-mini").bind_tools(tools)
+# governed()로 감싸 프로세스 전체의 모델 호출 속도/동시성 제한을 적용합니다.
+model = governed(ChatOpenAI(model="gpt-4o-mini")).bind_tools(tool_registry.schemas)
 
 
 def agent_node(state: AgentState) -> dict:
@@ -70,13 +82,8 @@ def tool_executor_node(state: AgentState) -> dict:
     print("⚙️ 3. Tool 실행 노드 실행!")
     # 마지막 메시지(AIMessage)에서 tool_calls 정보를 추출합니다.
     tool_calls = state["messages"][-1].tool_calls
-    # 각 tool_call을 실행하고 결과를 리스트에 저장합니다.
-    tool_messages = []
-    for tool_call in tool_calls:
-        output = tool_executor.invoke(tool_call)
-        tool_messages.append(
-            ToolMessage(content=str(output), tool_call_id=tool_call["id"])
-        )
+    # 각 tool_call을 레지스트리로 실행하고 결과를 ToolMessage 리스트에 저장합니다.
+    tool_messages = [tool_registry.invoke_tool_call(tool_call) for tool_call in tool_calls]
     # Tool 실행 결과를 ToolMessage 형태로 반환합니다.
     return {"messages": tool_messages}
 
@@ -122,9 +129,8 @@ while True:
     # 사용자 입력을 HumanMessage에 담아 그래프를 실행합니다.
     initial_state = {"messages": [HumanMessage(content=user_input)]}
 
-    # stream()을 사용하여 중간 과정을 확인할 수 있습니다.
-    for event in app.stream(initial_state):
-        # event에서 'agent' 또는 'execute_tool' 키를 찾아 출력합니다.
+    def print_event(event: dict) -> None:
+        """스트리밍 이벤트에서 'agent' 또는 'execute_tool' 키를 찾아 출력합니다."""
         if "agent" in event:
             print("--- Agent의 응답 ---")
             print(event["agent"]["messages"][-1])
@@ -133,7 +139,10 @@ while True:
             print(event["execute_tool"]["messages"][-1])
         print("-" * 30)
 
+    # 중간 과정을 스트리밍으로 출력하면서, 같은 실행에서 최종 상태까지 받아옵니다.
+    # (stream() 후 invoke()를 다시 호출하면 LLM 호출과 Tool 실행이 두 번 일어납니다.)
+    final_state = stream_and_collect(app, initial_state, on_event=print_event)
+
     # 최종 결과는 마지막 메시지에 담겨 있습니다.
-    final_state = app.invoke(initial_state)
     final_message = final_state["messages"][-1]
-    print(f"✨ 최종 결과: {final_message.content}\n")
\ No newline at end of file
+    print(f"✨ 최종 결과: {final_message.content}\n")
@@ -0,0 +1,185 @@
+"""
+예제 그래프를 HTTP 로 제공하는 서버
+
+등록되는 그래프
+- sequential:   3_Graph_node_edge/basic_sequential.py          (process → validate → format)
+- tool_calling: state_tool_conditional_edge/ReAct_tool_calling_with_state.py  (키워드로 Tool 선택 후 실행)
+- document:     Human_In_The_Loop/langgraph_real_world_example.py  (문서 작성 HIL, thread_id 세션)
+- chat:         temp/langgraph_tool_calling.py 케이스 5 와 같은 agent ↔ tools 구조.
+                LLM 은 로컬 스텁(어절 단위 스트리밍)이라 messages / custom 스트림 모드를 API 키 없이 확인할 수 있습니다.
+
+    python 7_Graph_Service/graph_server.py --port 8000
+    python 7_Graph_Service/graph_server.py --port 8000 --workers 4 --checkpoint checkpoints.sqlite   # 멀티 프로세스
+    python 7_Graph_Service/graph_server.py --port 8000 --coalesce --result-ttl 2   # 같은 질의 동시 요청 합치기
+
+    curl -X POST localhost:8000/graphs/tool_calling/invoke -H 'content-type: application/json' \\
+         -d '{"input": {"query": "오늘 날씨 어때?", "tool": "", "output": ""}}'
+    curl -X POST localhost:8000/graphs/document/invoke -d '{"input": {...초기 상태...}}'
+    curl -X POST localhost:8000/graphs/document/threads/<thread_id>/resume -d '{"resume": "LangGraph 소개"}'
+    curl -N 'localhost:8000/graphs/chat/sse?stream_mode=messages&stream_mode=custom&input={"messages":[["user","7 더하기 8"]]}'
+    # 문서 작성 세션을 WebSocket 하나로: interrupt 가 push 되고 {"type": "resume", "resume": ...} 로 답함
+    python -m websockets ws://localhost:8000/graphs/document/hil
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.config import get_stream_writer
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from graph_utils.llm_stub import StubChatModel
+from graph_utils.service import GraphRegistry, create_app, sqlite_checkpointer
+from graph_utils.tool_registry import ToolRegistry
+from graph_utils.worker_pool import WorkerPool, create_router
+
+# 문서 작성 그래프의 빈 초기 상태 (주제/타입/독자는 interrupt 로 입력받음)
+DOCUMENT_INITIAL_STATE = {
+    "topic": "",
+    "document_type": "",
+    "target_audience": "",
+    "outline": [],
+    "sections": {},
+    "messages": [],
+    "revisions": [],
+    "quality_score": 0.0,
+    "approved_sections": [],
+    "current_section": None,
+    "requires_research": False,
+    "research_results": [],
+    "run_metadata": {},
+    "final_approved": False,
+}
+
+
+def load_example(relative_path: str):
+    """번호가 붙은 폴더처럼 import 할 수 없는 예제 스크립트를 파일 경로로 불러오기"""
+    path = ROOT / relative_path
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@tool
+def add(a: int, b: int) -> int:
+    """두 숫자를 더합니다."""
+    return a + b
+
+
+def chat_responder(messages):
+    """숫자 두 개가 있으면 add Tool 을 호출하고, Tool 결과가 오면 설명 문장으로 답함"""
+    last = messages[-1]
+    if isinstance(last, ToolMessage):
+        return AIMessage(content=f"계산 결과는 {last.content} 입니다. add 도구로 두 수를 더했고, "
+                                 "필요하면 이어서 곱하기나 검색도 요청할 수 있습니다.")
+    numbers = [int(n) for n in re.findall(r"\d+", str(last.content))]
+    if len(numbers) >= 2:
+        return AIMessage(content="", tool_calls=[{"name": "add", "args": {"a": numbers[0], "b": numbers[1]},
+                                                  "id": f"call_{len(messages)}"}])
+    return AIMessage(content=f"질문을 이해했습니다: {last.content}")
+
+
+def build_chat_graph(stream_delay: float = 0.01):
+    registry = ToolRegistry([add])
+    model = StubChatModel(base_latency=0.02, stream_delay=stream_delay, responder=chat_responder)
+
+    def agent(state: MessagesState):
+        get_stream_writer()({"node": "agent", "status": "thinking", "messages": len(state["messages"])})
+        return {"messages": [model.invoke(state["messages"])]}
+
+    def should_continue(state: MessagesState):
+        return "tools" if state["messages"][-1].tool_calls else END
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("agent", agent)
+    graph.add_node("tools", registry.tool_node())
+    graph.add_edge(START, "agent")
+    graph.add_conditional_edges("agent", should_continue, ["tools", END])
+    graph.add_edge("tools", "agent")
+    return graph.compile()
+
+
+def build_registry(checkpointer=None) -> GraphRegistry:
+    registry = GraphRegistry(checkpointer)
+    sequential = load_example("3_Graph_node_edge/basic_sequential.py")
+    registry.register("sequential", sequential.app, description="process → validate → format 순차 실행")
+    react = load_example("state_tool_conditional_edge/ReAct_tool_calling_with_state.py")
+    registry.register("tool_calling", react.create_graph(), description="키워드 라우터로 Tool 선택 후 실행")
+    document = load_example("Human_In_The_Loop/langgraph_real_world_example.py")
+    registry.register_factory("document", document.create_document_assistant, description="문서 작성 어시스턴트 (HIL)")
+    registry.register("chat", build_chat_graph(), description="agent ↔ tools (스텁 LLM, 토큰 스트리밍)")
+    return registry
+
+
+async def serve(args) -> None:
+    """워커 하나 (단일 프로세스 모드 또는 WorkerPool 의 워커)"""
+    import uvicorn
+
+    async with contextlib.AsyncExitStack() as stack:
+        checkpointer = None
+        if args.checkpoint:
+            checkpointer = await stack.enter_async_context(sqlite_checkpointer(args.checkpoint))
+        app = create_app(build_registry(checkpointer), stream_queue_size=args.stream_queue,
+                         stream_policy=args.stream_policy, heartbeat_s=args.heartbeat,
+                         coalesce=args.coalesce, result_ttl=args.result_ttl)
+        store = args.checkpoint or "메모리"
+        print(f"🚀 그래프 서버 시작: http://{args.host}:{args.port} (그래프 {len(app.state.service.registry)}개, 체크포인트 {store})")
+        await uvicorn.Server(uvicorn.Config(app, host=args.host, port=args.port, log_level="warning")).serve()
+
+
+def run_pool(args) -> None:
+    """워커 args.workers 개 + thread_id 일관 해싱 라우터 (리스너는 args.port 하나)"""
+    import uvicorn
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    # 워커들이 동시에 WAL 전환 / 테이블 생성을 하지 않도록 한 번 미리 준비
+    with contextlib.closing(sqlite3.connect(args.checkpoint)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        SqliteSaver(conn).setup()
+
+    def command(port: int):
+        argv = [sys.executable, "-W", "ignore", __file__, "--port", str(port), "--checkpoint", args.checkpoint,
+                "--stream-queue", str(args.stream_queue), "--stream-policy", args.stream_policy,
+                "--heartbeat", str(args.heartbeat), "--result-ttl", str(args.result_ttl)]
+        return argv + (["--coalesce"] if args.coalesce else [])
+
+    pool = WorkerPool(command, args.workers)
+    print(f"🚀 라우터 시작: http://{args.host}:{args.port} → 워커 {args.workers}개 (체크포인트 {args.checkpoint})")
+    uvicorn.run(create_router(pool.urls, pool), host=args.host, port=args.port, log_level="warning")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--stream-queue", type=int, default=256, help="SSE/WebSocket 연결별 이벤트 큐 크기")
+    parser.add_argument("--stream-policy", default="coalesce", choices=["block", "drop_oldest", "drop_newest", "coalesce"])
+    parser.add_argument("--heartbeat", type=float, default=15.0, help="keepalive 간격(초)")
+    parser.add_argument("--coalesce", action="store_true", help="상태 없는 그래프의 동일한 동시 invoke 를 한 번만 실행")
+    parser.add_argument("--result-ttl", type=float, default=0.0, help="--coalesce 일 때 결과를 재사용할 시간(초)")
+    parser.add_argument("--checkpoint", help="SQLite 체크포인트 파일 (없으면 메모리, 재시작하면 세션이 사라짐)")
+    parser.add_argument("--workers", type=int, default=0, help="워커 프로세스 수 (0 이면 라우터 없이 이 프로세스에서 실행)")
+    args = parser.parse_args()
+    if args.workers and not args.checkpoint:
+        parser.error("--workers 를 쓰려면 워커들이 공유할 --checkpoint 파일이 필요합니다")
+
+    if args.workers:
+        run_pool(args)
+    else:
+        asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,19 @@ from langgraph.types import interrupt, Command
 from langgraph.checkpoint.memory import InMemorySaver
 import uuid
 import json
+import asyncio
+import functools
+import sys
+from pathlib import Path
 from datetime import datetime
 
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.intent_router import calibrated_router
+from graph_utils.keyword_router import KeywordRouter
+from graph_utils.retry import RetryPolicy
+from graph_utils.ttl_cache import ttl_cache
+
 print("=" * 60)
 print("🚀 LangGraph HIL + 이전 개념 통합 데모")
 print("=" * 60)
@@ -29,20 +40,40 @@ class IntegratedState(TypedDict):
     tool_result: str
     execution_history: Annotated[List[dict], add]  # 실행 로그
 
+# 도구 → 키워드 표 (위에 있을수록 우선순위가 높음)
+keyword_tool_router = KeywordRouter({
+    "weather_api": ["날씨"],
+    "news_api": ["뉴스"],
+    "calculator": ["계산"],
+}, lowercase=False)
+
+TOOL_EXAMPLES = {
+    "weather_api": ["오늘 날씨 어때?", "내일 비 와?", "기온이 몇 도야?", "우산 챙겨야 해?"],
+    "news_api": ["최신 뉴스 알려줘", "오늘 주요 기사 뭐야?", "경제 동향 소식 있어?", "속보 있어?"],
+    "calculator": ["계산해줘", "3 더하기 4는?", "100 나누기 7", "이 값 구해줘"],
+}
+
+@functools.lru_cache(maxsize=None)
+def embedding_tool_router():
+    """키워드가 없는 질의가 처음 들어올 때 만드는 센트로이드 라우터
+    (임베딩 모델 로딩을 import 시점에서 미루고, 임계값이 없는 모델이면 경고 후 None)"""
+    return calibrated_router(TOOL_EXAMPLES, default="general_search")
+
+def select_tool(query: str) -> str:
+    """키워드 규칙이 먼저, 키워드가 없는 바꿔 말한 질의만 임베딩 유사도로 판단"""
+    tool = keyword_tool_router.route(query)
+    if tool is None:
+        router = embedding_tool_router()
+        tool = router.route(query).intent if router is not None else "general_search"
+    return tool
+
 def analyze_query_node(state: IntegratedState) -> dict:
     """쿼리 분석 및 도구 선택"""
     query = state["query"]
     print(f"\n📝 쿼리 분석: {query}")
     
-    # 간단한 규칙 기반 도구 선택
-    if "날씨" in query:
-        tool = "weather_api"
-    elif "뉴스" in query:
-        tool = "news_api"
-    elif "계산" in query:
-        tool = "calculator"
-    else:
-        tool = "general_search"
+    # 키워드 우선, 애매하면 임베딩 유사도 기반 도구 선택
+    tool = select_tool(query)
     
     print(f"→ 선택된 도구: {tool}")
     
@@ -126,18 +157,27 @@ def approval_node(state: IntegratedState) -> Command[Literal["weather", "news",
             goto="denied"
         )
 
+# 외부 API 호출 (TTL 캐시: 반복 실행 시 API 를 다시 부르지 않고 캐시에서 응답)
+@ttl_cache(ttl=60, stale_ttl=300)
+def fetch_weather() -> str:
+    print("🌤️ 날씨 API 실행")
+    return "맑음, 기온 22도, 습도 45%"
+
+@ttl_cache(ttl=300, stale_ttl=600)
+def fetch_news() -> str:
+    print("📰 뉴스 API 실행")
+    return "오늘의 주요 뉴스: AI 기술 발전, 경제 동향"
+
 # 개별 도구 노드들
 def weather_node(state: IntegratedState) -> dict:
-    print("🌤️ 날씨 API 실행")
-    result = "맑음, 기온 22도, 습도 45%"
+    result = fetch_weather()
     return {
         "tool_result": result,
         "messages": [f"날씨 정보: {result}"]
     }
 
 def news_node(state: IntegratedState) -> dict:
-    print("📰 뉴스 API 실행")
-    result = "오늘의 주요 뉴스: AI 기술 발전, 경제 동향"
+    result = fetch_news()
     return {
         "tool_result": result,
         "messages": [f"뉴스: {result}"]
@@ -485,13 +525,17 @@ def risky_operation_node(state: RobustState) -> Command[Literal["success", "erro
             goto="error_handler"
         )
 
-def error_handler_node(state: RobustState) -> dict:
+# 재시도 대기 시간: 지수 백오프 + 지터 (고정 0.5초 대신)
+error_backoff = RetryPolicy(base_delay=0.2, max_delay=2.0)
+
+async def error_handler_node(state: RobustState) -> dict:
     """에러 처리 및 재시도 준비"""
-    print(f"🔧 에러 처리 중... (시도: {len(state['attempts'])}/{state['max_attempts']})")
+    attempt = max(1, len(state["attempts"]))
+    delay = error_backoff.backoff_delay(attempt)
+    print(f"🔧 에러 처리 중... (시도: {len(state['attempts'])}/{state['max_attempts']}, {delay:.2f}초 후 재시도)")
     
-    # 자동 복구 로직
-    import time
-    time.sleep(0.5)  # 대기
+    # 자동 복구 로직: asyncio.sleep은 워커 스레드를 붙잡지 않음 (그래프는 ainvoke로 실행)
+    await asyncio.sleep(delay)
     
     return state  # 다시 risky_operation으로
 
@@ -529,17 +573,18 @@ robust_state = {
 }
 
 # 실행 (실패 시나리오 시뮬레이션)
-result = robust_app.invoke(robust_state, config3)
+# error_handler_node가 async 노드이므로 ainvoke로 실행합니다.
+result = asyncio.run(robust_app.ainvoke(robust_state, config3))
 
 # 만약 interrupt가 발생했다면
 if "__interrupt__" in result:
     print("\n👤 사용자 결정: retry")
-    final = robust_app.invoke(Command(resume="retry"), config3)
+    final = asyncio.run(robust_app.ainvoke(Command(resume="retry"), config3))
     
     # 재시도 후 또 실패할 수 있음
     if "__interrupt__" in final:
         print("\n👤 사용자 최종 결정: skip")
-        final = robust_app.invoke(Command(resume="skip"), config3)
+        final = asyncio.run(robust_app.ainvoke(Command(resume="skip"), config3))
 
 print("\n" + "="*60)
 print("💡 통합 예시 핵심 포인트:")
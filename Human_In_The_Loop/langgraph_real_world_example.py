@@ -10,6 +10,20 @@ from langgraph.types import interrupt, Command
 from langgraph.checkpoint.memory import InMemorySaver
 from datetime import datetime
 import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.embeddings import default_encoder
+from graph_utils.hybrid_index import BM25Index, HybridRetriever
+from graph_utils.keyword_router import KeywordRouter
+from graph_utils.quantized_index import QuantizedVectorIndex
+from graph_utils.rerank import PipelineConfig, RerankPipeline, default_reranker
+from graph_utils.retrieval import ChromaRetriever, chunk_document
 
 print("=" * 60)
 print("📝 AI 문서 작성 어시스턴트 (HIL 통합)")
@@ -58,6 +72,8 @@ class DocumentState(TypedDict):
     # 워크플로우 제어
     current_section: Optional[str]
     requires_research: bool
+    research_results: List[Dict]  # 리서치 단계에서 검색한 청크 (id, text, score, metadata)
+    run_metadata: Annotated[Dict[str, Dict], merge_sections_reducer]  # 단계별 지연 등 실행 정보
     final_approved: bool
 
 # ========================================
@@ -90,13 +106,15 @@ def intake_node(state: DocumentState) -> Dict:
     print(f"✅ 수집 완료: {updates}")
     return updates
 
+# 리서치가 필요한 복잡한 주제 키워드 (오토마톤은 한 번만 생성)
+research_router = KeywordRouter({"research": ["기술", "과학", "경제", "정책", "분석"]})
+
 def research_decision_node(state: DocumentState) -> Command[Literal["research", "outline"]]:
     """리서치 필요성 판단"""
     print("\n🔍 리서치 필요성 분석")
     
     # 복잡한 주제인지 자동 판단 (실제로는 LLM 사용)
-    complex_topics = ["기술", "과학", "경제", "정책", "분석"]
-    needs_research = any(word in state["topic"].lower() for word in complex_topics)
+    needs_research = research_router.route(state["topic"]) == "research"
     
     if needs_research:
         # 사용자에게 확인
@@ -123,23 +141,111 @@ def research_decision_node(state: DocumentState) -> Command[Literal["research",
         goto="outline"
     )
 
+# 리서치용 로컬 벡터 저장소 (저장소가 비어 있으면 임시 디렉터리에 예제 문서로 생성)
+# RESEARCH_VECTOR_STORE=numpy 이면 Chroma 없이 int8 양자화 NumPy 인덱스를 씁니다 (chromadb 가 없을 때도 사용)
+RESEARCH_VECTOR_STORE = os.environ.get("RESEARCH_VECTOR_STORE", "chroma")
+RESEARCH_CHROMA_DIR = Path(os.environ.get("RESEARCH_CHROMA_DIR", Path(tempfile.gettempdir()) / "langgraph_study_chroma"))
+RESEARCH_VECTOR_DIR = Path(os.environ.get("RESEARCH_VECTOR_DIR", Path(tempfile.gettempdir()) / "langgraph_study_vectors"))
+
+SAMPLE_DOCUMENTS = [
+    ("paper-1", "학술 자료", "LangGraph 는 상태 그래프로 LLM 에이전트 워크플로우를 표현합니다. 노드는 상태를 받아 "
+     "부분 업데이트를 반환하고, 리듀서가 업데이트를 병합합니다. 체크포인터는 단계마다 상태를 저장해 중단 후 재개를 지원합니다."),
+    ("paper-2", "학술 자료", "검색 증강 생성(RAG)은 질의와 가까운 문서 조각을 벡터 검색으로 찾아 프롬프트에 넣어 "
+     "환각을 줄입니다. 청크 크기와 겹침, 상위 k 값이 답변 품질과 지연에 영향을 줍니다."),
+    ("news-1", "뉴스 기사", "기업들이 사내 문서 검색에 AI 에이전트를 도입하고 있습니다. Human-in-the-Loop 승인 단계를 "
+     "두어 민감한 작업은 사람이 확인한 뒤 실행하도록 하는 사례가 늘고 있습니다."),
+    ("news-2", "뉴스 기사", "오픈소스 벡터 데이터베이스 시장이 커지면서 로컬에 임베딩을 저장하고 메타데이터 필터로 "
+     "검색 범위를 좁히는 방식이 개발자 사이에서 인기를 얻고 있습니다."),
+    ("expert-1", "전문가 의견", "에이전트 설계에서 가장 중요한 것은 상태 설계입니다. 어떤 정보를 상태에 남길지, "
+     "어떤 단계에서 사람의 승인을 받을지 먼저 정하면 그래프 구조가 자연스럽게 정해집니다."),
+    ("expert-2", "전문가 의견", "기술 블로그를 쓸 때는 독자가 바로 따라 할 수 있는 예제 코드와 "
+     "흔히 겪는 오류, 성능 팁을 함께 제시하는 것이 효과적입니다."),
+]
+
+# BM25 + 벡터 top-20 (RRF) → 중복 가지치기 → 상위 10개만 리랭크 → 3개
+# RRF 점수는 1/(60 + 순위) 척도라 벡터 점수 하한(min_score)은 쓰지 않습니다.
+RESEARCH_PIPELINE_CONFIG = PipelineConfig(candidate_k=20, min_score=0.0, rerank_k=10, top_n=3, rerank_timeout_ms=2000)
+
+_research_pipeline = None
+
+
+def build_research_vector_store(chunks):
+    """리서치용 벡터 검색기 (RESEARCH_VECTOR_STORE 에 따라 Chroma 또는 양자화 NumPy 인덱스)
+
+    저장 위치를 인코더 model_id 별로 나누므로, 임베딩 모델을 바꾸면(EMBEDDING_MODEL, 오프라인 해싱 대체 등)
+    이전 모델의 벡터를 열지 않고 새 위치에 다시 만듭니다.
+    """
+    encoder = default_encoder()
+    namespace = re.sub(r"[^0-9A-Za-z._-]+", "_", encoder.model_id)
+    if RESEARCH_VECTOR_STORE == "chroma":
+        try:
+            vector = ChromaRetriever(RESEARCH_CHROMA_DIR / namespace, collection="research", encoder=encoder)
+            if vector.count() == 0:
+                vector.ingest(chunks)
+            return vector
+        except ImportError:
+            print("⚠️ chromadb 가 설치되어 있지 않아 NumPy 양자화 인덱스를 사용합니다. (pip install chromadb)")
+    vector_dir = RESEARCH_VECTOR_DIR / namespace
+    if (vector_dir / "meta.json").exists():
+        try:
+            return QuantizedVectorIndex.load(vector_dir, encoder=encoder)
+        except ValueError as e:
+            # 예전 인덱스 포맷 등: 샘플 문서로 다시 만듦
+            print(f"⚠️ 저장된 인덱스를 열 수 없어 다시 만듭니다: {e}")
+    vector = QuantizedVectorIndex(encoder, keep_float=True)
+    vector.add([c.id for c in chunks], [c.text for c in chunks], [c.metadata for c in chunks])
+    vector.save(vector_dir)
+    return vector
+
+
+def get_research_pipeline():
+    """리서치 검색 파이프라인 (처음 호출할 때 생성)"""
+    global _research_pipeline
+    if _research_pipeline is None:
+        chunks = [
+            chunk
+            for doc_id, source, text in SAMPLE_DOCUMENTS
+            for chunk in chunk_document(doc_id, text, {"source": source}, size=200, overlap=20)
+        ]
+        vector = build_research_vector_store(chunks)
+        # 약품명/코드 같은 정확한 용어는 프로세스 내 BM25 가 찾고, 벡터 결과와 순위로 결합
+        keyword = BM25Index()
+        keyword.add([c.id for c in chunks], [c.text for c in chunks], [c.metadata for c in chunks])
+        retriever = HybridRetriever(keyword, vector, candidates=RESEARCH_PIPELINE_CONFIG.candidate_k)
+        _research_pipeline = RerankPipeline(retriever, default_reranker(), RESEARCH_PIPELINE_CONFIG)
+    return _research_pipeline
+
+
 def research_node(state: DocumentState) -> Dict:
-    """리서치 수행 (시뮬레이션)"""
+    """리서치 수행 (소스별 로컬 하이브리드 검색 + 리랭크)"""
     print("\n📚 리서치 수행 중...")
     
-    # 여러 소스에서 정보 수집 (시뮬레이션)
+    # 재개할 때마다 노드가 처음부터 다시 실행되므로, 검색 전에 모든 소스의 확인을 먼저 받음
+    # (interrupt 사이에 검색하면 이전 소스의 검색이 재개 횟수만큼 반복됨)
     sources = ["학술 자료", "뉴스 기사", "전문가 의견"]
-    research_data = []
+    selected = [source for source in sources if interrupt(f"{source}를 검색하시겠습니까? (yes/skip):") == "yes"]
     
-    for source in sources:
-        confirm = interrupt(f"{source}를 검색하시겠습니까? (yes/skip):")
-        if confirm == "yes":
-            # 실제로는 검색 API 호출
-            research_data.append(f"{source}: 관련 정보 발견")
-            print(f"  ✓ {source} 검색 완료")
+    # 소스마다 메타데이터 필터를 걸어 주제와 가까운 청크를 검색 후 리랭크
+    pipeline = get_research_pipeline() if selected else None
+    research_data = []
+    stage_metadata = {}
+    
+    for source in selected:
+        result = pipeline.run(state["topic"], where={"source": source})
+        research_data.extend(hit.to_dict() for hit in result.hits)
+        stage_metadata[source] = result.metadata()
+        timings = result.timings_ms
+        print(
+            f"  ✓ {source} 검색 완료: 후보 {result.counts['candidates']} → {result.counts['survivors']} → {len(result.hits)}건 "
+            f"(검색 {timings['retrieve']:.1f}ms / 가지치기 {timings['prune']:.1f}ms / 리랭크 {timings['rerank']:.1f}ms)"
+        )
+        for hit in result.hits:
+            print(f"    - ({hit.score:.2f}) {hit.text[:40]}...")
     
     return {
-        "messages": [f"리서치 완료: {len(research_data)}개 소스"],
+        "research_results": research_data,
+        "run_metadata": {"research": stage_metadata},
+        "messages": [f"리서치 완료: {len(research_data)}개 청크"],
         "quality_score": 0.7 if research_data else 0.5
     }
 
@@ -344,8 +450,8 @@ def finalize_node(state: DocumentState) -> Dict:
 # 그래프 구성
 # ========================================
 
-def create_document_assistant():
-    """문서 작성 어시스턴트 그래프 생성"""
+def create_document_assistant(checkpointer=None):
+    """문서 작성 어시스턴트 그래프 생성 (checkpointer 를 주면 서비스 등에서 공유하는 저장소 사용)"""
     
     workflow = StateGraph(DocumentState)
     
@@ -366,8 +472,7 @@ def create_document_assistant():
     workflow.add_edge("finalize", END)
     
     # 컴파일
-    checkpointer = InMemorySaver()
-    return workflow.compile(checkpointer=checkpointer)
+    return workflow.compile(checkpointer=checkpointer or InMemorySaver())
 
 # ========================================
 # 실행 시뮬레이션
@@ -396,6 +501,8 @@ if __name__ == "__main__":
         "approved_sections": [],
         "current_section": None,
         "requires_research": False,
+        "research_results": [],
+        "run_metadata": {},
         "final_approved": False
     }
     
@@ -0,0 +1,125 @@
+"""
+마이크로 배치 벤치마크: CPU 추론에서 처리량과 지연의 트레이드오프
+
+동시 클라이언트 스레드들이 각자 한 문장씩 임베딩을 요청하는 상황(그래프 실행 여러 개)을
+배치 크기 1 직접 호출 vs MicroBatcher (max_batch, max_wait_ms 조합, 길이 버킷 유무)로 비교합니다.
+
+기본 모델 "tiny" 는 무작위 가중치의 작은 BERT(4층, 256차원)로, 모델 다운로드 없이
+실제 트랜스포머 forward 와 같은 방식(배치 최대 길이까지 패딩 + attention mask)의 비용을 재현합니다.
+--model 에 sentence-transformers 모델 이름을 주면 그 모델로 측정합니다.
+
+    python benchmarks/batching_bench.py --clients 32 --requests 20
+    python benchmarks/batching_bench.py --model nlpai-lab/KURE-v1
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from graph_utils.batching import BatchedEncoder
+from graph_utils.embeddings import SentenceTransformerEncoder, normalize_rows
+
+
+class TinyTransformerEncoder:
+    """무작위 가중치 BERT 로 문자 단위 토큰을 인코딩 (벤치마크 전용)"""
+
+    def __init__(self, layers: int = 4, hidden: int = 256, max_length: int = 256):
+        import torch
+        from transformers import BertConfig, BertModel
+
+        torch.manual_seed(0)
+        config = BertConfig(
+            vocab_size=8192, hidden_size=hidden, num_hidden_layers=layers, num_attention_heads=4,
+            intermediate_size=hidden * 4, max_position_embeddings=max_length,
+        )
+        self.torch = torch
+        self.model = BertModel(config).eval()
+        self.max_length = max_length
+        self.model_id = f"tiny-bert-{layers}x{hidden}"
+        self.dim = hidden
+
+    def encode(self, texts, batch_size=32):
+        torch = self.torch
+        ids = [[ord(ch) % 8191 + 1 for ch in text[:self.max_length]] for text in texts]
+        width = max(len(row) for row in ids)
+        input_ids = torch.zeros((len(ids), width), dtype=torch.long)
+        mask = torch.zeros((len(ids), width), dtype=torch.long)
+        for i, row in enumerate(ids):
+            input_ids[i, :len(row)] = torch.tensor(row)
+            mask[i, :len(row)] = 1
+        with torch.inference_mode():
+            hidden = self.model(input_ids=input_ids, attention_mask=mask).last_hidden_state
+            pooled = (hidden * mask[..., None]).sum(1) / mask.sum(1, keepdim=True)
+        return normalize_rows(pooled.numpy().astype(np.float32))
+
+
+def make_texts(count: int, seed: int):
+    rng = random.Random(seed)
+    words = ["그래프", "상태", "노드", "임베딩", "검색", "체크포인트", "에이전트", "리랭커", "질의", "문서"]
+    # 짧은 질의와 긴 문서 청크가 섞인 길이 분포
+    return [" ".join(rng.choices(words, k=rng.choice([3, 5, 8, 20, 40, 60]))) for _ in range(count)]
+
+
+def run_clients(encode_one, texts, clients, requests):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(index):
+        local = []
+        for i in range(requests):
+            text = texts[(index * requests + i) % len(texts)]
+            start = time.perf_counter()
+            encode_one(text)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="tiny", help="'tiny' 또는 sentence-transformers 모델 이름")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20, help="클라이언트당 요청 수")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    encoder = TinyTransformerEncoder() if args.model == "tiny" else SentenceTransformerEncoder(args.model)
+    texts = make_texts(args.clients * args.requests, args.seed)
+    encoder.encode(texts[:8])
+    print(f"모델: {encoder.model_id}, 클라이언트 {args.clients}개 x {args.requests}건")
+    print(f"\n  {'방식':<28} {'처리량':>10} {'p50':>10} {'p99':>10} {'평균 배치':>8} {'패딩 효율':>8}")
+
+    throughput, p50, p99 = run_clients(lambda text: encoder.encode([text]), texts, args.clients, args.requests)
+    print(f"  {'직접 호출 (배치 1)':<28} {throughput:8.1f}/s {p50:8.1f}ms {p99:8.1f}ms {1.0:8.1f} {1.0:8.0%}")
+
+    for max_batch, max_wait_ms, bucket in [(8, 2, True), (32, 5, True), (32, 5, False), (64, 10, True), (64, 20, True)]:
+        batched = BatchedEncoder(encoder, max_batch=max_batch, max_wait_ms=max_wait_ms, bucket=bucket)
+        throughput, p50, p99 = run_clients(lambda text: batched.encode([text]), texts, args.clients, args.requests)
+        stats = batched.batcher.stats()
+        batched.batcher.close()
+        label = f"배치 {max_batch}, {max_wait_ms}ms, " + ("버킷" if bucket else "버킷 없음")
+        print(
+            f"  {label:<28} {throughput:8.1f}/s {p50:8.1f}ms {p99:8.1f}ms "
+            f"{stats['mean_batch']:8.1f} {stats['padding_efficiency']:8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
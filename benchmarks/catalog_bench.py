@@ -0,0 +1,151 @@
+"""
+상품 카탈로그 인덱스 벤치마크: 1천만 건에서 질의 지연 측정
+
+카탈로그를 한 번 생성(이미 있으면 재사용)한 뒤 메모리 맵으로 열어
+키워드 / 키워드 + 가격 범위 / 가격 범위만 / 깊은 페이지 질의의 지연을 측정하고,
+같은 질의를 전체 배열 선형 필터링(NumPy 벡터화)으로 처리한 경우와 비교합니다.
+
+    python benchmarks/catalog_bench.py --items 10000000 --queries 1000
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from graph_utils.catalog import ProductCatalog, write_catalog
+
+BRANDS = [f"브랜드{i}" for i in range(50)]
+ADJECTIVES = ["무선", "게이밍", "초경량", "프리미엄", "보급형", "휴대용", "대용량", "저소음", "고속", "방수",
+              "슬림", "미니", "프로", "에코", "스마트", "클래식", "울트라", "라이트", "맥스", "플러스"]
+CATEGORIES = [f"{base}{i}" for base in ["노트북", "키보드", "마우스", "모니터", "스피커"] for i in range(40)]
+
+
+def generate(path: Path, count: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    brand = rng.integers(0, len(BRANDS), count, dtype=np.int16)
+    adjective = rng.integers(0, len(ADJECTIVES), count, dtype=np.int16)
+    category = rng.integers(0, len(CATEGORIES), count, dtype=np.int16)
+    prices = rng.integers(10, 20_000, count, dtype=np.int64) * 100
+
+    postings = {}
+    for values, words in ((brand, BRANDS), (adjective, ADJECTIVES), (category, CATEGORIES)):
+        order = np.argsort(values, kind="stable")
+        bounds = np.searchsorted(values[order], np.arange(len(words) + 1))
+        for i, word in enumerate(words):
+            postings[word] = order[bounds[i]:bounds[i + 1]]
+
+    names = (
+        f"{BRANDS[b]} {ADJECTIVES[a]} {CATEGORIES[c]} {i}"
+        for i, (b, a, c) in enumerate(zip(brand.tolist(), adjective.tolist(), category.tolist()))
+    )
+    write_catalog(path, names, prices, postings)
+
+
+def make_queries(n: int, seed: int):
+    rng = random.Random(seed)
+    queries = []
+    for i in range(n):
+        kind = i % 4
+        low = rng.randrange(1000, 1_500_000, 100)
+        high = low + rng.choice([10_000, 100_000, 500_000])
+        if kind == 0:
+            queries.append(("키워드", dict(keyword=rng.choice(CATEGORIES))))
+        elif kind == 1:
+            keyword = f"{rng.choice(ADJECTIVES)} {rng.choice(CATEGORIES)}"
+            queries.append(("키워드 2개 + 가격", dict(keyword=keyword, min_price=low, max_price=high)))
+        elif kind == 2:
+            queries.append(("가격 범위", dict(min_price=low, max_price=high)))
+        else:
+            queries.append(("깊은 페이지", dict(keyword=rng.choice(BRANDS), max_price=high, offset=rng.randrange(0, 5000))))
+    return queries
+
+
+def linear_search(prices, labels, keyword_ids, min_price, max_price, limit, offset):
+    """기존 방식과 같은 전체 선형 필터링 (NumPy 로 벡터화한 하한선)"""
+    mask = np.ones(len(prices), dtype=bool)
+    if min_price is not None:
+        mask &= prices >= min_price
+    if max_price is not None:
+        mask &= prices <= max_price
+    for column, value in keyword_ids:
+        mask &= labels[column] == value
+    ids = np.flatnonzero(mask)
+    order = np.argsort(prices[ids], kind="stable")
+    return ids[order[offset:offset + limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--linear-queries", type=int, default=20)
+    parser.add_argument("--dir", type=Path, default=Path(tempfile.gettempdir()) / "catalog_bench")
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    path = args.dir / f"catalog_{args.items}"
+    if args.rebuild and path.exists():
+        shutil.rmtree(path)
+    if not (path / "meta.json").exists():
+        print(f"카탈로그 생성: {args.items:,}건 → {path}")
+        start = time.perf_counter()
+        generate(path, args.items, args.seed)
+        print(f"  생성 시간 {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    catalog = ProductCatalog.open(path)
+    print(f"메모리 맵으로 열기: {(time.perf_counter() - start) * 1000:.1f}ms, 상품 {len(catalog):,}건, 토큰 {len(catalog.vocab)}개")
+
+    queries = make_queries(args.queries, args.seed)
+    catalog.search("워밍업", limit=10)
+    latencies = {}
+    for label, query in queries:
+        start = time.perf_counter()
+        catalog.search(limit=10, **query)
+        latencies.setdefault(label, []).append((time.perf_counter() - start) * 1000)
+
+    print(f"\n[인덱스 질의] 질의 {len(queries)}건, top-10")
+    for label, values in latencies.items():
+        values.sort()
+        print(
+            f"  {label:<12} p50 {values[len(values) // 2]:7.3f}ms  "
+            f"p99 {values[min(len(values) - 1, int(len(values) * 0.99))]:7.3f}ms  최대 {values[-1]:7.3f}ms"
+        )
+
+    # 선형 필터링 비교용: 이름 토큰을 열 단위로 복원
+    print(f"\n[선형 필터링] 질의 {args.linear_queries}건 (NumPy 벡터화 전체 스캔)")
+    rng = np.random.default_rng(args.seed)
+    count = len(catalog)
+    prices = np.empty(count, dtype=np.int64)
+    prices[np.asarray(catalog.price_order)] = catalog.sorted_prices
+    labels = {"category": np.empty(count, dtype=np.int16)}
+    for i, word in enumerate(CATEGORIES):
+        start, end = catalog.vocab[word]
+        labels["category"][np.asarray(catalog.price_order)[catalog.postings[start:end]]] = i
+    linear, indexed = [], []
+    for _ in range(args.linear_queries):
+        category = int(rng.integers(len(CATEGORIES)))
+        low = int(rng.integers(10, 15_000)) * 100
+        query = dict(min_price=low, max_price=low + 100_000, limit=10, offset=0)
+        start = time.perf_counter()
+        expected = linear_search(prices, labels, [("category", category)], **query)
+        linear.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        page = catalog.search(CATEGORIES[category], **query)
+        indexed.append((time.perf_counter() - start) * 1000)
+        assert [p.price for p in page.items] == prices[expected].tolist()
+    print(f"  선형 필터링 평균 {np.mean(linear):8.2f}ms")
+    print(f"  인덱스 질의 평균 {np.mean(indexed):8.3f}ms ({np.mean(linear) / np.mean(indexed):.0f}배, 결과 일치)")
+
+
+if __name__ == "__main__":
+    main()
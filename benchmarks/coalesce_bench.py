@@ -0,0 +1,115 @@
+"""
+동일 요청 합치기 벤치마크: 같은 질의가 몰릴 때 그래프 실행 수와 처리량
+
+temp/conditional_edge_examples.py 의 app_switch 와 같은 SWITCH 그래프(의도 분류 → calculate / weather / search)를
+GraphService 에 등록하고, 동시 클라이언트 --concurrency 개가 --seconds 동안 invoke 합니다.
+원본은 모듈을 불러올 때 OpenAI 를 호출하므로, 분류는 키워드로 하고 노드 비용(임베딩 분류 + 외부 API)은
+--node-ms 만큼의 대기로 흉내 냅니다.
+질의의 --hot 비율은 "서울 날씨 알려줘" 이고 나머지는 서로 다른 질의입니다 (피크 시간대의 쏠림).
+
+- 끔:           모든 요청이 그래프를 실행
+- 합치기:        진행 중인 동일 실행에 합류 (InvocationCoalescer, result_ttl=0)
+- 합치기+TTL:    끝난 결과도 --ttl 초 동안 재사용
+
+    python benchmarks/coalesce_bench.py --concurrency 64 --seconds 5 --hot 0.8
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from graph_utils.service import GraphRegistry, GraphService
+
+HOT_QUERY = "서울 날씨 알려줘"
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def build_switch_graph(node_ms: float, executions: list):
+    def classify_intent(state: MessagesState):
+        text = state["messages"][0].content
+        if "날씨" in text:
+            return "weather"
+        if "계산" in text:
+            return "calculate"
+        return "search" if "검색" in text else "end"
+
+    def answer(label):
+        def node(state: MessagesState):
+            executions.append(label)
+            time.sleep(node_ms / 1000)
+            return {"messages": [AIMessage(content=f"{label}: {state['messages'][0].content}")]}
+        return node
+
+    graph = StateGraph(MessagesState)
+    for label in ("calculate", "weather", "search", "default"):
+        graph.add_node(label, answer(label))
+        graph.add_edge(label, END)
+    graph.add_conditional_edges(START, classify_intent,
+                                {"calculate": "calculate", "weather": "weather", "search": "search", "end": "default"})
+    return graph.compile()
+
+
+async def run(coalesce: bool, ttl: float, args) -> dict:
+    executions = []
+    registry = GraphRegistry()
+    registry.register("switch", build_switch_graph(args.node_ms, executions))
+    service = GraphService(registry, coalesce=coalesce, result_ttl=ttl)
+    rng = random.Random(0)
+    latencies = []
+
+    async def client(deadline):
+        while time.perf_counter() < deadline:
+            query = HOT_QUERY if rng.random() < args.hot else f"{rng.randrange(10**6)} 검색해줘"
+            start = time.perf_counter()
+            await service.invoke("switch", {"messages": [("user", query)]})
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0)    # TTL 적중은 await 없이 끝나므로 다른 클라이언트에 차례를 넘김 (네트워크 왕복 대신)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(started + args.seconds) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "executions": len(executions),
+        "p50": percentile(latencies, 0.5),
+        "p99": percentile(latencies, 0.99),
+        "stats": service.coalescer.stats() if service.coalescer else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--hot", type=float, default=0.8, help=f"'{HOT_QUERY}' 질의의 비율")
+    parser.add_argument("--node-ms", type=float, default=50.0, help="노드 한 번 실행 비용 (분류 + 외부 API 흉내)")
+    parser.add_argument("--ttl", type=float, default=1.0, help="합치기+TTL 의 result_ttl")
+    args = parser.parse_args()
+
+    print(f"동시 클라이언트 {args.concurrency}, {args.seconds:.0f}초, 인기 질의 {args.hot:.0%}, 노드 {args.node_ms:.0f}ms\n")
+    print(f"  {'모드':<12} {'요청':>7} {'RPS':>8} {'그래프 실행':>10} {'실행/요청':>9} {'합류':>7} {'TTL 재사용':>10} {'p50':>9} {'p99':>9}")
+    for label, coalesce, ttl in [("끔", False, 0.0), ("합치기", True, 0.0), ("합치기+TTL", True, args.ttl)]:
+        result = asyncio.run(run(coalesce, ttl, args))
+        stats = result["stats"] or {"coalesced": 0, "hits": 0}
+        print(
+            f"  {label:<12} {result['requests']:7d} {result['rps']:8.1f} {result['executions']:10d} "
+            f"{result['executions'] / max(result['requests'], 1):9.2f} {stats['coalesced']:7d} {stats['hits']:10d} "
+            f"{result['p50']:7.1f}ms {result['p99']:7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+임베딩 캐시 벤치마크: 반복 텍스트 워크로드에서 인코딩 시간, 적중률, 정밀도, 다중 프로세스 조회
+
+- 고유 문장 풀에서 Zipf 분포로 뽑은 배치(섹션 초안/반복 질의 흉내)를
+  캐시 없이 / float16 캐시 / int8 캐시로 인코딩한 시간과 적중률 비교
+- 캐시에서 읽은 벡터와 새로 인코딩한 벡터의 코사인 유사도 최솟값
+- 워커 프로세스 여러 개가 같은 캐시 파일을 메모리 맵으로 열고 동시에 조회할 때의 처리량
+
+    python benchmarks/embedding_cache_bench.py --requests 20000 --unique 5000
+    python benchmarks/embedding_cache_bench.py --model hashing --capacity 2000   # 축출이 일어나는 경우
+"""
+
+import argparse
+import multiprocessing as mp
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from graph_utils.embedding_cache import CachedEncoder, EmbeddingCache
+from graph_utils.embeddings import HashingEncoder, SentenceTransformerEncoder, default_encoder
+
+
+def make_encoder(name):
+    if name is None:
+        return default_encoder()
+    if name == "hashing":
+        return HashingEncoder()
+    return SentenceTransformerEncoder(name)
+
+
+def make_workload(unique: int, requests: int, batch: int, seed: int):
+    rng = np.random.default_rng(seed)
+    pool = [f"{i}번 섹션 초안: LangGraph 상태와 체크포인트, 인터럽트 재개 흐름을 설명합니다." for i in range(unique)]
+    ids = np.minimum(rng.zipf(1.2, requests) - 1, unique - 1)
+    return pool, [[pool[i] for i in ids[start:start + batch]] for start in range(0, requests, batch)]
+
+
+def run(encoder, batches):
+    start = time.perf_counter()
+    for texts in batches:
+        encoder.encode(texts)
+    return time.perf_counter() - start
+
+
+def reader(path, model_id, dim, texts, rounds, queue):
+    cache = EmbeddingCache(path, model_id, dim)
+    start = time.perf_counter()
+    lookups = 0
+    for _ in range(rounds):
+        for i in range(0, len(texts), 64):
+            cache.get_many(texts[i:i + 64])
+            lookups += len(texts[i:i + 64])
+    queue.put(lookups / (time.perf_counter() - start))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=None, help="sentence-transformers 모델 이름 또는 'hashing'")
+    parser.add_argument("--unique", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--capacity", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    encoder = make_encoder(args.model)
+    pool, batches = make_workload(args.unique, args.requests, args.batch, args.seed)
+    print(f"인코더: {encoder.model_id} (차원 {encoder.dim}), 요청 {args.requests:,}건 / 고유 {args.unique:,}건")
+
+    root = Path(tempfile.mkdtemp(prefix="embedding_cache_bench_"))
+    try:
+        baseline = run(encoder, batches)
+        print(f"\n[인코딩] 배치 {args.batch}")
+        print(f"  캐시 없음   {baseline:8.2f}s")
+        for dtype in ("float16", "int8"):
+            cache = EmbeddingCache(root / dtype, encoder.model_id, encoder.dim, dtype=dtype, capacity=args.capacity)
+            cached = CachedEncoder(encoder, cache)
+            elapsed = run(cached, batches)
+            stats = cache.stats()
+            warm = run(cached, batches)
+            print(
+                f"  {dtype:<8} 콜드 {elapsed:8.2f}s ({baseline / elapsed:5.1f}배)  웜 {warm:8.2f}s ({baseline / warm:5.1f}배)  "
+                f"콜드 적중률 {stats['hit_rate']:.1%}  축출 {stats['evictions']:,}  "
+                f"파일 {sum(f.stat().st_size for f in cache.path.glob('*.npy')) / 2**20:.1f}MB"
+            )
+            sample = pool[:min(len(pool), 512)]
+            similarity = (cached.encode(sample) * encoder.encode(sample)).sum(axis=1)
+            print(f"           캐시 벡터 vs 새 인코딩 코사인 최소 {similarity.min():.5f}")
+            cache.close()
+
+        hot = pool[:min(len(pool), 2048)]
+        warm_cache = EmbeddingCache(root / "float16", encoder.model_id, encoder.dim)
+        CachedEncoder(encoder, warm_cache).encode(hot)
+        warm_cache.close()
+        print(f"\n[다중 프로세스 조회] 같은 float16 캐시, 키 {len(hot):,}개 x 5회")
+        for workers in sorted({1, args.workers}):
+            queue = mp.Queue()
+            processes = [
+                mp.Process(target=reader, args=(root / "float16", encoder.model_id, encoder.dim, hot, 5, queue))
+                for _ in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            rates = [queue.get() for _ in processes]
+            for process in processes:
+                process.join()
+            print(f"  워커 {workers}개  합계 {sum(rates):10,.0f} 조회/s  (워커당 {np.mean(rates):10,.0f})")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
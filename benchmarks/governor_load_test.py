@@ -0,0 +1,152 @@
+"""
+ModelGovernor 부하 테스트: 과부하에서도 처리량이 안정적인지 확인
+
+provider 는 동시 요청이 provider_limit 를 넘으면 즉시 429 를 돌려주는 로컬 LLM 스텁으로 흉내 냅니다.
+여러 스레드가 agent 그래프를 쉬지 않고 실행할 때
+
+- governor 없음: 429 를 받으면 짧게 쉬고 재시도 (재시도 폭주)
+- governor 사용: 모델별 동시성/속도 제한 + 대기열 마감 시간
+
+의 초당 성공 처리량, 429 횟수, 대기 시간을 비교합니다.
+
+    python benchmarks/governor_load_test.py --threads 64 --seconds 5
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+from pydantic import PrivateAttr
+
+from graph_utils.llm_stub import StubChatModel
+from graph_utils.rate_limit import GovernorQueueFull, GovernorTimeout, ModelGovernor, governed
+
+
+class ProviderRateLimitError(RuntimeError):
+    """provider 의 429 응답을 흉내 냄"""
+
+
+class LimitedProviderModel(StubChatModel):
+    """동시 요청 상한을 넘으면 429 를 던지는 스텁"""
+
+    provider_limit: int = 8
+    _in_flight: int = PrivateAttr(default=0)
+    _provider_lock: Any = PrivateAttr(default=None)
+    _rejections: int = PrivateAttr(default=0)
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._provider_lock = threading.Lock()
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any):
+        with self._provider_lock:
+            if self._in_flight >= self.provider_limit:
+                self._rejections += 1
+                raise ProviderRateLimitError("429 Too Many Requests")
+            self._in_flight += 1
+        try:
+            return super()._generate(messages, stop, run_manager, **kwargs)
+        finally:
+            with self._provider_lock:
+                self._in_flight -= 1
+
+
+def build_app(model: Any):
+    def agent(state: MessagesState):
+        return {"messages": [model.invoke(state["messages"])]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("agent", agent)
+    graph.add_edge(START, "agent")
+    graph.add_edge("agent", END)
+    return graph.compile()
+
+
+def run(label: str, use_governor: bool, threads: int, seconds: float, provider_limit: int, latency: float):
+    provider = LimitedProviderModel(provider_limit=provider_limit, base_latency=latency, model_name="stub-model")
+    governor = ModelGovernor()
+    if use_governor:
+        # provider 동시성 한도에 맞추고, 3초 안에 슬롯을 못 얻으면 포기
+        governor.configure_model("stub-model", max_concurrency=provider_limit, max_queue=threads * 2)
+        model = governed(provider, governor, timeout=3.0)
+    else:
+        model = provider
+    app = build_app(model)
+
+    completions: List[float] = []
+    latencies: List[float] = []
+    failures = {"timeout": 0, "gave_up": 0}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + seconds
+
+    def worker():
+        while time.monotonic() < stop_at:
+            start = time.monotonic()
+            for attempt in range(20):
+                try:
+                    app.invoke({"messages": [HumanMessage(content="국어 85")]})
+                    break
+                except ProviderRateLimitError:
+                    time.sleep(0.005)  # 순진한 재시도
+                except (GovernorTimeout, GovernorQueueFull):
+                    with lock:
+                        failures["timeout"] += 1
+                    break
+            else:
+                with lock:
+                    failures["gave_up"] += 1
+                continue
+            end = time.monotonic()
+            with lock:
+                completions.append(end)
+                latencies.append(end - start)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    begin = time.monotonic()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    # 초 단위 처리량 (마지막 구간은 잘린 구간이라 제외)
+    per_second = [0] * int(seconds)
+    for t in completions:
+        idx = int(t - begin)
+        if idx < len(per_second):
+            per_second[idx] += 1
+
+    latencies.sort()
+    p99 = latencies[int(0.99 * (len(latencies) - 1))] * 1000 if latencies else 0.0
+    print(f"\n[{label}]")
+    print(f"  초당 성공 처리량: {per_second}")
+    print(f"  평균 {statistics.mean(per_second):.1f} rps, 표준편차 {statistics.pstdev(per_second):.1f}")
+    print(f"  provider 429 횟수: {provider._rejections}, 마감 초과/거절: {failures['timeout']}, 재시도 포기: {failures['gave_up']}")
+    print(f"  p99 종단 지연: {p99:.0f}ms")
+    if use_governor:
+        metric = governor.metrics().get("model:stub-model", {})
+        print(f"  governor 대기: 평균 {metric.get('avg_wait_ms', 0):.0f}ms, p95 {metric.get('p95_wait_ms', 0):.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--provider-limit", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    run("governor 없음 (429 → 재시도)", False, args.threads, args.seconds, args.provider_limit, args.latency)
+    run("ModelGovernor", True, args.threads, args.seconds, args.provider_limit, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+HIL 채널 벤치마크: HTTP 폴링 vs HTTP 요청/응답 vs WebSocket 세션
+
+문서 작성 그래프(document) 세션을 --concurrency 개 동시에 --seconds 동안 반복하며
+"답을 보낸 순간 → 다음 interrupt 를 받은 순간" 의 지연(단계 지연)과 세션 처리량을 비교합니다.
+interrupt 응답은 service_load_test.answer() 로 자동 생성합니다.
+
+- http_poll: resume 을 보내 두고 GET /threads/{id} 를 --poll-ms 간격으로 폴링해 새 interrupt 를 찾음
+             (클라이언트가 "__interrupt__" 를 폴링하는 흔한 방식)
+- http:      POST invoke / resume 응답에 담긴 interrupt 를 바로 사용 (keep-alive 연결)
+- ws:        WS /graphs/document/hil 한 소켓에서 interrupt push 를 받고 같은 소켓으로 resume
+
+    python benchmarks/hil_channel_bench.py --concurrency 8 --seconds 5 --poll-ms 100
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import httpx
+import orjson
+
+try:
+    from websockets.asyncio.client import connect    # websockets>=13
+except ImportError:
+    from websockets.client import connect    # requirements.txt 의 websockets==12.0
+
+from service_load_test import DOCUMENT_INITIAL_STATE, answer, free_port, percentile, start_server
+
+
+class Stats:
+    def __init__(self):
+        self.steps = []
+        self.sessions = []
+        self.requests = 0
+        self.errors = 0
+
+
+def interrupt_keys(interrupts):
+    # 한 노드 안에서 연달아 부른 interrupt 는 id 가 같으므로 값까지 비교
+    return {(item["id"], orjson.dumps(item["value"])) for item in interrupts}
+
+
+async def http_poll_session(client: httpx.AsyncClient, stats: Stats, poll_s: float) -> None:
+    start = time.perf_counter()
+    result = (await client.post("/graphs/document/invoke", json={"input": DOCUMENT_INITIAL_STATE})).json()
+    stats.requests += 1
+    thread_id, interrupts = result["thread_id"], result["interrupts"]
+    path = f"/graphs/document/threads/{thread_id}"
+    while interrupts:
+        answered = interrupt_keys(interrupts)
+        sent = time.perf_counter()
+        resume = asyncio.create_task(client.post(f"{path}/resume", json={"resume": answer(interrupts[0]["value"])}))
+        while True:
+            await asyncio.sleep(poll_s)
+            state = (await client.get(path)).json()
+            stats.requests += 1
+            if interrupt_keys(state["interrupts"]) - answered or (resume.done() and not state["next"]):
+                interrupts = state["interrupts"]
+                break
+            if resume.done():    # 같은 값의 interrupt 가 다시 나온 경우
+                interrupts = resume.result().json()["interrupts"]
+                break
+        stats.steps.append((time.perf_counter() - sent) * 1000)
+        response = await resume
+        stats.requests += 1
+        if response.status_code != 200:
+            stats.errors += 1
+            return
+    stats.sessions.append((time.perf_counter() - start) * 1000)
+
+
+async def http_session(client: httpx.AsyncClient, stats: Stats, _) -> None:
+    start = time.perf_counter()
+    result = (await client.post("/graphs/document/invoke", json={"input": DOCUMENT_INITIAL_STATE})).json()
+    stats.requests += 1
+    while result["interrupts"]:
+        sent = time.perf_counter()
+        path = f"/graphs/document/threads/{result['thread_id']}/resume"
+        response = await client.post(path, json={"resume": answer(result["interrupts"][0]["value"])})
+        stats.requests += 1
+        stats.steps.append((time.perf_counter() - sent) * 1000)
+        if response.status_code != 200:
+            stats.errors += 1
+            return
+        result = response.json()
+    stats.sessions.append((time.perf_counter() - start) * 1000)
+
+
+async def ws_session(url: str, stats: Stats, _) -> None:
+    start = time.perf_counter()
+    async with connect(url.replace("http", "ws", 1) + "/graphs/document/hil", max_size=None) as ws:
+        orjson.loads(await ws.recv())    # session
+        await ws.send(orjson.dumps({"type": "start", "input": DOCUMENT_INITIAL_STATE}).decode())
+        sent = None
+        while True:
+            event = orjson.loads(await ws.recv())
+            if event["event"] == "interrupt":
+                if sent is not None:
+                    stats.steps.append((time.perf_counter() - sent) * 1000)
+                sent = time.perf_counter()
+                await ws.send(orjson.dumps({"type": "resume", "resume": answer(event["interrupts"][0]["value"])}).decode())
+            elif event["event"] == "done":
+                stats.steps.append((time.perf_counter() - sent) * 1000)
+                break
+            elif event["event"] == "error":
+                stats.errors += 1
+                return
+    stats.sessions.append((time.perf_counter() - start) * 1000)
+
+
+async def run_mode(url: str, mode: str, concurrency: int, seconds: float, poll_s: float) -> Stats:
+    stats = Stats()
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        session = {
+            "http_poll": lambda s: http_poll_session(client, s, poll_s),
+            "http": lambda s: http_session(client, s, None),
+            "ws": lambda s: ws_session(url, s, None),
+        }[mode]
+
+        async def worker(deadline):
+            while time.perf_counter() < deadline:
+                await session(stats)
+
+        await session(Stats())    # 워밍업
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(started + seconds) for _ in range(concurrency)))
+        stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="이미 떠 있는 서버 주소 (없으면 graph_server.py 를 띄움)")
+    parser.add_argument("--modes", nargs="+", default=["http_poll", "http", "ws"], choices=["http_poll", "http", "ws"])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--poll-ms", type=float, default=100.0, help="http_poll 의 상태 조회 간격")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        process = start_server(port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        print(f"서버 {url}, 동시 세션 {args.concurrency}, 모드당 {args.seconds:.0f}초, 폴링 {args.poll_ms:.0f}ms\n")
+        print(f"  {'모드':<10} {'세션':>5} {'세션/s':>7} {'단계 p50':>9} {'단계 p99':>9} {'세션 p50':>10} {'HTTP 요청/세션':>14} {'오류':>5}")
+        for mode in args.modes:
+            stats = asyncio.run(run_mode(url, mode, args.concurrency, args.seconds, args.poll_ms / 1000))
+            sessions = max(len(stats.sessions), 1)
+            print(
+                f"  {mode:<10} {len(stats.sessions):5d} {len(stats.sessions) / stats.elapsed:7.1f} "
+                f"{percentile(stats.steps, 0.5):7.1f}ms {percentile(stats.steps, 0.99):7.1f}ms "
+                f"{percentile(stats.sessions, 0.5):8.1f}ms {stats.requests / sessions:14.1f} {stats.errors:5d}"
+            )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
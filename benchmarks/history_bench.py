@@ -0,0 +1,112 @@
+"""
+히스토리 관리 벤치마크: 100턴 ReAct 세션의 턴별 프롬프트 토큰 / 지연 / 체크포인트 크기
+
+temp/langgraph_tool_calling.py 와 같은 구조(agent ↔ tools, MessagesState)의 그래프를
+로컬 LLM 스텁으로 돌리면서, 히스토리 노드가 있을 때와 없을 때를 비교합니다.
+
+    python benchmarks/history_bench.py --turns 100
+"""
+
+import argparse
+import pickle
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode
+
+from graph_utils.history import HistoryManager, make_history_node
+from graph_utils.llm_stub import StubChatModel, make_tool_responder
+
+
+@tool
+def add(a: int, b: int) -> int:
+    """두 숫자를 더합니다."""
+    return a + b
+
+
+def _add_args(text: str) -> dict:
+    numbers = [int(n) for n in re.findall(r"\d+", text)] + [0, 0]
+    return {"a": numbers[0], "b": numbers[1]}
+
+
+def build_app(model: StubChatModel, manager: HistoryManager = None):
+    prompt_tokens = []
+
+    def agent(state: MessagesState):
+        response = model.invoke(state["messages"])
+        prompt_tokens.append(model.last_prompt_tokens)
+        return {"messages": [response]}
+
+    def should_continue(state: MessagesState):
+        return "tools" if state["messages"][-1].tool_calls else END
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("agent", agent)
+    graph.add_node("tools", ToolNode([add]))
+    entry = "agent"
+    if manager is not None:
+        graph.add_node("history", make_history_node(manager))
+        graph.add_edge("history", "agent")
+        entry = "history"
+    graph.add_edge(START, entry)
+    graph.add_conditional_edges("agent", should_continue, ["tools", END])
+    graph.add_edge("tools", entry)
+    return graph.compile(checkpointer=InMemorySaver()), prompt_tokens
+
+
+def run_session(label: str, turns: int, manager: HistoryManager = None):
+    model = StubChatModel(
+        responder=make_tool_responder("add", _add_args),
+        base_latency=0.002,
+        per_token_latency=0.00002,  # 토큰 1,000개당 20ms
+    )
+    app, prompt_tokens = build_app(model, manager)
+    config = {"configurable": {"thread_id": label}}
+
+    rows = []
+    for turn in range(1, turns + 1):
+        start = time.perf_counter()
+        state = app.invoke(
+            {"messages": [HumanMessage(content=f"{turn} 더하기 {turn * 2}는? 계산 과정도 자세히 설명해줘.")]},
+            config,
+        )
+        latency = time.perf_counter() - start
+        checkpoint_bytes = len(pickle.dumps(state["messages"]))
+        # 한 턴에 agent 가 두 번 호출됨 (tool 호출 → 최종 답변). 마지막 호출의 프롬프트 크기를 기록
+        rows.append((turn, prompt_tokens[-1], latency * 1000, checkpoint_bytes, len(state["messages"])))
+    return rows
+
+
+def print_table(label: str, rows, checkpoints=(1, 10, 25, 50, 75, 100)):
+    print(f"\n[{label}]")
+    print(f"{'턴':>5} {'프롬프트 토큰':>12} {'지연(ms)':>10} {'체크포인트(B)':>14} {'메시지 수':>9}")
+    for turn, tokens, latency, size, count in rows:
+        if turn in checkpoints or turn == len(rows):
+            print(f"{turn:>5} {tokens:>12} {latency:>10.1f} {size:>14} {count:>9}")
+    avg_latency = sum(r[2] for r in rows) / len(rows)
+    print(f"  평균 지연: {avg_latency:.1f}ms, 최대 프롬프트 토큰: {max(r[1] for r in rows)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--max-tokens", type=int, default=1500)
+    args = parser.parse_args()
+
+    baseline = run_session("baseline", args.turns)
+    managed = run_session("managed", args.turns, HistoryManager(max_tokens=args.max_tokens))
+
+    print_table("히스토리 관리 없음", baseline)
+    print_table(f"HistoryManager(max_tokens={args.max_tokens})", managed)
+
+
+if __name__ == "__main__":
+    main()
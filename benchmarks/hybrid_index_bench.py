@@ -0,0 +1,137 @@
+"""
+하이브리드 인덱스 벤치마크: 100만 문서에서 색인 시간, 점진적 추가, 질의 지연, 정확 용어 재현율
+
+합성 의약품 문서(약품명 + ATC 형식 코드 + 효능/주의 문장)를 batch 단위 add 로 쌓아 올리고,
+BM25 / 벡터 / 하이브리드(RRF) 각각의 질의 지연과
+"코드로 찾기", "약품명으로 찾기" 질의에서 정답 문서가 top-10 에 드는 비율을 측정합니다.
+
+    python benchmarks/hybrid_index_bench.py --docs 1000000
+    python benchmarks/hybrid_index_bench.py --docs 100000 --dim 256
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from graph_utils.embeddings import HashingEncoder
+from graph_utils.hybrid_index import HybridIndex
+
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호그느드르므브스으즈크트프흐리미비시이지치키티피"
+FORMS = ["정", "캡슐", "시럽", "주사", "연고", "산", "서방정"]
+EFFECTS = ["해열", "진통", "소염", "항생", "혈압 강하", "혈당 조절", "위산 억제", "알레르기 완화", "기침 완화", "수면 유도"]
+CAUTIONS = ["임산부는 복용 전 상담", "간 질환자는 주의", "음주 후 복용 금지", "졸음이 올 수 있음", "공복 복용 금지"]
+SOURCES = ["허가정보", "복약안내", "논문", "뉴스"]
+
+
+def make_documents(count: int, seed: int):
+    rng = random.Random(seed)
+    drugs = []
+    for _ in range(max(count // 5, 1)):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 5))) + rng.choice(FORMS)
+        code = f"ATC-{rng.choice('ABCDGHJLMNPRSV')}{rng.randint(0, 99):02d}{rng.choice('ABCDEFG')}{rng.choice('ABCDEFG')}{rng.randint(0, 99):02d}"
+        drugs.append((name, code, rng.choice(EFFECTS)))
+    for i in range(count):
+        name, code, effect = drugs[i % len(drugs)]
+        text = (
+            f"{name} {rng.choice([100, 200, 250, 500])}mg ({code}) 는 {effect} 에 쓰이는 의약품입니다. "
+            f"{rng.choice(CAUTIONS)}. {rng.choice(EFFECTS)} 효과와 비교한 자료가 있습니다."
+        )
+        yield f"doc-{i}", text, {"source": SOURCES[i % len(SOURCES)]}, i % len(drugs)
+    return drugs
+
+
+def percentiles(values):
+    values = sorted(values)
+    return values[len(values) // 2], values[min(len(values) - 1, int(len(values) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=20_000, help="add 한 번에 넣는 문서 수")
+    parser.add_argument("--dim", type=int, default=128, help="HashingEncoder 차원 (메모리: 문서 수 x dim x 4바이트)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    index = HybridIndex(HashingEncoder(dim=args.dim))
+    names, codes, drug_of = {}, {}, []
+    rng = random.Random(args.seed)
+
+    print(f"[색인] 문서 {args.docs:,}건, 배치 {args.batch:,}")
+    bm25_seconds = vector_seconds = 0.0
+    batch = []
+    start = time.perf_counter()
+    for doc_id, text, metadata, drug in make_documents(args.docs, args.seed):
+        batch.append((doc_id, text, metadata))
+        drug_of.append(drug)
+        if drug not in names:
+            names[drug] = text.split(" ")[0]
+            codes[drug] = text.split("(")[1].split(")")[0]
+        if len(batch) == args.batch:
+            ids, texts, metadatas = zip(*batch)
+            t0 = time.perf_counter()
+            index.vector.add(ids, texts, metadatas)
+            t1 = time.perf_counter()
+            index.keyword.add(ids, texts, metadatas)
+            vector_seconds += t1 - t0
+            bm25_seconds += time.perf_counter() - t1
+            batch = []
+            if len(index) % max(args.docs // 5, args.batch) == 0:
+                print(f"  {len(index):>10,}건  {time.perf_counter() - start:7.1f}s")
+    if batch:
+        ids, texts, metadatas = zip(*batch)
+        index.add(ids, texts, metadatas)
+    elapsed = time.perf_counter() - start
+    postings = sum(len(segment.doc_ids) for segment in index.keyword._segments)
+    print(
+        f"  전체 {elapsed:.1f}s (BM25 {bm25_seconds:.1f}s / 벡터 {vector_seconds:.1f}s), "
+        f"용어 {len(index.keyword.vocab):,}개, posting {postings:,}개 ({postings * 6 / 2**20:.0f}MB)"
+    )
+
+    extra = [(f"extra-{i}", f"신규등록정 {i}mg (ATC-Z99ZZ{i % 100:02d}) 추가 문서", {"source": "뉴스"}) for i in range(1000)]
+    t0 = time.perf_counter()
+    index.add(*map(list, zip(*extra)))
+    print(f"  점진적 추가 1,000건: {(time.perf_counter() - t0) * 1000:.0f}ms (세그먼트 {len(index.keyword._segments)}개)")
+
+    drug_ids = list(names)
+    targets = {}
+    for position, drug in enumerate(drug_of):
+        targets.setdefault(drug, set()).add(f"doc-{position}")
+    query_sets = {
+        "코드": [(codes[d], d) for d in rng.sample(drug_ids, min(args.queries, len(drug_ids)))],
+        "약품명": [(names[d], d) for d in rng.sample(drug_ids, min(args.queries, len(drug_ids)))],
+    }
+    searchers = {
+        "BM25": lambda q, **kw: index.keyword.query(q, **kw),
+        "벡터": lambda q, **kw: index.vector.query(q, **kw),
+        "하이브리드": lambda q, **kw: index.query(q, **kw),
+    }
+    print(f"\n[질의] top-10, 하이브리드는 각 50개 후보를 RRF 로 결합")
+    print(f"  {'방식':<8} {'질의':<6} {'p50':>9} {'p99':>9} {'top-10 적중':>10}")
+    for mode, search in searchers.items():
+        for label, queries in query_sets.items():
+            latencies, hits = [], 0
+            for text, drug in queries:
+                t0 = time.perf_counter()
+                results = search(text, k=10)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                hits += any(result.id in targets[drug] for result in results)
+            p50, p99 = percentiles(latencies)
+            print(f"  {mode:<8} {label:<6} {p50:7.1f}ms {p99:7.1f}ms {hits / len(queries):10.0%}")
+
+    latencies = []
+    for text, _ in query_sets["약품명"]:
+        t0 = time.perf_counter()
+        index.query(text, k=10, where={"source": "복약안내"})
+        latencies.append((time.perf_counter() - t0) * 1000)
+    p50, p99 = percentiles(latencies)
+    print(f"  하이브리드 + source 필터   p50 {p50:7.1f}ms  p99 {p99:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
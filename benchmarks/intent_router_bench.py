@@ -0,0 +1,154 @@
+"""
+임베딩 의도 라우터 벤치마크: 라벨링된 질의 세트에서 정확도와 라우팅 지연 측정
+
+- 정확도: 키워드 라우터(기존 classify_intent 규칙) vs 센트로이드 라우터 (임계값별)
+  임계값 아래는 LLM fallback 으로 넘어가므로 fallback 비율도 함께 보고합니다.
+- 권장 임계값: 예제처럼 키워드 라우터를 먼저 쓰고 키워드가 없는 질의만 임베딩으로 넘길 때,
+  그 질의들에서 정확도(임계값 아래는 기본값 end)가 가장 높은 임계값. 이 값을
+  graph_utils/intent_router.py 의 CALIBRATED_THRESHOLDS 에 인코더의 model_id 로 등록하거나
+  INTENT_ROUTER_THRESHOLD 환경 변수로 지정해야 예제가 임베딩 라우터를 씁니다.
+- 지연: route() 단건, route_batch() 배치, aroute() 동시 요청 마이크로 배치
+
+    python benchmarks/intent_router_bench.py                   # 기본 인코더 (모델이 없으면 해싱)
+    python benchmarks/intent_router_bench.py --model nlpai-lab/KURE-v1
+    python benchmarks/intent_router_bench.py --model hashing
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from graph_utils.embeddings import HashingEncoder, SentenceTransformerEncoder, default_encoder
+from graph_utils.intent_router import EmbeddingIntentRouter
+from graph_utils.keyword_router import KeywordRouter
+
+INTENT_EXAMPLES = {
+    "calculate": ["10+5 계산해줘", "3 곱하기 4는 얼마야?", "100 나누기 7 해줘", "(3+4)*2 값 구해줘", "두 수를 더하면?"],
+    "weather": ["서울 날씨 알려줘", "내일 비 와?", "오늘 우산 챙겨야 할까?", "부산 기온이 몇 도야?", "주말 날씨 어때?"],
+    "search": ["LangGraph 검색해줘", "파이썬 튜토리얼 찾아줘", "최신 AI 논문 알아봐줘", "이 회사 정보 조사해줘", "관련 자료 찾아봐"],
+}
+
+# 예시 문장과 겹치지 않는 라벨링된 질의 (end = 도구가 필요 없는 대화)
+LABELED = [
+    ("25 더하기 17 계산해줘", "calculate"), ("12*12는?", "calculate"), ("1000 빼기 375 얼마야", "calculate"),
+    ("이거 합계 좀 내줘: 3, 5, 9", "calculate"), ("2의 10제곱 구해줘", "calculate"), ("50을 4로 나누면?", "calculate"),
+    ("3.5 곱하기 2 해줄래", "calculate"), ("평균 좀 계산해줄래? 80 90 100", "calculate"),
+    ("대구 날씨 어때?", "weather"), ("내일 눈 오나요", "weather"), ("지금 밖에 추워?", "weather"),
+    ("이번 주 강수 확률 알려줘", "weather"), ("제주 기온 알려줘", "weather"), ("오후에 비 그쳐?", "weather"),
+    ("미세먼지 심해?", "weather"), ("내일 소풍 가도 될 날씨야?", "weather"),
+    ("LangChain 문서 찾아줘", "search"), ("최근 반도체 기사 검색", "search"), ("파이썬 비동기 예제 알아봐줘", "search"),
+    ("이 약의 부작용 자료 찾아줘", "search"), ("경쟁사 정보 좀 조사해줄래", "search"), ("벡터 DB 비교 글 검색해줘", "search"),
+    ("그래프 신경망 논문 찾아봐", "search"), ("맛집 리스트 검색해줘", "search"),
+    ("안녕하세요", "end"), ("고마워요", "end"), ("너는 누구야?", "end"), ("좋은 하루 보내", "end"),
+    ("잘 지냈어?", "end"), ("오늘 기분이 좋아", "end"),
+]
+
+# 기존 classify_intent 의 키워드 규칙
+KEYWORD_TABLE = {"calculate": ["계산", "+", "-"], "weather": ["날씨"], "search": ["검색"]}
+
+
+def make_encoder(name):
+    if name is None:
+        return default_encoder()
+    if name == "hashing":
+        return HashingEncoder()
+    return SentenceTransformerEncoder(name)
+
+
+THRESHOLDS = (0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7)
+
+
+def predictions(router, texts):
+    scores = router.scores(texts)
+    best = scores.argmax(axis=1)
+    return np.array([router.intents[i] for i in best]), scores[np.arange(len(texts)), best]
+
+
+def recommend_threshold(router, texts, labels):
+    """임계값 아래를 end 로 처리했을 때 정확도가 가장 높은 임계값 (같으면 더 높은 쪽 = 보수적)"""
+    predicted, best_scores = predictions(router, texts)
+    labels = np.array(labels)
+    best = None
+    for threshold in THRESHOLDS:
+        accuracy = np.where(best_scores >= threshold, predicted == labels, labels == "end").mean()
+        if best is None or accuracy >= best[1]:
+            best = (threshold, accuracy)
+    return best
+
+
+def accuracy_table(router, texts, labels):
+    predicted, best_scores = predictions(router, texts)
+    labels = np.array(labels)
+    print(f"  {'임계값':>6} {'임베딩 결정':>10} {'결정 정확도':>10} {'전체(fallback=LLM 정답)':>22} {'전체(fallback=end)':>18}")
+    for threshold in THRESHOLDS:
+        confident = best_scores >= threshold
+        decided_acc = (predicted[confident] == labels[confident]).mean() if confident.any() else 0.0
+        # 임계값 아래는 LLM 이 맞힌다고 가정한 상한 / 기본값 end 로 처리한 하한
+        with_llm = np.where(confident, predicted == labels, True).mean()
+        with_default = np.where(confident, predicted == labels, labels == "end").mean()
+        print(f"  {threshold:>6.1f} {confident.mean():>10.0%} {decided_acc:>10.0%} {with_llm:>22.0%} {with_default:>18.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=None, help="sentence-transformers 모델 이름 또는 'hashing'")
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=256)
+    args = parser.parse_args()
+
+    encoder = make_encoder(args.model)
+    print(f"인코더: {encoder.model_id} (차원 {encoder.dim})")
+    start = time.perf_counter()
+    router = EmbeddingIntentRouter.from_examples(INTENT_EXAMPLES, encoder=encoder, threshold=args.threshold, default="end")
+    print(f"센트로이드 계산: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    texts = [t for t, _ in LABELED]
+    labels = [label for _, label in LABELED]
+
+    keyword = KeywordRouter(KEYWORD_TABLE, default="end")
+    keyword_acc = np.mean([keyword.route(t) == label for t, label in LABELED])
+    print(f"\n[정확도] 라벨링된 질의 {len(LABELED)}건")
+    print(f"  키워드 라우터: {keyword_acc:.0%}")
+    accuracy_table(router, texts, labels)
+
+    missed = [(t, label) for t, label in LABELED if keyword.route(t) == "end"]
+    threshold, accuracy = recommend_threshold(router, [t for t, _ in missed], [label for _, label in missed])
+    print(f"\n[권장 임계값] 키워드가 없는 질의 {len(missed)}건 기준: {threshold:.1f} (정확도 {accuracy:.0%})")
+    print(f"  graph_utils/intent_router.py: CALIBRATED_THRESHOLDS[{encoder.model_id!r}] = {threshold:.1f}")
+    print(f"  또는 실행 시: INTENT_ROUTER_THRESHOLD={threshold:.1f}")
+
+    print("\n[지연]")
+    latencies = []
+    for i in range(args.repeat):
+        start = time.perf_counter()
+        router.route(texts[i % len(texts)])
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    print(f"  route() 단건        p50 {latencies[len(latencies) // 2]:7.3f}ms  p99 {latencies[int(len(latencies) * 0.99)]:7.3f}ms")
+
+    batch = (texts * 2)[:32]
+    start = time.perf_counter()
+    for _ in range(max(1, args.repeat // 10)):
+        router.route_batch(batch)
+    per_item = (time.perf_counter() - start) / max(1, args.repeat // 10) / len(batch) * 1000
+    print(f"  route_batch(32)     질의당 {per_item:7.3f}ms")
+
+    async def concurrent():
+        queries = [texts[i % len(texts)] for i in range(args.concurrency)]
+        start = time.perf_counter()
+        await asyncio.gather(*(router.aroute(q) for q in queries))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(concurrent())
+    print(f"  aroute() 동시 {args.concurrency}건  전체 {elapsed * 1000:7.1f}ms ({args.concurrency / elapsed:,.0f} 질의/s)")
+
+
+if __name__ == "__main__":
+    main()
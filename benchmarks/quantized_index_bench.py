@@ -0,0 +1,125 @@
+"""
+int8 양자화 벡터 인덱스 벤치마크: 정확한 float32 전수 검색 대비 recall@10 과 QPS
+
+군집 구조를 가진 합성 임베딩(정규화된 dim 차원)을 만들고, 문서 벡터에 잡음을 섞은 질의로
+- float32 전수 검색 (행렬곱 + argpartition, 정답 기준)
+- QuantizedVectorIndex int8 (rescore 없음)
+- QuantizedVectorIndex int8 + float32 rescore (상위 k x rescore 후보만 재계산)
+의 recall@10, 단건/배치 QPS, 메모리 크기와 save → mmap load 시간을 비교합니다.
+
+    python benchmarks/quantized_index_bench.py --docs 200000 --dim 384
+    python benchmarks/quantized_index_bench.py --docs 1000000 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from graph_utils.embeddings import HashingEncoder, normalize_rows
+from graph_utils.quantized_index import QuantizedVectorIndex
+
+
+def make_vectors(count: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((clusters, dim)).astype(np.float32))
+    vectors = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 65536):
+        end = min(start + 65536, count)
+        noise = rng.standard_normal((end - start, dim)).astype(np.float32) * 0.6 / np.sqrt(dim)
+        vectors[start:end] = normalize_rows(centers[rng.integers(0, clusters, end - start)] + noise)
+    return vectors
+
+
+def exact_search(matrix: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ matrix.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def measure(search, queries: np.ndarray, batch: int):
+    """(단건 QPS, 배치 QPS, 단건 p50 ms, 단건 p99 ms)"""
+    latencies = []
+    for query in queries:
+        t0 = time.perf_counter()
+        search(query[None, :])
+        latencies.append((time.perf_counter() - t0) * 1000)
+    t0 = time.perf_counter()
+    for start in range(0, len(queries), batch):
+        search(queries[start:start + batch])
+    batch_qps = len(queries) / (time.perf_counter() - t0)
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return 1000 / np.mean(latencies), batch_qps, latencies[len(latencies) // 2], p99
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=32, help="배치 QPS 측정 시 한 번에 검색할 질의 수")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"[데이터] 문서 {args.docs:,}건 x {args.dim}차원, 질의 {args.queries}건, 검색 스레드 {args.workers}")
+    vectors = make_vectors(args.docs, args.dim, args.clusters, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    picks = rng.integers(0, args.docs, args.queries)
+    noise = rng.standard_normal((args.queries, args.dim)) * 0.3 / np.sqrt(args.dim)
+    queries = normalize_rows(vectors[picks] + noise).astype(np.float32)
+    truth = exact_search(vectors, queries, args.k)
+
+    index = QuantizedVectorIndex(HashingEncoder(dim=args.dim), keep_float=True, workers=args.workers)
+    ids = [f"doc-{i}" for i in range(args.docs)]
+    t0 = time.perf_counter()
+    index.add(ids, [""] * args.docs, vectors=vectors)
+    print(f"  양자화 + 추가 {time.perf_counter() - t0:.1f}s, "
+          f"int8 {args.docs * (args.dim + 4) / 2**20:.0f}MB (float32 {vectors.nbytes / 2**20:.0f}MB)")
+
+    print(f"\n  {'방식':<22} {'recall@10':>10} {'단건 QPS':>9} {'p50':>9} {'p99':>9} {f'배치{args.batch} QPS':>11}")
+    searchers = {
+        "float32 전수": lambda q: exact_search(vectors, q, args.k),
+        "int8": lambda q: index.search(q, args.k)[1],
+        f"int8 + rescore x{args.rescore}": lambda q: index.search(q, args.k, rescore=args.rescore)[1],
+    }
+    for label, search in searchers.items():
+        found = np.concatenate([search(queries[i:i + args.batch]) for i in range(0, len(queries), args.batch)])
+        single, batched, p50, p99 = measure(search, queries, args.batch)
+        print(f"  {label:<22} {recall(found, truth):10.3f} {single:9.1f} {p50:7.1f}ms {p99:7.1f}ms {batched:11.1f}")
+
+    if args.workers > 1:
+        serial = QuantizedVectorIndex(index.encoder, keep_float=True, workers=1)
+        serial.add(ids, [""] * args.docs, vectors=vectors)
+        single, batched, p50, _ = measure(lambda q: serial.search(q, args.k)[1], queries, args.batch)
+        print(f"  {'int8 (스레드 1개)':<22} {'':>10} {single:9.1f} {p50:7.1f}ms {'':>9} {batched:11.1f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        t0 = time.perf_counter()
+        index.save(directory)
+        saved = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        loaded = QuantizedVectorIndex.load(directory, encoder=index.encoder, workers=args.workers)
+        opened = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        loaded.search(queries[:1], args.k)
+        first = (time.perf_counter() - t0) * 1000
+        print(f"\n[저장/불러오기] save {saved:.1f}s, mmap load {opened:.2f}s, 첫 질의 {first:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+2단계 검색 파이프라인 벤치마크: 가지치기 예산에 따른 단계별 지연
+
+중복/유사 청크가 섞인 합성 코퍼스에서 벡터 top-50 후보를 만들고,
+리랭크 전 가지치기 설정(전부 리랭크 / 중복 제거 + rerank_k 20 / 10 / 5)별로
+retrieve / prune / rerank 단계의 p50 지연과 리랭커에 넘어간 후보 수를 비교합니다.
+
+기본 리랭커 "tiny" 는 무작위 가중치의 작은 BERT 분류기(4층, 256차원)로
+모델 다운로드 없이 크로스 인코더 forward 비용(질의+청크 쌍, 패딩 포함)을 재현합니다.
+--model 에 CrossEncoder 모델 이름(예: dragonkue/bge-reranker-v2-m3-ko)을 주면 그 모델로 측정합니다.
+
+    python benchmarks/rerank_bench.py --docs 2000 --queries 30
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from graph_utils.embeddings import HashingEncoder
+from graph_utils.rerank import CrossEncoderReranker, PipelineConfig, RerankPipeline
+from graph_utils.retrieval import RetrievedChunk
+
+TOPICS = ["그래프", "체크포인트", "리듀서", "에이전트", "검색", "임베딩", "스트리밍", "인터럽트", "도구", "프롬프트"]
+
+
+class TinyCrossEncoder:
+    """무작위 가중치 BERT 분류기로 (질의, 청크) 쌍 점수 계산 (벤치마크 전용)"""
+
+    def __init__(self, layers: int = 4, hidden: int = 256, max_length: int = 512):
+        import torch
+        from transformers import BertConfig, BertForSequenceClassification
+
+        torch.manual_seed(0)
+        config = BertConfig(
+            vocab_size=8192, hidden_size=hidden, num_hidden_layers=layers, num_attention_heads=4,
+            intermediate_size=hidden * 4, max_position_embeddings=max_length, num_labels=1,
+        )
+        self.torch = torch
+        self.model = BertForSequenceClassification(config).eval()
+        self.max_length = max_length
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False, convert_to_numpy=True):
+        torch = self.torch
+        ids = [([ord(ch) % 8191 + 1 for ch in f"{q}\x00{p}"])[:self.max_length] for q, p in pairs]
+        width = max(len(row) for row in ids)
+        input_ids = torch.zeros((len(ids), width), dtype=torch.long)
+        mask = torch.zeros((len(ids), width), dtype=torch.long)
+        for i, row in enumerate(ids):
+            input_ids[i, :len(row)] = torch.tensor(row)
+            mask[i, :len(row)] = 1
+        with torch.inference_mode():
+            logits = self.model(input_ids=input_ids, attention_mask=mask).logits
+        return torch.sigmoid(logits).squeeze(-1).numpy()
+
+
+class MemoryRetriever:
+    """NumPy 행렬 위의 전수 코사인 검색 (벤치마크용 Retriever)"""
+
+    def __init__(self, chunks, encoder):
+        self.chunks = chunks
+        self.encoder = encoder
+        self.matrix = encoder.encode([text for _, text, _ in chunks], batch_size=256)
+
+    def query(self, text, k=5, where=None):
+        scores = self.matrix @ self.encoder.encode([text])[0]
+        top = np.argpartition(-scores, min(k, len(scores) - 1))[:k]
+        top = top[np.argsort(-scores[top])]
+        return [RetrievedChunk(self.chunks[i][0], self.chunks[i][1], float(scores[i]), self.chunks[i][2]) for i in top]
+
+
+def make_corpus(docs: int, seed: int):
+    """문서마다 청크 4개 + 그중 하나를 거의 그대로 복제한 청크 2개 (재게시/중복 수집 흉내)"""
+    rng = random.Random(seed)
+    chunks = []
+    for d in range(docs):
+        words = rng.sample(TOPICS, 3)
+        for c in range(4):
+            text = (
+                f"{words[0]} 와 {words[1]} 를 다루는 문서 {d} 의 {c}번째 단락입니다. "
+                f"{words[2]} 단계에서 {rng.choice(TOPICS)} 설정과 {rng.choice(TOPICS)} 지연을 설명하고 예제를 보여줍니다."
+            )
+            chunks.append((f"doc-{d}#{c}", text, {"doc_id": f"doc-{d}"}))
+        for copy in range(2):
+            chunks.append((f"doc-{d}#dup{copy}", chunks[-4][1] + " " * (copy + 1) + "(재게시)", {"doc_id": f"mirror-{d}-{copy}"}))
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="tiny", help="'tiny' 또는 CrossEncoder 모델 이름")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--candidate-k", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    model = TinyCrossEncoder() if args.model == "tiny" else None
+    reranker = CrossEncoderReranker(args.model, model=model)
+    chunks = make_corpus(args.docs, args.seed)
+    retriever = MemoryRetriever(chunks, HashingEncoder())
+    rng = random.Random(args.seed + 1)
+    queries = [f"{' '.join(rng.sample(TOPICS, 2))} 설명" for _ in range(args.queries)]
+    print(f"리랭커: {reranker.model_id}, 청크 {len(chunks):,}개, 질의 {args.queries}건, 후보 top-{args.candidate_k}")
+
+    configs = {
+        "전부 리랭크": PipelineConfig(candidate_k=args.candidate_k, min_score=-1.0, dedup_threshold=1.01,
+                                max_per_doc=None, rerank_k=args.candidate_k, top_n=5),
+        "가지치기 → 20": PipelineConfig(candidate_k=args.candidate_k, min_score=0.1, rerank_k=20, top_n=5),
+        "가지치기 → 10": PipelineConfig(candidate_k=args.candidate_k, min_score=0.1, rerank_k=10, top_n=5),
+        "가지치기 → 5": PipelineConfig(candidate_k=args.candidate_k, min_score=0.1, rerank_k=5, top_n=5),
+    }
+    RerankPipeline(retriever, reranker, configs["가지치기 → 5"]).run(queries[0])
+
+    print(f"\n  {'설정':<14} {'리랭크 후보':>8} {'retrieve':>10} {'prune':>8} {'rerank':>10} {'total':>10}  (p50 ms)")
+    for label, config in configs.items():
+        pipeline = RerankPipeline(retriever, reranker, config)
+        results = [pipeline.run(query) for query in queries]
+        p50 = {
+            stage: float(np.median([result.timings_ms[stage] for result in results]))
+            for stage in ("retrieve", "prune", "rerank", "total")
+        }
+        survivors = np.mean([result.counts["survivors"] for result in results])
+        print(
+            f"  {label:<14} {survivors:8.1f} {p50['retrieve']:10.2f} {p50['prune']:8.2f} "
+            f"{p50['rerank']:10.2f} {p50['total']:10.2f}"
+        )
+
+    budget = PipelineConfig(candidate_k=args.candidate_k, min_score=-1.0, dedup_threshold=1.01, max_per_doc=None,
+                            rerank_k=args.candidate_k, rerank_timeout_ms=50)
+    start = time.perf_counter()
+    result = RerankPipeline(retriever, reranker, budget).run(queries[0])
+    print(
+        f"\n[예산 초과] rerank_timeout_ms=50 으로 {result.counts['survivors']}개 리랭크: "
+        f"reranked={result.reranked}, 전체 {(time.perf_counter() - start) * 1000:.1f}ms (벡터 순서로 대체)"
+    )
+    reranker.batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+로컬 벡터 검색 벤치마크: 영구 저장 Chroma 컬렉션의 색인 처리량과 질의 지연
+
+합성 한국어 청크(기본 100만 건, 소스 메타데이터 10종)를 ChromaRetriever.ingest 로 색인하며
+인코딩과 upsert 시간을 나눠 청크/s 를 보고하고, 이미 만든 컬렉션은 다시 열어 재사용합니다.
+질의는 top-k 검색을 필터 없이 / 소스 필터(약 10% 선택) / doc_id 필터(수 건 선택)로 측정합니다.
+
+    python benchmarks/retrieval_bench.py --chunks 1000000 --queries 500
+    python benchmarks/retrieval_bench.py --chunks 50000 --model hashing
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from graph_utils.embeddings import HashingEncoder, SentenceTransformerEncoder, default_encoder
+from graph_utils.retrieval import Chunk, ChromaRetriever
+
+SOURCES = [f"source-{i}" for i in range(10)]
+TOPICS = ["그래프", "체크포인트", "리듀서", "에이전트", "검색", "임베딩", "스트리밍", "인터럽트", "도구", "프롬프트",
+          "벡터", "캐시", "배치", "지연", "처리량", "메모리", "상태", "노드", "엣지", "라우터"]
+VERBS = ["설명합니다", "비교합니다", "개선합니다", "측정합니다", "정리합니다", "구현합니다"]
+CHUNKS_PER_DOC = 8
+
+
+def make_encoder(name):
+    if name is None:
+        return default_encoder()
+    if name == "hashing":
+        return HashingEncoder()
+    return SentenceTransformerEncoder(name)
+
+
+def generate(count: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(count):
+        words = rng.sample(TOPICS, 4)
+        text = f"{words[0]}와 {words[1]}의 관계를 {rng.choice(VERBS)}. {words[2]} 단계에서 {words[3]}를 다룹니다. ({i})"
+        doc = i // CHUNKS_PER_DOC
+        yield Chunk(f"doc-{doc}#{i % CHUNKS_PER_DOC}", text, {"source": SOURCES[doc % len(SOURCES)], "doc_id": f"doc-{doc}"})
+
+
+def percentiles(values):
+    values = sorted(values)
+    return values[len(values) // 2], values[min(len(values) - 1, int(len(values) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--model", default=None, help="sentence-transformers 모델 이름 또는 'hashing'")
+    parser.add_argument("--dir", type=Path, default=Path(tempfile.gettempdir()) / "retrieval_bench")
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    encoder = make_encoder(args.model)
+    path = args.dir / f"chroma_{args.chunks}_{encoder.model_id.replace('/', '_')}"
+    if args.rebuild and path.exists():
+        shutil.rmtree(path)
+    retriever = ChromaRetriever(path, collection="bench", encoder=encoder, batch_size=args.batch_size)
+    print(f"인코더: {encoder.model_id} (차원 {encoder.dim}), 배치 {retriever.batch_size}")
+
+    if retriever.count() < args.chunks:
+        # 인코딩과 upsert 시간을 나눠 재기 위해 인코더를 감싸서 측정
+        encode_seconds = 0.0
+        original_encode = encoder.encode
+
+        def timed_encode(texts, batch_size=32):
+            nonlocal encode_seconds
+            start = time.perf_counter()
+            vectors = original_encode(texts, batch_size=batch_size)
+            encode_seconds += time.perf_counter() - start
+            return vectors
+
+        retriever.encoder.encode = timed_encode
+        remaining = generate(args.chunks, args.seed)
+        done = retriever.count()
+        for _ in range(done):
+            next(remaining)
+        print(f"\n[색인] {done:,}건 있음 → {args.chunks:,}건까지 추가: {path}")
+        start = time.perf_counter()
+        report_every = max(args.chunks // 10, retriever.batch_size)
+        while done < args.chunks:
+            batch = [chunk for _, chunk in zip(range(report_every), remaining)]
+            done += retriever.ingest(batch)
+            elapsed = time.perf_counter() - start
+            print(f"  {done:>10,}건  {elapsed:8.1f}s  누적 {done / elapsed:8,.0f} 청크/s")
+        elapsed = time.perf_counter() - start
+        print(f"  인코딩 {encode_seconds:.1f}s / upsert {elapsed - encode_seconds:.1f}s")
+        retriever.encoder.encode = original_encode
+
+    rng = random.Random(args.seed + 1)
+    queries = [" ".join(rng.sample(TOPICS, 2)) + " 관계" for _ in range(args.queries)]
+    filters = {
+        "필터 없음": lambda: None,
+        "source 필터": lambda: {"source": rng.choice(SOURCES)},
+        "doc_id 필터": lambda: {"doc_id": f"doc-{rng.randrange(args.chunks // CHUNKS_PER_DOC)}"},
+    }
+    retriever.query(queries[0], k=args.k)
+    print(f"\n[질의] 컬렉션 {retriever.count():,}건, 질의 {args.queries}건, top-{args.k}")
+    for label, make_filter in filters.items():
+        latencies = []
+        for text in queries:
+            start = time.perf_counter()
+            retriever.query(text, k=args.k, where=make_filter())
+            latencies.append((time.perf_counter() - start) * 1000)
+        p50, p99 = percentiles(latencies)
+        print(f"  {label:<10} p50 {p50:8.2f}ms  p99 {p99:8.2f}ms")
+
+    start = time.perf_counter()
+    for i in range(0, len(queries), 32):
+        retriever.query_batch(queries[i:i + 32], k=args.k)
+    per_query = (time.perf_counter() - start) / len(queries) * 1000
+    print(f"  query_batch(32) 질의당 {per_query:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
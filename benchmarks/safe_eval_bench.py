@@ -0,0 +1,65 @@
+"""
+safe_eval 벤치마크: eval() / 캐시된 safe_eval / NumPy 벡터화 평가 비교
+
+    python benchmarks/safe_eval_bench.py --n 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+
+from graph_utils.safe_eval import compile_expression, evaluate_many, safe_eval
+
+EXPRESSIONS = ["10+5", "(3 * 4) + 10", "7 * 8 * 2", "2 ** 10 - 1", "(100 - 37) / 3 % 7"]
+
+
+def timed(label: str, func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<36} {elapsed / repeat * 1e6:8.2f} µs/회")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print("[반복되는 수식의 스칼라 평가]")
+    for text in EXPRESSIONS:
+        print(f" {text!r}")
+        base = timed("eval()", lambda: eval(text), args.repeat)
+        compile_expression.cache_clear()
+        cold = timed("safe_eval (캐시 없음)", lambda: (compile_expression.cache_clear(), safe_eval(text)), args.repeat // 10) * 10
+        fast = timed("safe_eval (LRU 캐시)", lambda: safe_eval(text), args.repeat)
+        print(f"  → eval 대비 캐시 사용 시 {base / fast:.1f}배, 캐시 없을 때 {base / cold:.1f}배")
+
+    print(f"\n[벡터화 평가: {args.n:,}개 값]")
+    text = "a * 2 + b ** 2 - abs(a - b) / 3"
+    a = np.random.rand(args.n) * 100
+    b = np.random.rand(args.n) * 100
+    compiled = compile_expression(text)
+
+    start = time.perf_counter()
+    loop_result = [compiled(a=x, b=y) for x, y in zip(a.tolist(), b.tolist())]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vector_result = evaluate_many(text, a=a, b=b)
+    vector_time = time.perf_counter() - start
+
+    assert np.allclose(loop_result, vector_result)
+    print(f"  요소별 반복: {loop_time * 1000:8.1f} ms")
+    print(f"  evaluate_many: {vector_time * 1000:8.1f} ms ({loop_time / vector_time:.0f}배)")
+
+
+if __name__ == "__main__":
+    main()
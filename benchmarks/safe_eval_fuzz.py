@@ -0,0 +1,118 @@
+"""
+safe_eval 퍼즈 검사: 무작위 산술식에 대해 기존 eval() 동작과 결과가 같은지 확인
+
+- 허용 문법 안의 수식: 결과가 같거나, 둘 다 예외(→ calculate 의 "계산 오류")여야 합니다.
+- 위험한 입력: eval 은 실행하지만 safe_eval 은 UnsafeExpressionError 로 거절해야 합니다.
+
+    python benchmarks/safe_eval_fuzz.py --cases 20000 --seed 1
+"""
+
+import argparse
+import math
+import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from graph_utils.safe_eval import UnsafeExpressionError, safe_eval
+
+OPERATORS = ["+", "-", "*", "/", "//", "%", "**"]
+FUNCTIONS = ["abs", "round", "min", "max"]
+
+UNSAFE_INPUTS = [
+    "__import__('os').system('echo hi')",
+    "open('/etc/passwd').read()",
+    "(1).__class__.__bases__",
+    "[x for x in range(10)]",
+    "lambda: 1",
+    "'a' * 3",
+    "1 if True else 2",
+    "1 < 2",
+    "a.b",
+    "x[0]",
+    "True + 1",
+    "1 ^ 2",
+    "9**9**9",
+]
+
+
+def random_expression(rng: random.Random, depth: int = 0) -> str:
+    roll = rng.random()
+    if depth > 3 or roll < 0.3:
+        if rng.random() < 0.7:
+            return str(rng.randint(0, 20))
+        return f"{rng.uniform(0, 20):.2f}"
+    if roll < 0.4:
+        return f"{rng.choice(['-', '+'])}{random_expression(rng, depth + 1)}"
+    if roll < 0.5:
+        func = rng.choice(FUNCTIONS)
+        if func in ("min", "max"):
+            return f"{func}({random_expression(rng, depth + 1)}, {random_expression(rng, depth + 1)})"
+        return f"{func}({random_expression(rng, depth + 1)})"
+    op = rng.choice(OPERATORS)
+    left = random_expression(rng, depth + 1)
+    right = random_expression(rng, depth + 1)
+    if op == "**":
+        right = str(rng.randint(-3, 4))
+    text = f"{left} {op} {right}"
+    return f"({text})" if rng.random() < 0.5 else text
+
+
+def outcome(func, text):
+    try:
+        return "ok", func(text)
+    except Exception as e:
+        return "error", type(e).__name__
+
+
+def same(a, b) -> bool:
+    if a[0] != b[0]:
+        return False
+    if a[0] == "error":
+        return True
+    x, y = a[1], b[1]
+    if isinstance(x, complex) or isinstance(y, complex):
+        return x == y
+    if isinstance(x, float) and isinstance(y, float) and math.isnan(x) and math.isnan(y):
+        return True
+    return x == y and type(x) is type(y)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mismatches = []
+    for _ in range(args.cases):
+        text = random_expression(rng)
+        expected = outcome(lambda t: eval(t, {"__builtins__": {}}, {"abs": abs, "round": round, "min": min, "max": max}), text)
+        actual = outcome(safe_eval, text)
+        if not same(expected, actual):
+            mismatches.append((text, expected, actual))
+
+    print(f"무작위 수식 {args.cases}개 중 불일치 {len(mismatches)}개")
+    for text, expected, actual in mismatches[:10]:
+        print(f"  {text!r}: eval={expected} safe_eval={actual}")
+
+    rejected = 0
+    for text in UNSAFE_INPUTS:
+        try:
+            safe_eval(text)
+        except (UnsafeExpressionError, OverflowError):
+            rejected += 1
+        except Exception as e:
+            print(f"  거절되지 않고 다른 예외 발생: {text!r} → {type(e).__name__}")
+        else:
+            print(f"  ⚠️ 위험한 입력이 실행됨: {text!r}")
+    print(f"위험한 입력 {len(UNSAFE_INPUTS)}개 중 {rejected}개 거절")
+
+    if mismatches or rejected != len(UNSAFE_INPUTS):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+그래프 서버 부하 테스트: 그래프별 초당 요청 수(RPS)와 p50/p99 지연
+
+7_Graph_Service/graph_server.py 를 하위 프로세스로 띄우고(또는 --url 로 이미 떠 있는 서버),
+동시 클라이언트 --concurrency 개가 --seconds 동안 쉬지 않고 요청합니다.
+
+- sequential:   POST /graphs/sequential/invoke
+- tool_calling: POST /graphs/tool_calling/invoke (날씨/계산/검색 질의를 번갈아)
+- document:     HIL 세션 = invoke 1번 + interrupt 마다 resume (interrupt 종류에 맞춰 자동 응답)
+                요청 단위 지연과 함께 세션 하나가 끝날 때까지의 지연도 봅니다.
+
+    python benchmarks/service_load_test.py --concurrency 16 --seconds 5
+    python benchmarks/service_load_test.py --url http://127.0.0.1:8000 --graphs document
+"""
+
+import argparse
+import asyncio
+import itertools
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+import httpx
+
+DOCUMENT_INITIAL_STATE = {
+    "topic": "", "document_type": "", "target_audience": "", "outline": [], "sections": {}, "messages": [],
+    "revisions": [], "quality_score": 0.0, "approved_sections": [], "current_section": None,
+    "requires_research": False, "research_results": [], "run_metadata": {}, "final_approved": False,
+}
+TOOL_QUERIES = ["오늘 날씨 어때?", "100 더하기 200은?", "Python이 뭐야?"]
+
+
+def answer(value):
+    """문서 작성 그래프의 interrupt 에 대한 자동 응답"""
+    if isinstance(value, dict):
+        return {
+            "research_decision": "no",
+            "outline_review": "OK",
+            "section_edit": f"{value.get('section')} 편집본",
+            "final_review": "approve",
+        }.get(value.get("type"), "OK")
+    for keyword, reply in [("주제", "LangGraph 소개"), ("타입", "blog"), ("독자", "개발자"),
+                           ("검색", "skip"), ("저장", "no")]:
+        if keyword in value:
+            return reply
+    return "OK"
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, extra_args=()):
+    process = subprocess.Popen(
+        [sys.executable, "-W", "ignore", str(ROOT / "7_Graph_Service" / "graph_server.py"), "--port", str(port), *extra_args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 시작 실패: {process.stderr.read().decode()[-2000:]}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("서버가 120초 안에 뜨지 않았습니다")
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.sessions = []
+        self.errors = 0
+
+    async def post(self, client: httpx.AsyncClient, path: str, payload):
+        t0 = time.perf_counter()
+        response = await client.post(path, json=payload)
+        self.latencies.append((time.perf_counter() - t0) * 1000)
+        if response.status_code != 200:
+            self.errors += 1
+            return None
+        return response.json()
+
+
+async def sequential_worker(client, stats, deadline, _):
+    while time.perf_counter() < deadline:
+        await stats.post(client, "/graphs/sequential/invoke", {"input": {"input": "테스트", "output": "", "step": 0}})
+
+
+async def tool_worker(client, stats, deadline, worker):
+    queries = itertools.cycle(TOOL_QUERIES[worker % 3:] + TOOL_QUERIES[:worker % 3])
+    while time.perf_counter() < deadline:
+        await stats.post(client, "/graphs/tool_calling/invoke", {"input": {"query": next(queries), "tool": "", "output": ""}})
+
+
+async def document_worker(client, stats, deadline, _):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        result = await stats.post(client, "/graphs/document/invoke", {"input": DOCUMENT_INITIAL_STATE})
+        while result and result["interrupts"]:
+            path = f"/graphs/document/threads/{result['thread_id']}/resume"
+            result = await stats.post(client, path, {"resume": answer(result["interrupts"][0]["value"])})
+        if result is not None:
+            stats.sessions.append((time.perf_counter() - start) * 1000)
+
+
+WORKERS = {"sequential": sequential_worker, "tool_calling": tool_worker, "document": document_worker}
+
+
+async def run_graph(url: str, graph: str, concurrency: int, seconds: float) -> Stats:
+    stats = Stats()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        await WORKERS[graph](client, Stats(), time.perf_counter() + 0.5, 0)    # 워밍업
+        deadline = time.perf_counter() + seconds
+        started = time.perf_counter()
+        await asyncio.gather(*(WORKERS[graph](client, stats, deadline, i) for i in range(concurrency)))
+        stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="이미 떠 있는 서버 주소 (없으면 graph_server.py 를 띄움)")
+    parser.add_argument("--graphs", nargs="+", default=list(WORKERS), choices=list(WORKERS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        process = start_server(port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        print(f"서버 {url}, 동시 클라이언트 {args.concurrency}, 그래프당 {args.seconds:.0f}초\n")
+        print(f"  {'그래프':<14} {'요청':>7} {'RPS':>8} {'p50':>9} {'p99':>9} {'오류':>5} {'세션/s':>7} {'세션 p99':>10}")
+        for graph in args.graphs:
+            stats = asyncio.run(run_graph(url, graph, args.concurrency, args.seconds))
+            sessions = (
+                f"{len(stats.sessions) / stats.elapsed:7.1f} {percentile(stats.sessions, 0.99):8.1f}ms"
+                if stats.sessions else f"{'-':>7} {'-':>10}"
+            )
+            print(
+                f"  {graph:<14} {len(stats.latencies):7d} {len(stats.latencies) / stats.elapsed:8.1f} "
+                f"{percentile(stats.latencies, 0.5):7.1f}ms {percentile(stats.latencies, 0.99):7.1f}ms "
+                f"{stats.errors:5d} {sessions}"
+            )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+스트리밍 백프레셔 벤치마크: 느린 클라이언트에서 큐 정책별 메모리(큐 깊이)와 지연
+
+스텁 LLM 이 긴 답변을 어절 단위로 빠르게 스트리밍하고(messages 모드),
+노드가 어절 20개마다 진행률(custom 모드)을 보내는 그래프를 GraphService.stream 으로 실행합니다.
+소비자는 이벤트 하나를 보낼 때마다 --consumer-ms 만큼 걸리는 느린 클라이언트를 흉내 냅니다.
+
+정책마다
+- 최대 큐 깊이 (서버가 연결 하나에 붙잡아 두는 이벤트 수)
+- 그래프 완료 시간 (block 은 생산자가 기다리므로 늘어남)
+- 마지막 이벤트 전달 시간, 전달/버림/합친 이벤트 수
+- 클라이언트가 이어 붙인 답변이 원문과 같은지
+를 비교합니다. "무제한" 은 큐 크기를 사실상 없앤 순진한 전달기입니다.
+
+    python benchmarks/stream_backpressure_bench.py --tokens 3000 --consumer-ms 1
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from langchain_core.messages import AIMessage
+from langgraph.config import get_stream_writer
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from graph_utils.event_stream import EventQueue, drain
+from graph_utils.llm_stub import StubChatModel
+from graph_utils.service import GraphRegistry, GraphService
+
+
+def build_service(tokens: int) -> GraphService:
+    answer = " ".join(f"어절{i}" for i in range(tokens))
+    model = StubChatModel(responder=lambda messages: AIMessage(content=answer))
+
+    def agent(state: MessagesState):
+        writer = get_stream_writer()
+        message = None
+        for i, chunk in enumerate(model.stream(state["messages"])):
+            message = chunk if message is None else message + chunk
+            if i % 20 == 0:
+                writer({"progress": round(i / tokens, 3)})
+        return {"messages": [AIMessage(content=message.content, id=message.id)]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("agent", agent)
+    graph.add_edge(START, "agent")
+    graph.add_edge("agent", END)
+    registry = GraphRegistry()
+    registry.register("long_answer", graph.compile())
+    return GraphService(registry), answer
+
+
+async def run(service: GraphService, answer: str, policy: str, maxsize: int, consumer_ms: float):
+    queue = EventQueue(maxsize, policy)
+    marks = {}
+
+    async def events():
+        async for event in service.stream("long_answer", {"messages": [("user", "길게 답해줘")]},
+                                          stream_mode=["messages", "custom"]):
+            if event["event"] == "end":
+                marks["graph_done"] = time.perf_counter()
+            yield event
+
+    start = time.perf_counter()
+    text = []
+    async for event in drain(events(), queue, heartbeat_s=None):
+        if event["event"] == "messages":
+            text.append(event["data"]["message"].content)
+        await asyncio.sleep(consumer_ms / 1000)
+    finished = time.perf_counter()
+    return {
+        "graph_s": marks["graph_done"] - start,
+        "delivered_s": finished - start,
+        "intact": "".join(text) == answer,
+        **queue.stats.as_dict(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=3000)
+    parser.add_argument("--consumer-ms", type=float, default=1.0, help="이벤트 하나를 보내는 데 걸리는 시간 (느린 클라이언트)")
+    parser.add_argument("--queue", type=int, default=64)
+    args = parser.parse_args()
+
+    service, answer = build_service(args.tokens)
+    print(f"어절 {args.tokens:,}개 답변, 소비자 {args.consumer_ms}ms/이벤트, 큐 {args.queue}\n")
+    print(f"  {'정책':<12} {'최대 깊이':>8} {'그래프 완료':>10} {'전달 완료':>9} {'전달':>6} {'버림':>6} {'합침':>6} {'생산자 대기':>10}  답변 보존")
+    cases = [("무제한", "block", 10**9)] + [(policy, policy, args.queue) for policy in ("block", "drop_oldest", "drop_newest", "coalesce")]
+    for label, policy, maxsize in cases:
+        result = asyncio.run(run(service, answer, policy, maxsize, args.consumer_ms))
+        print(
+            f"  {label:<12} {result['max_depth']:8d} {result['graph_s']:9.2f}s {result['delivered_s']:8.2f}s "
+            f"{result['sent']:6d} {result['dropped']:6d} {result['coalesced']:6d} {result['producer_wait_ms'] / 1000:9.2f}s  "
+            f"{'예' if result['intact'] else '아니오'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
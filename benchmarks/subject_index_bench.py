@@ -0,0 +1,77 @@
+"""
+과목명 정규화 인덱스 벤치마크: 자모 한 개 오타를 낸 질의의 복원율과 지연
+
+과목 수를 늘려 가며 (기본 2, 200, 2,000개) 임의 과목명에 자모 한 개를 바꾼 질의를 만들고
+SubjectIndex.match() 가 원래 과목을 찾는 비율과 질의당 지연을 측정합니다.
+캐시 효과를 빼기 위해 질의마다 새로운 문자열을 사용합니다.
+
+    python benchmarks/subject_index_bench.py --queries 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from graph_utils.subject_index import SubjectIndex
+
+
+def compose(cho: int, jung: int, jong: int) -> str:
+    return chr(0xAC00 + cho * 588 + jung * 28 + jong)
+
+
+def random_syllable(rng):
+    return compose(rng.randrange(19), rng.randrange(21), rng.choice([0, 0, 4, 8, 16, 21]))
+
+
+def typo(name: str, rng) -> str:
+    """음절 하나의 초성을 다른 초성으로 바꿈 (자모 편집 거리 1)"""
+    i = rng.randrange(len(name))
+    index = ord(name[i]) - 0xAC00
+    cho, rest = divmod(index, 588)
+    new_cho = (cho + rng.randrange(1, 19)) % 19
+    return name[:i] + chr(0xAC00 + new_cho * 588 + rest) + name[i + 1:]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for count in (2, 200, 2000):
+        names = {"국어", "수학"}
+        while len(names) < count:
+            names.add("".join(random_syllable(rng) for _ in range(rng.randint(2, 4))))
+        names = sorted(names)
+
+        start = time.perf_counter()
+        index = SubjectIndex({name: [] for name in names})
+        build_ms = (time.perf_counter() - start) * 1000
+
+        latencies, correct, ambiguous = [], 0, 0
+        for _ in range(args.queries):
+            target = rng.choice(names)
+            query = typo(target, rng) + " " * rng.randrange(2)
+            start = time.perf_counter()
+            result = index.match(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if result is None:
+                ambiguous += 1
+            elif result.subject == target:
+                correct += 1
+
+        latencies.sort()
+        print(f"[과목 {count:,}개] 인덱스 생성 {build_ms:.1f}ms")
+        print(
+            f"  p50 {latencies[len(latencies) // 2]:.3f}ms  p99 {latencies[int(len(latencies) * 0.99)]:.3f}ms  "
+            f"복원 {correct / args.queries:.1%}  None(애매/없음) {ambiguous / args.queries:.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
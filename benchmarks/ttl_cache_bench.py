@@ -0,0 +1,154 @@
+"""
+TTL 캐시 벤치마크: 200ms 지연의 로컬 HTTP 날씨 API 를 대상으로 비교
+
+1. 캐시 없음 / @ttl_cache 에서 같은 부하(인기 도시 편중)를 걸어 지연과 API 호출 수 비교
+2. 캐시가 빈 상태에서 같은 키로 동시 요청 → single-flight 로 API 1회만 호출되는지 확인
+3. ttl 을 짧게 두고 계속 요청 → stale-while-revalidate 로 만료 이후에도 지연이 낮게 유지되는지 확인
+
+    python benchmarks/ttl_cache_bench.py --workers 16 --requests 50 --latency-ms 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from graph_utils.ttl_cache import ttl_cache
+
+CITIES = ["서울", "부산", "제주", "대구", "인천", "광주", "대전", "울산"]
+# 서울/부산에 요청이 몰리는 인기 편중 분포
+WEIGHTS = [40, 20, 10, 8, 8, 6, 4, 4]
+
+
+class WeatherAPI:
+    """지정한 지연 후 응답하는 로컬 HTTP 날씨 API"""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self._lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with api._lock:
+                    api.calls += 1
+                time.sleep(api.latency)
+                city = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query).get("city", [""])[0]
+                body = json.dumps({"city": city, "weather": "맑음, 15도"}, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/weather"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def fetch(self, city: str) -> str:
+        query = urllib.parse.urlencode({"city": city})
+        with urllib.request.urlopen(f"{self.url}?{query}") as response:
+            return json.loads(response.read())["weather"]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_load(get_weather, workers: int, requests: int, seed: int):
+    rng = random.Random(seed)
+    plan = [[rng.choices(CITIES, WEIGHTS)[0] for _ in range(requests)] for _ in range(workers)]
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(cities):
+        local = []
+        for city in cities:
+            start = time.perf_counter()
+            get_weather(city)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(worker, plan))
+    return latencies, time.perf_counter() - start
+
+
+def report(label, latencies, elapsed, api_calls):
+    print(
+        f"  {label:<14} p50 {percentile(latencies, 0.5):7.1f}ms  p99 {percentile(latencies, 0.99):7.1f}ms  "
+        f"처리량 {len(latencies) / elapsed:7.1f} req/s  API 호출 {api_calls}회"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50, help="워커당 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    api = WeatherAPI(args.latency_ms)
+
+    print(f"[1] 인기 편중 부하: 워커 {args.workers}개 × {args.requests}건, API 지연 {args.latency_ms:.0f}ms")
+    api.reset()
+    latencies, elapsed = run_load(api.fetch, args.workers, args.requests, args.seed)
+    report("캐시 없음", latencies, elapsed, api.calls)
+
+    cached = ttl_cache(ttl=60, stale_ttl=300)(api.fetch)
+    api.reset()
+    latencies, elapsed = run_load(cached, args.workers, args.requests, args.seed)
+    report("@ttl_cache", latencies, elapsed, api.calls)
+    print(f"  캐시 지표: {cached.cache.stats.snapshot()}")
+
+    print("\n[2] 빈 캐시에 같은 키 동시 요청 (single-flight)")
+    burst = ttl_cache(ttl=60)(api.fetch)
+    api.reset()
+    with ThreadPoolExecutor(50) as pool:
+        list(pool.map(lambda _: burst("서울"), range(50)))
+    print(f"  동시 요청 50건 → API 호출 {api.calls}회, {burst.cache.stats.snapshot()}")
+
+    print("\n[3] ttl 0.5초, 3초 동안 계속 요청 (stale-while-revalidate)")
+    for label, stale_ttl in (("SWR 없음", 0.0), ("SWR 사용", 60.0)):
+        swr = ttl_cache(ttl=0.5, stale_ttl=stale_ttl)(api.fetch)
+        swr("서울")
+        api.reset()
+        latencies = []
+        deadline = time.perf_counter() + 3
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            swr("서울")
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+        print(
+            f"  {label:<8} 요청 {len(latencies)}건, {args.latency_ms:.0f}ms 이상 대기 {sum(l >= args.latency_ms for l in latencies)}건, "
+            f"p99 {percentile(latencies, 0.99):6.1f}ms, 최대 {max(latencies):6.1f}ms, API 호출 {api.calls}회"
+        )
+
+    api.server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
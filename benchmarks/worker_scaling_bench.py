@@ -0,0 +1,64 @@
+"""
+워커 프로세스 수에 따른 처리량 확장 벤치마크 (1 → N 코어)
+
+graph_server.py 를 --workers N --checkpoint <SQLite 파일> 로 띄우고 (라우터 + 워커 N 개)
+service_load_test 와 같은 부하를 걸어 그래프별 RPS 와 p50/p99, 워커 1개 대비 배율을 봅니다.
+"단일" 은 라우터 없이 프로세스 하나가 같은 SQLite 체크포인트로 직접 받는 경우입니다 (라우터 비용 비교용).
+
+- tool_calling: 상태 없는 그래프. thread_id 를 라우터가 발급하므로 워커에 고르게 분산
+- document:     HIL 세션. invoke 와 resume 이 thread_id 해시로 늘 같은 워커에 도착
+                (모든 워커가 같은 WAL 파일에 체크포인트를 씀)
+
+배율은 코어 수를 넘어서 늘지 않습니다. 시작할 때 이 머신의 코어 수를 함께 출력합니다.
+
+    python benchmarks/worker_scaling_bench.py --max-workers 4 --concurrency 32 --seconds 5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from service_load_test import WORKERS, free_port, percentile, run_graph, start_server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--graphs", nargs="+", default=["tool_calling", "document"], choices=list(WORKERS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    counts = [0] + list(range(1, args.max_workers + 1))
+    print(f"코어 {os.cpu_count()}개, 동시 클라이언트 {args.concurrency}, 그래프당 {args.seconds:.0f}초\n")
+    print(f"  {'워커':<6} {'그래프':<14} {'요청':>7} {'RPS':>8} {'배율':>6} {'p50':>9} {'p99':>9} {'오류':>5}")
+    baseline = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            port = free_port()
+            checkpoint = str(Path(tmp) / f"checkpoints_{count}.sqlite")
+            extra = ["--checkpoint", checkpoint] + (["--workers", str(count)] if count else [])
+            process = start_server(port, extra)
+            try:
+                for graph in args.graphs:
+                    stats = asyncio.run(run_graph(f"http://127.0.0.1:{port}", graph, args.concurrency, args.seconds))
+                    rps = len(stats.latencies) / stats.elapsed
+                    if count == 1:
+                        baseline[graph] = rps
+                    scale = f"{rps / baseline[graph]:5.2f}x" if graph in baseline else f"{'-':>6}"
+                    print(
+                        f"  {count or '단일':<6} {graph:<14} {len(stats.latencies):7d} {rps:8.1f} {scale} "
+                        f"{percentile(stats.latencies, 0.5):7.1f}ms {percentile(stats.latencies, 0.99):7.1f}ms {stats.errors:5d}"
+                    )
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
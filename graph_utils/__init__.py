@@ -0,0 +1,12 @@
+"""
+예제 그래프들이 공통으로 사용하는 실행/성능 유틸리티 모음
+
+번호가 붙은 예제 폴더(3_Graph_node_edge 등)는 패키지로 import 할 수 없으므로,
+각 스크립트는 저장소 루트를 sys.path 에 추가한 뒤 이 패키지를 사용합니다.
+
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+    from graph_utils.runner import stream_and_collect
+"""
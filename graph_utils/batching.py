@@ -0,0 +1,232 @@
+"""
+동적 마이크로 배치 스케줄러 (임베딩 / 리랭커 추론용)
+
+동시에 실행되는 그래프 노드들이 각자 encode([text]) 처럼 배치 크기 1로 모델을 부르면
+CPU 의 벡터화 이점을 살리지 못합니다. MicroBatcher 는 여러 호출자의 요청을
+max_wait_ms 동안 또는 max_batch 개가 찰 때까지 모아 배치 함수 한 번으로 처리하고,
+각 호출자의 Future 에 자기 결과를 돌려줍니다.
+
+- 길이 버킷: 요청을 길이의 2의 거듭제곱 구간별로 따로 모아, 한 배치 안의
+  최대 길이가 최소 길이의 2배를 넘지 않게 합니다. 모델 토크나이저가 배치 최대 길이까지
+  패딩하므로 버킷이 곧 패딩 낭비의 상한입니다. 패딩은 토큰 단위이므로 텍스트 요청에는
+  token_counter(모델) 로 만든 토큰 수 함수를 length 로 넘깁니다 (기본 len 은 글자 수라
+  한글 / 영문이 섞이면 토큰 수와 크게 어긋남).
+- 동기 호출자(스레드)는 batcher(item) / submit(item).result(),
+  비동기 호출자는 await batcher.acall(item) 을 씁니다.
+- 배치 함수는 전용 워커 스레드 하나에서 실행되므로 모델은 한 번에 한 배치만 처리합니다.
+
+    batcher = MicroBatcher(lambda texts: list(model.encode(texts)), max_batch=32, max_wait_ms=5)
+    vector = batcher("서울 날씨 알려줘")
+
+    encoder = BatchedEncoder(default_encoder())   # Encoder 와 같은 인터페이스
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Generic, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+from graph_utils.embeddings import Encoder
+from graph_utils.history import estimate_text_tokens
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class _Request(Generic[T]):
+    item: T
+    future: Future
+    length: int
+    deadline: float
+
+
+def length_bucket(length: int) -> int:
+    """길이 → 2의 거듭제곱 구간 번호 (1, 2, 3-4, 5-8, ...)"""
+    return max(0, length - 1).bit_length()
+
+
+def token_counter(model: Any) -> Callable[[str], int]:
+    """모델(또는 그 래퍼 인코더)이 쓰는 토크나이저의 토큰 수 함수
+
+    SentenceTransformer / CrossEncoder 처럼 .tokenizer 를 가진 모델이면 그 토크나이저로 세고,
+    꺼낼 수 없으면(해싱 인코더 등) estimate_text_tokens 로 추정합니다.
+    """
+    # CachedEncoder / BatchedEncoder 는 .encoder, SentenceTransformerEncoder 는 .model 에 실제 모델을 가짐
+    while hasattr(model, "encoder"):
+        model = model.encoder
+    tokenizer = getattr(getattr(model, "model", model), "tokenizer", None)
+    if tokenizer is None or not hasattr(tokenizer, "tokenize"):
+        return estimate_text_tokens
+    return lambda text: len(tokenizer.tokenize(text))
+
+
+class MicroBatcher(Generic[T, R]):
+    """요청을 모아 batch_fn(items) → results 한 번으로 처리하는 스케줄러"""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[T]], Sequence[R]],
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+        length: Optional[Callable[[T], int]] = len,
+        bucket: bool = True,
+        name: str = "micro-batcher",
+    ):
+        """
+        Args:
+            batch_fn: 요청 목록을 받아 같은 순서의 결과 목록을 반환하는 함수
+            max_wait_ms: 버킷의 첫 요청이 기다리는 최대 시간
+            length: 요청 길이 함수 (버킷과 패딩 효율 통계에 사용, None 이면 길이 없음)
+            bucket: False 면 길이와 상관없이 한 줄로 모음
+        """
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.length = length
+        self.bucket = bucket and length is not None
+        self.name = name
+        self._buckets: Dict[int, Deque[_Request]] = {}
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+        self._useful = 0
+        self._padded = 0
+
+    # ----------------------------------------
+    # 요청
+    # ----------------------------------------
+
+    def submit(self, item: T) -> "Future[R]":
+        future: Future = Future()
+        length = self.length(item) if self.length is not None else 0
+        bucket = length_bucket(length) if self.bucket else 0
+        request = _Request(item, future, length, time.monotonic() + self.max_wait_ms / 1000)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"{self.name} 가 이미 종료되었습니다")
+            self._buckets.setdefault(bucket, deque()).append(request)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        return future
+
+    def __call__(self, item: T) -> R:
+        return self.submit(item).result()
+
+    async def acall(self, item: T) -> R:
+        return await asyncio.wrap_future(self.submit(item))
+
+    def map(self, items: Sequence[T]) -> List[R]:
+        """여러 요청을 한꺼번에 넣고 결과를 순서대로 반환 (다른 호출자의 요청과도 함께 배치됨)"""
+        futures = [self.submit(item) for item in items]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """남은 요청을 모두 처리한 뒤 워커를 종료"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
+
+    # ----------------------------------------
+    # 워커
+    # ----------------------------------------
+
+    def _next_batch(self) -> Optional[List[_Request]]:
+        """처리할 배치를 고를 때까지 대기 (종료 후 남은 요청이 없으면 None)"""
+        with self._cond:
+            while True:
+                if not self._buckets:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                ready = next((key for key, queue in self._buckets.items() if len(queue) >= self.max_batch), None)
+                if ready is None:
+                    # 가장 오래 기다린 버킷의 기한이 지났거나 종료 중이면 그 버킷을 처리
+                    key, queue = min(self._buckets.items(), key=lambda kv: kv[1][0].deadline)
+                    if queue[0].deadline <= now or self._closed:
+                        ready = key
+                    else:
+                        self._cond.wait(queue[0].deadline - now)
+                        continue
+                queue = self._buckets[ready]
+                batch = [queue.popleft() for _ in range(min(self.max_batch, len(queue)))]
+                if not queue:
+                    del self._buckets[ready]
+                return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            if batch:
+                self._execute(batch)
+
+    def _execute(self, batch: List[_Request]) -> None:
+        try:
+            results = list(self.batch_fn([request.item for request in batch]))
+            if len(results) != len(batch):
+                raise ValueError(f"batch_fn 이 {len(batch)}개 요청에 {len(results)}개 결과를 반환했습니다")
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
+        with self._cond:
+            self.batches += 1
+            self.items += len(batch)
+            self._useful += sum(request.length for request in batch)
+            self._padded += max(request.length for request in batch) * len(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch": self.items / self.batches if self.batches else 0.0,
+                # 배치 최대 길이까지 패딩했을 때 실제 길이의 비율 (1.0 이면 낭비 없음)
+                "padding_efficiency": self._useful / self._padded if self._padded else 1.0,
+            }
+
+
+class BatchedEncoder:
+    """동시 호출을 MicroBatcher 로 모아 인코딩하는 Encoder 래퍼"""
+
+    def __init__(self, encoder: Encoder, max_batch: int = 32, max_wait_ms: float = 5.0, bucket: bool = True):
+        self.encoder = encoder
+        self.model_id = encoder.model_id
+        self.dim = encoder.dim
+        self.batcher: MicroBatcher[str, np.ndarray] = MicroBatcher(
+            lambda texts: encoder.encode(texts, batch_size=len(texts)),
+            max_batch=max_batch,
+            max_wait_ms=max_wait_ms,
+            length=token_counter(encoder),
+            bucket=bucket,
+            name=f"batched-{encoder.model_id}",
+        )
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack(self.batcher.map(texts))
+
+    async def aencode(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack(await asyncio.gather(*(self.batcher.acall(text) for text in texts)))
@@ -0,0 +1,249 @@
+"""
+상품 카탈로그 인덱스 (키워드 역색인 + 가격 정렬 배열, 메모리 맵 파일)
+
+search_product 는 호출할 때마다 상품 리스트를 만들고 max_price 로 선형 필터링합니다.
+실제 카탈로그(수백만 건)에서는 쓸 수 없으므로, 미리 만든 인덱스 파일을
+np.load(mmap_mode="r") 로 열어 필요한 페이지만 읽습니다.
+
+디렉터리 구성 (write_catalog 가 생성)
+
+- meta.json          상품 수, 포맷 버전
+- sorted_prices.npy  가격 오름차순 정렬 배열          → 가격 범위는 이분 탐색(searchsorted)
+- price_order.npy    가격 순위 → 상품 id
+- postings.npy       토큰별 "가격 순위" 목록을 이어 붙인 배열 (각 구간은 오름차순)
+- vocab.json         토큰 → postings.npy 의 [시작, 끝)
+- names.bin / name_offsets.npy  상품 id 순서의 UTF-8 이름
+
+역색인에 상품 id 대신 가격 순위를 저장하므로 posting 자체가 가격순으로 정렬되어 있고,
+"키워드 + 가격 범위" 질의도 posting 위에서 이분 탐색 두 번으로 끝납니다.
+결과는 가격 오름차순(또는 내림차순)으로 offset/limit 페이지 단위로 반환합니다.
+
+    catalog = ProductCatalog.open("catalog_data")
+    page = catalog.search("노트북", max_price=40000, limit=10)
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+CATALOG_FORMAT_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[0-9a-z가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 영숫자/한글 단어 단위 토큰 (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(_TOKEN_RE.findall(text.lower())))
+
+
+@dataclass(frozen=True)
+class Product:
+    id: int
+    name: str
+    price: int
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"name": self.name, "price": self.price}
+
+
+@dataclass
+class CatalogPage:
+    """검색 결과 한 페이지"""
+    items: List[Product]
+    total: int
+    offset: int
+    limit: int
+
+    @property
+    def has_next(self) -> bool:
+        return self.offset + len(self.items) < self.total
+
+
+# ========================================
+# 인덱스 파일 생성
+# ========================================
+
+def write_catalog(
+    path: Union[str, Path],
+    names: Iterable[str],
+    prices: Sequence[int],
+    postings: Mapping[str, np.ndarray],
+    chunk_size: int = 100_000,
+) -> Path:
+    """카탈로그 인덱스 파일을 생성
+
+    Args:
+        names: 상품 id 순서의 이름 (제너레이터 가능, chunk_size 단위로 기록)
+        prices: 상품 id 순서의 가격
+        postings: 토큰 → 그 토큰을 가진 상품 id 배열
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    prices = np.asarray(prices, dtype=np.int64)
+    count = len(prices)
+
+    order = np.argsort(prices, kind="stable")
+    rank_of = np.empty(count, dtype=np.int64)
+    rank_of[order] = np.arange(count)
+    np.save(path / "sorted_prices.npy", prices[order])
+    np.save(path / "price_order.npy", order)
+
+    rank_dtype = np.int32 if count < 2**31 else np.int64
+    vocab: Dict[str, Tuple[int, int]] = {}
+    chunks = []
+    start = 0
+    for token, ids in postings.items():
+        ranks = np.sort(rank_of[np.asarray(ids, dtype=np.int64)]).astype(rank_dtype)
+        vocab[token] = (start, start + len(ranks))
+        chunks.append(ranks)
+        start += len(ranks)
+    np.save(path / "postings.npy", np.concatenate(chunks) if chunks else np.empty(0, dtype=rank_dtype))
+    (path / "vocab.json").write_text(json.dumps(vocab, ensure_ascii=False), encoding="utf-8")
+
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    written = 0
+    with open(path / "names.bin", "wb") as f:
+        batch: List[bytes] = []
+        for i, name in enumerate(names):
+            batch.append(name.encode("utf-8"))
+            if len(batch) == chunk_size:
+                written = _flush_names(f, batch, offsets, i + 1 - len(batch), written)
+                batch = []
+        if batch:
+            _flush_names(f, batch, offsets, count - len(batch), written)
+    np.save(path / "name_offsets.npy", offsets)
+
+    (path / "meta.json").write_text(json.dumps({"count": count, "version": CATALOG_FORMAT_VERSION}), encoding="utf-8")
+    return path
+
+
+def _flush_names(f, batch: List[bytes], offsets: np.ndarray, first_id: int, written: int) -> int:
+    lengths = np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+    offsets[first_id + 1:first_id + 1 + len(batch)] = written + np.cumsum(lengths)
+    f.write(b"".join(batch))
+    return written + int(lengths.sum())
+
+
+def build_catalog(
+    path: Union[str, Path],
+    products: Iterable[Tuple[str, int]],
+    tokenizer: Callable[[str], List[str]] = tokenize,
+) -> "ProductCatalog":
+    """(이름, 가격) 목록을 토큰화해 인덱스 파일을 만들고 바로 연다"""
+    names: List[str] = []
+    prices: List[int] = []
+    postings: Dict[str, List[int]] = {}
+    for item_id, (name, price) in enumerate(products):
+        names.append(name)
+        prices.append(int(price))
+        for token in tokenizer(name):
+            postings.setdefault(token, []).append(item_id)
+    write_catalog(path, names, prices, {t: np.array(ids) for t, ids in postings.items()})
+    return ProductCatalog.open(path, tokenizer=tokenizer)
+
+
+# ========================================
+# 조회
+# ========================================
+
+@dataclass
+class ProductCatalog:
+    """메모리 맵으로 연 카탈로그 인덱스"""
+    path: Path
+    sorted_prices: np.ndarray
+    price_order: np.ndarray
+    postings: np.ndarray
+    vocab: Dict[str, Tuple[int, int]]
+    names_blob: np.ndarray
+    name_offsets: np.ndarray
+    tokenizer: Callable[[str], List[str]] = field(default=tokenize, repr=False)
+
+    @classmethod
+    def open(cls, path: Union[str, Path], tokenizer: Callable[[str], List[str]] = tokenize) -> "ProductCatalog":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("version") != CATALOG_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 카탈로그 포맷 버전: {meta.get('version')}")
+        vocab = json.loads((path / "vocab.json").read_text(encoding="utf-8"))
+        names_path = path / "names.bin"
+        names_blob = (
+            np.memmap(names_path, dtype=np.uint8, mode="r")
+            if names_path.stat().st_size else np.empty(0, dtype=np.uint8)
+        )
+        return cls(
+            path=path,
+            sorted_prices=np.load(path / "sorted_prices.npy", mmap_mode="r"),
+            price_order=np.load(path / "price_order.npy", mmap_mode="r"),
+            postings=np.load(path / "postings.npy", mmap_mode="r"),
+            vocab={token: tuple(span) for token, span in vocab.items()},
+            names_blob=names_blob,
+            name_offsets=np.load(path / "name_offsets.npy", mmap_mode="r"),
+            tokenizer=tokenizer,
+        )
+
+    def __len__(self) -> int:
+        return len(self.sorted_prices)
+
+    def name(self, item_id: int) -> str:
+        start, end = int(self.name_offsets[item_id]), int(self.name_offsets[item_id + 1])
+        return bytes(self.names_blob[start:end]).decode("utf-8")
+
+    def _price_rank_range(self, min_price: Optional[int], max_price: Optional[int]) -> Tuple[int, int]:
+        lo = 0 if min_price is None else int(np.searchsorted(self.sorted_prices, min_price, side="left"))
+        hi = len(self) if max_price is None else int(np.searchsorted(self.sorted_prices, max_price, side="right"))
+        return lo, max(lo, hi)
+
+    def _matching_ranks(self, tokens: List[str], lo: int, hi: int) -> np.ndarray:
+        """모든 토큰을 가진 상품의 가격 순위 (가격 범위 [lo, hi) 안, 오름차순)"""
+        spans = []
+        for token in tokens:
+            span = self.vocab.get(token)
+            if span is None:
+                return np.empty(0, dtype=np.int64)
+            posting = self.postings[span[0]:span[1]]
+            a, b = np.searchsorted(posting, [lo, hi])
+            spans.append(posting[a:b])
+        # 가장 짧은 posting 부터 교집합
+        spans.sort(key=len)
+        ranks = np.asarray(spans[0])
+        for other in spans[1:]:
+            if not len(ranks):
+                break
+            ranks = ranks[np.isin(ranks, other, assume_unique=True)]
+        return ranks
+
+    def search(
+        self,
+        keyword: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        limit: int = 10,
+        offset: int = 0,
+        descending: bool = False,
+    ) -> CatalogPage:
+        """키워드(모든 토큰 포함)와 가격 범위로 검색해 가격순 한 페이지를 반환"""
+        lo, hi = self._price_rank_range(min_price, max_price)
+        tokens = self.tokenizer(keyword) if keyword else []
+        if tokens:
+            ranks = self._matching_ranks(tokens, lo, hi)
+            total = len(ranks)
+            if descending:
+                page_ranks = ranks[::-1][offset:offset + limit]
+            else:
+                page_ranks = ranks[offset:offset + limit]
+        else:
+            total = hi - lo
+            if descending:
+                page_ranks = np.arange(hi - 1 - offset, max(lo, hi - offset - limit) - 1, -1)
+            else:
+                page_ranks = np.arange(lo + offset, min(hi, lo + offset + limit))
+
+        items = []
+        for rank in page_ranks.tolist():
+            item_id = int(self.price_order[rank])
+            items.append(Product(item_id, self.name(item_id), int(self.sorted_prices[rank])))
+        return CatalogPage(items=items, total=total, offset=offset, limit=limit)
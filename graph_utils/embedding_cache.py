@@ -0,0 +1,320 @@
+"""
+내용 주소 기반 임베딩 캐시 (메모리 맵 행렬 + SQLite 키 인덱스)
+
+섹션 초안, 반복되는 질의, 카탈로그 항목처럼 같은 문장을 노드마다 다시 임베딩하는 비용을 없앱니다.
+키는 (model_id, 텍스트) 의 blake2b 해시이므로 모델이 바뀌면 자연스럽게 다른 키가 됩니다.
+
+디렉터리 구성 (모델별 하위 디렉터리)
+
+- vectors.npy    (capacity, dim) float16 또는 int8 행렬 → np.load(mmap_mode="r+") 로 열어
+                 여러 워커 프로세스가 같은 페이지 캐시를 복사 없이 공유
+- scales.npy     int8 일 때 행별 스케일 (float32)
+- slot_keys.npy  슬롯마다 들어 있는 키 (16바이트). 읽은 뒤 키를 다시 확인해
+                 다른 프로세스가 방금 축출/덮어쓴 슬롯을 읽은 경우는 미스로 처리
+- index.sqlite   키 → 슬롯, 마지막 사용 시각 (WAL). 쓰기는 BEGIN IMMEDIATE 로 프로세스 간 직렬화
+
+슬롯이 가득 차면 오래 쓰지 않은 항목부터 capacity * evict_fraction 개를 한 번에 축출합니다.
+적중 시 사용 시각 갱신은 메모리에 모아 두었다가 쓰기 트랜잭션에서 한꺼번에 반영합니다 (근사 LRU).
+
+    cache = EmbeddingCache("embedding_cache", encoder.model_id, encoder.dim, dtype="float16")
+    encoder = CachedEncoder(encoder, cache)
+    encoder.encode(["같은 문장", "같은 문장", "새 문장"])  # 미스인 "새 문장" 만 모델로 인코딩
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from graph_utils.embeddings import Encoder, normalize_rows
+
+KEY_BYTES = 16
+_SQL_CHUNK = 900  # SQLite 바인딩 변수 개수 제한보다 작게
+
+
+def text_key(model_id: str, text: str) -> bytes:
+    """(모델, 텍스트) 의 16바이트 내용 주소"""
+    return hashlib.blake2b(f"{model_id}\x00{text}".encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+def _safe_name(model_id: str) -> str:
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", model_id)
+
+
+class EmbeddingCache:
+    """모델 하나의 임베딩을 고정 크기 메모리 맵 행렬에 보관하는 캐시"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        model_id: str,
+        dim: int,
+        dtype: str = "float16",
+        capacity: int = 100_000,
+        evict_fraction: float = 0.1,
+    ):
+        """
+        Args:
+            path: 캐시 루트 디렉터리 (모델별 하위 디렉터리를 만듦)
+            dtype: "float16" (오차 ~1e-3) 또는 "int8" (행별 스케일, 용량 절반)
+            capacity: 최대 항목 수. 이미 만든 캐시는 파일에 기록된 값을 사용
+        """
+        if dtype not in ("float16", "int8"):
+            raise ValueError(f"지원하지 않는 dtype: {dtype}")
+        self.model_id = model_id
+        self.dim = dim
+        self.dtype = dtype
+        self.evict_fraction = evict_fraction
+        self.path = Path(path) / _safe_name(model_id)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # isolation_level=None: 트랜잭션은 _write() 에서 직접 시작/종료
+        self._conn = sqlite3.connect(
+            str(self.path / "index.sqlite"), check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._write() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, slot INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            conn.execute("CREATE TABLE IF NOT EXISTS free_slots (slot INTEGER PRIMARY KEY)")
+            meta = dict(conn.execute("SELECT name, value FROM meta"))
+            if not meta:
+                self._create_files(capacity)
+                meta = {"model_id": model_id, "dim": str(dim), "dtype": dtype, "capacity": str(capacity), "next_slot": "0"}
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        if (meta["model_id"], int(meta["dim"]), meta["dtype"]) != (model_id, dim, dtype):
+            raise ValueError(
+                f"캐시({meta['model_id']}, {meta['dim']}, {meta['dtype']})와 요청({model_id}, {dim}, {dtype})이 다릅니다"
+            )
+        self.capacity = int(meta["capacity"])
+
+        self._vectors = np.load(self.path / "vectors.npy", mmap_mode="r+")
+        self._slot_keys = np.load(self.path / "slot_keys.npy", mmap_mode="r+")
+        self._scales = np.load(self.path / "scales.npy", mmap_mode="r+") if dtype == "int8" else None
+        self._touched: Dict[bytes, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _create_files(self, capacity: int) -> None:
+        np.lib.format.open_memmap(self.path / "vectors.npy", mode="w+", dtype=self.dtype, shape=(capacity, self.dim)).flush()
+        np.lib.format.open_memmap(self.path / "slot_keys.npy", mode="w+", dtype=np.uint8, shape=(capacity, KEY_BYTES)).flush()
+        if self.dtype == "int8":
+            np.lib.format.open_memmap(self.path / "scales.npy", mode="w+", dtype=np.float32, shape=(capacity,)).flush()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """프로세스 간 쓰기 트랜잭션 (다른 쓰기는 끝날 때까지 대기)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+
+    def _find_slots(self, keys: Sequence[bytes]) -> Dict[bytes, int]:
+        found: Dict[bytes, int] = {}
+        with self._lock:
+            for start in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[start:start + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(self._conn.execute(f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", chunk))
+        return found
+
+    def _read_rows(self, slots: np.ndarray) -> np.ndarray:
+        rows = self._vectors[slots].astype(np.float32)
+        if self._scales is not None:
+            rows = normalize_rows(rows * self._scales[slots][:, None])
+        return rows
+
+    def get_many(self, texts: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        """(float32 행렬, 미스 인덱스 목록). 미스 행은 0 으로 채워 반환"""
+        keys = [text_key(self.model_id, text) for text in texts]
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        found = self._find_slots(keys)
+        rows = [i for i, key in enumerate(keys) if key in found]
+        if rows:
+            slots = np.fromiter((found[keys[i]] for i in rows), dtype=np.int64, count=len(rows))
+            vectors[rows] = self._read_rows(slots)
+            # 읽는 사이 다른 프로세스가 슬롯을 재사용했으면 미스로 처리
+            expected = np.frombuffer(b"".join(keys[i] for i in rows), dtype=np.uint8).reshape(-1, KEY_BYTES)
+            valid = (self._slot_keys[slots] == expected).all(axis=1)
+            rows = [i for i, ok in zip(rows, valid) if ok]
+        hit_rows = set(rows)
+        missing = [i for i in range(len(texts)) if i not in hit_rows]
+        vectors[missing] = 0.0
+        now = time.time()
+        with self._lock:
+            self.hits += len(rows)
+            self.misses += len(missing)
+            for i in rows:
+                self._touched[keys[i]] = now
+            flush = len(self._touched) >= 1024
+        if flush:
+            with self._write() as conn:
+                self._flush_touched(conn)
+        return vectors, missing
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        """모아 둔 사용 시각을 반영 (self._lock 을 잡은 상태에서 호출)"""
+        if self._touched:
+            conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?", [(t, k) for k, t in self._touched.items()])
+            self._touched.clear()
+
+    # ----------------------------------------
+    # 저장 / 축출
+    # ----------------------------------------
+
+    def _allocate(self, conn: sqlite3.Connection, count: int, protected: Sequence[bytes] = ()) -> Tuple[List[int], int]:
+        """(슬롯 목록, 축출한 항목 수). 트랜잭션이 롤백되면 축출도 없던 일이 되므로 호출자가 커밋 후 집계
+
+        protected 의 키(같은 put_many 에서 제자리에 다시 쓸 항목)는 축출하지 않습니다.
+        """
+        slots = [row[0] for row in conn.execute("SELECT slot FROM free_slots LIMIT ?", (count,))]
+        if slots:
+            conn.executemany("DELETE FROM free_slots WHERE slot = ?", [(s,) for s in slots])
+        next_slot = int(conn.execute("SELECT value FROM meta WHERE name = 'next_slot'").fetchone()[0])
+        fresh = min(count - len(slots), self.capacity - next_slot)
+        if fresh > 0:
+            slots.extend(range(next_slot, next_slot + fresh))
+            conn.execute("UPDATE meta SET value = ? WHERE name = 'next_slot'", (str(next_slot + fresh),))
+        short = count - len(slots)
+        evicted = 0
+        if short > 0:
+            # 오래 쓰지 않은 항목을 한 번에 여러 개 축출해 축출 빈도를 낮춤
+            batch = max(short, int(self.capacity * self.evict_fraction))
+            skip = set(protected)
+            rows = conn.execute("SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (batch + len(skip),))
+            victims = [(key, slot) for key, slot in rows if key not in skip][:batch]
+            conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in victims])
+            freed = [slot for _, slot in victims]
+            slots.extend(freed[:short])
+            conn.executemany("INSERT INTO free_slots VALUES (?)", [(s,) for s in freed[short:]])
+            self._slot_keys[freed] = 0
+            evicted = len(victims)
+        return slots, evicted
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """정규화된 임베딩을 저장 (이미 있고 슬롯의 키가 맞는 항목은 건너뜀)
+
+        메모리 맵 쓰기는 SQLite 트랜잭션과 함께 롤백되지 않으므로, 롤백된 쓰기 뒤에는 entries 가
+        키가 맞지 않는 슬롯을 가리킬 수 있습니다. 그런 항목은 읽을 때 미스가 되고, 여기서 같은 슬롯에 다시 씁니다.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        pending = dict(zip((text_key(self.model_id, text) for text in texts), vectors))
+        if len(pending) > self.capacity:
+            pending = dict(list(pending.items())[-self.capacity:])
+        evicted = 0
+        with self._write() as conn:
+            self._flush_touched(conn)
+            existing: Dict[bytes, int] = {}
+            keys = list(pending)
+            for start in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[start:start + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                existing.update(conn.execute(f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", chunk))
+            stale = []
+            if existing:
+                found = list(existing)
+                expected = np.frombuffer(b"".join(found), dtype=np.uint8).reshape(-1, KEY_BYTES)
+                valid = (self._slot_keys[[existing[key] for key in found]] == expected).all(axis=1)
+                stale = [key for key, ok in zip(found, valid) if not ok]
+            fresh = [key for key in keys if key not in existing]
+            if not fresh and not stale:
+                return
+            allocated, evicted = self._allocate(conn, len(fresh), protected=stale) if fresh else ([], 0)
+            keys = stale + fresh
+            slots = np.array([existing[key] for key in stale] + allocated, dtype=np.int64)
+            matrix = np.stack([pending[key] for key in keys])
+            # 키를 지운 뒤 벡터를 쓰고 마지막에 키를 기록 → 쓰는 도중 읽은 프로세스는 미스로 처리
+            self._slot_keys[slots] = 0
+            if self._scales is not None:
+                scales = np.maximum(np.abs(matrix).max(axis=1), 1e-12) / 127.0
+                self._vectors[slots] = np.round(matrix / scales[:, None]).astype(np.int8)
+                self._scales[slots] = scales
+            else:
+                self._vectors[slots] = matrix.astype(np.float16)
+            self._slot_keys[slots] = np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(-1, KEY_BYTES)
+            now = time.time()
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", [(key, int(slot), now) for key, slot in zip(keys, slots)]
+            )
+        with self._lock:
+            self.evictions += evicted
+
+    def clear(self) -> None:
+        with self._write() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM free_slots")
+            conn.execute("UPDATE meta SET value = '0' WHERE name = 'next_slot'")
+            self._touched.clear()
+            self._slot_keys[:] = 0
+
+    def close(self) -> None:
+        with self._write() as conn:
+            self._flush_touched(conn)
+        self._vectors.flush()
+        self._slot_keys.flush()
+        if self._scales is not None:
+            self._scales.flush()
+        self._conn.close()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "size": len(self),
+            "capacity": self.capacity,
+        }
+
+
+class CachedEncoder:
+    """Encoder 앞에 EmbeddingCache 를 둔 인코더 (model_id/dim 은 원래 인코더와 같음)"""
+
+    def __init__(self, encoder: Encoder, cache: EmbeddingCache):
+        if cache.model_id != encoder.model_id or cache.dim != encoder.dim:
+            raise ValueError("캐시와 인코더의 모델/차원이 다릅니다")
+        self.encoder = encoder
+        self.cache = cache
+        self.model_id = encoder.model_id
+        self.dim = encoder.dim
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        unique = list(dict.fromkeys(texts))
+        vectors, missing = self.cache.get_many(unique)
+        if missing:
+            # 미스만 모아 한 번에 인코딩
+            misses = [unique[i] for i in missing]
+            fresh = self.encoder.encode(misses, batch_size=batch_size)
+            vectors[missing] = fresh
+            self.cache.put_many(misses, fresh)
+        if len(unique) == len(texts):
+            return vectors
+        position = {text: i for i, text in enumerate(unique)}
+        return vectors[[position[text] for text in texts]]
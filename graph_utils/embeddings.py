@@ -0,0 +1,139 @@
+"""
+로컬 임베딩 모델 래퍼
+
+requirements.txt 의 sentence-transformers 모델(기본: nlpai-lab/KURE-v1, EMBEDDING_MODEL 환경 변수로 변경)을
+의미 라우팅/검색 노드가 같은 인터페이스로 쓰도록 감쌉니다.
+
+- encode(texts) 는 L2 정규화된 float32 행렬 (n, dim) 을 반환하므로 내적이 곧 코사인 유사도입니다.
+- model_id 는 캐시 키나 저장된 센트로이드/인덱스가 같은 모델로 만들어졌는지 확인하는 데 씁니다.
+
+sentence-transformers 가 없거나 모델을 불러올 수 없는 환경에서는 default_encoder() 가 경고와 함께
+문자 n-gram 해싱 임베딩(HashingEncoder)을 사용합니다. 철자가 비슷한 문장끼리는 가깝지만
+의미 유사도는 약하므로 실제 서비스에서는 모델을 설치해야 합니다.
+
+EMBEDDING_CACHE_DIR 환경 변수를 지정하면 기본 인코더 앞에 디스크 임베딩 캐시
+(graph_utils.embedding_cache, EMBEDDING_CACHE_DTYPE / EMBEDDING_CACHE_CAPACITY)를 둡니다.
+EMBEDDING_BATCH_WAIT_MS 를 지정하면 동시에 들어온 인코딩 요청을 그 시간만큼 모아
+한 번의 forward 로 처리합니다 (graph_utils.batching, EMBEDDING_MAX_BATCH). 캐시 미스만 배치로 갑니다.
+"""
+
+import os
+import threading
+import warnings
+import zlib
+from typing import Optional, Protocol, Sequence
+
+import numpy as np
+
+DEFAULT_EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "nlpai-lab/KURE-v1")
+EMBEDDING_CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR")
+EMBEDDING_BATCH_WAIT_MS = os.environ.get("EMBEDDING_BATCH_WAIT_MS")
+
+
+class Encoder(Protocol):
+    """텍스트 → 정규화된 임베딩 행렬"""
+    model_id: str
+    dim: int
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        ...
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 그대로)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEncoder:
+    """sentence-transformers 모델 (처음 생성할 때 모델을 불러옴)"""
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, device: Optional[str] = None):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device=device)
+        self.model_id = model_name
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.astype(np.float32, copy=False)
+
+
+class HashingEncoder:
+    """문자 n-gram 을 해싱해 고정 차원 벡터로 만드는 가벼운 임베딩 (NumPy 만 사용)"""
+
+    def __init__(self, dim: int = 512, ngram_range: tuple = (1, 3)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.model_id = f"hashing-{dim}-{ngram_range[0]}{ngram_range[1]}"
+
+    def _features(self, text: str):
+        text = f" {' '.join(text.lower().split())} "
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(text) - n + 1):
+                gram = text[i:i + n]
+                if gram.strip():
+                    yield zlib.crc32(gram.encode("utf-8"))
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter(self._features(text), dtype=np.uint32)
+            if not len(hashes):
+                continue
+            # 최상위 비트로 부호를 정해 해시 충돌의 편향을 줄임
+            signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], hashes % self.dim, signs)
+        return normalize_rows(matrix)
+
+
+_default_encoder: Optional[Encoder] = None
+_default_lock = threading.Lock()
+
+
+def default_encoder() -> Encoder:
+    """프로세스 전체에서 공유하는 기본 인코더 (처음 호출할 때 한 번만 생성)"""
+    global _default_encoder
+    with _default_lock:
+        if _default_encoder is None:
+            try:
+                _default_encoder = SentenceTransformerEncoder()
+            except (ImportError, OSError) as e:
+                # 패키지가 없거나 모델을 내려받을 수 없는 환경(오프라인 등)
+                warnings.warn(
+                    f"임베딩 모델({DEFAULT_EMBEDDING_MODEL})을 불러올 수 없어 HashingEncoder 를 사용합니다: "
+                    f"{type(e).__name__}. 의미 기반 정확도를 위해 requirements.txt 의 모델을 설치하세요.",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+                _default_encoder = HashingEncoder()
+            if EMBEDDING_BATCH_WAIT_MS:
+                from graph_utils.batching import BatchedEncoder
+
+                _default_encoder = BatchedEncoder(
+                    _default_encoder,
+                    max_batch=int(os.environ.get("EMBEDDING_MAX_BATCH", "32")),
+                    max_wait_ms=float(EMBEDDING_BATCH_WAIT_MS),
+                )
+            if EMBEDDING_CACHE_DIR:
+                from graph_utils.embedding_cache import CachedEncoder, EmbeddingCache
+
+                cache = EmbeddingCache(
+                    EMBEDDING_CACHE_DIR,
+                    _default_encoder.model_id,
+                    _default_encoder.dim,
+                    dtype=os.environ.get("EMBEDDING_CACHE_DTYPE", "float16"),
+                    capacity=int(os.environ.get("EMBEDDING_CACHE_CAPACITY", "100000")),
+                )
+                _default_encoder = CachedEncoder(_default_encoder, cache)
+        return _default_encoder
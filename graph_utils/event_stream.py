@@ -0,0 +1,234 @@
+"""
+느린 클라이언트에도 메모리가 늘지 않는 그래프 이벤트 스트리밍 (SSE / WebSocket)
+
+app.astream 이벤트를 그대로 소켓에 쓰면 클라이언트가 느릴 때 서버 쪽 버퍼가 끝없이 늘어납니다.
+연결마다 크기가 정해진 EventQueue 를 두고, 그래프 실행(생산자)과 전송(소비자)을 분리합니다.
+
+큐가 가득 찼을 때의 정책 (policy)
+- block:       생산자가 기다림. 그래프 실행 자체가 클라이언트 속도에 맞춰 느려짐 (이벤트 손실 없음)
+- drop_oldest: 가장 오래된 이벤트를 버림 (최신 상황 우선)
+- drop_newest: 새 이벤트를 버림
+- coalesce:    합칠 수 있는 이벤트는 큐 안의 같은 종류 이벤트에 합침
+               messages: 같은 메시지 id 의 토큰 청크를 이어 붙임
+               values:   최신 상태로 교체
+               custom:   같은 키 구성의 dict 는 최신 값으로 교체 (진행률 등)
+               합칠 대상이 없으면 토큰 청크가 아닌 가장 오래된 이벤트를 버려 자리를 만듦.
+               버릴 것이 없으면(큐에 토큰 청크뿐) 새 이벤트가 토큰 청크일 때는 자리가 날 때까지 기다리고,
+               그 밖의 이벤트는 새 이벤트를 버림. 토큰 청크는 버리지 않고 큐 크기도 넘지 않음
+start / end / error 이벤트는 어떤 정책에서도 버리지 않습니다 (이 이벤트만 maxsize 를 넘을 수 있음).
+
+전송 쪽은 heartbeat_s 동안 보낼 이벤트가 없으면 keepalive(SSE 주석 / {"event": "heartbeat"})를 보내
+프록시가 유휴 연결을 끊지 않도록 합니다. 모든 이벤트는 orjson 으로 인코딩합니다.
+
+    queue = EventQueue(maxsize=256, policy="coalesce")
+    async for frame in sse_frames(service.stream(...), queue, heartbeat_s=15):
+        ...
+"""
+
+import asyncio
+import itertools
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Hashable, Optional
+
+from graph_utils.service import dumps
+
+POLICIES = ("block", "drop_oldest", "drop_newest", "coalesce")
+TERMINAL_EVENTS = frozenset({"start", "end", "error"})
+
+
+@dataclass
+class StreamStats:
+    produced: int = 0
+    sent: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    max_depth: int = 0
+    heartbeats: int = 0
+    producer_wait_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats["producer_wait_ms"] = round(self.producer_wait_ms, 3)
+        return stats
+
+
+def coalesce_key(event: Dict[str, Any]) -> Optional[Hashable]:
+    """합칠 수 있는 이벤트의 키 (None 이면 합치지 않음)"""
+    mode, data = event.get("event"), event.get("data")
+    if mode == "values":
+        return ("values",)
+    if mode == "messages" and isinstance(data, dict):
+        message = data.get("message")
+        message_id = getattr(message, "id", None)
+        if message_id is not None and hasattr(message, "__add__"):
+            return ("messages", message_id)
+    if mode == "custom" and isinstance(data, dict):
+        return ("custom", tuple(sorted(map(str, data))))
+    return None
+
+
+def _merge(queued: Dict[str, Any], event: Dict[str, Any]) -> None:
+    if queued["event"] == "messages":
+        queued["data"] = {**queued["data"], "message": queued["data"]["message"] + event["data"]["message"]}
+    else:
+        queued["data"] = event["data"]
+
+
+class EventQueue:
+    """연결 하나의 크기 제한 이벤트 큐 (asyncio 전용, 생산자 하나 / 소비자 하나)"""
+
+    def __init__(self, maxsize: int = 256, policy: str = "coalesce"):
+        if policy not in POLICIES:
+            raise ValueError(f"알 수 없는 정책: {policy} (가능: {', '.join(POLICIES)})")
+        if maxsize < 1:
+            raise ValueError("maxsize 는 1 이상이어야 합니다")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.stats = StreamStats()
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._latest: Dict[Hashable, Dict[str, Any]] = {}
+        self._changed = asyncio.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        self._items.append(event)
+        key = coalesce_key(event)
+        if key is not None:
+            self._latest[key] = event
+        self.stats.max_depth = max(self.stats.max_depth, len(self._items))
+
+    def _forget(self, event: Dict[str, Any]) -> None:
+        key = coalesce_key(event)
+        if key is not None and self._latest.get(key) is event:
+            del self._latest[key]
+
+    def _drop_oldest(self, keep_messages: bool = False) -> bool:
+        """가장 오래된 비종료 이벤트를 버림 (keep_messages 면 토큰 청크는 버리지 않음). 버린 것이 없으면 False"""
+        skip = TERMINAL_EVENTS | {"messages"} if keep_messages else TERMINAL_EVENTS
+        index = next((i for i, queued in enumerate(self._items) if queued["event"] not in skip), None)
+        if index is None:
+            return False
+        queued = self._items[index]
+        del self._items[index]
+        self._forget(queued)
+        self.stats.dropped += 1
+        return True
+
+    async def _wait_for_room(self) -> None:
+        """큐에 자리가 나거나 닫힐 때까지 생산자를 멈춤 (self._changed 를 잡은 상태에서 호출)"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self._changed.wait_for(lambda: len(self._items) < self.maxsize or self._closed)
+        self.stats.producer_wait_ms += (loop.time() - start) * 1000
+
+    async def put(self, event: Dict[str, Any]) -> None:
+        async with self._changed:
+            self.stats.produced += 1
+            if len(self._items) >= self.maxsize and event["event"] not in TERMINAL_EVENTS:
+                if self.policy == "block":
+                    await self._wait_for_room()
+                elif self.policy == "drop_newest":
+                    self.stats.dropped += 1
+                    return
+                elif self.policy == "coalesce":
+                    key = coalesce_key(event)
+                    queued = self._latest.get(key) if key is not None else None
+                    if queued is not None:
+                        _merge(queued, event)
+                        self.stats.coalesced += 1
+                        return
+                    if not self._drop_oldest(keep_messages=True):
+                        if event["event"] != "messages":
+                            self.stats.dropped += 1
+                            return
+                        # 큐에 토큰 청크뿐: 토큰은 버리지 않고 소비자가 꺼낼 때까지 기다림
+                        await self._wait_for_room()
+                else:
+                    self._drop_oldest()
+            if self._closed:
+                return
+            self._append(event)
+            self._changed.notify_all()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """다음 이벤트. timeout 안에 없으면 None (닫혔고 비었으면 EOFError)"""
+        async with self._changed:
+            if not self._items and not self._closed:
+                try:
+                    await asyncio.wait_for(self._changed.wait_for(lambda: self._items or self._closed), timeout)
+                except asyncio.TimeoutError:
+                    return None
+            if not self._items:
+                raise EOFError
+            event = self._items.popleft()
+            self._forget(event)
+            self.stats.sent += 1
+            self._changed.notify_all()
+            return event
+
+    async def close(self) -> None:
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+
+async def pump(events: AsyncIterator[Dict[str, Any]], queue: EventQueue) -> None:
+    """그래프 이벤트를 큐로 옮김 (예외는 error 이벤트로 전달)"""
+    try:
+        async for event in events:
+            await queue.put(event)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await queue.put({"event": "error", "error": type(e).__name__, "message": str(e)})
+    finally:
+        await queue.close()
+
+
+async def drain(
+    events: AsyncIterator[Dict[str, Any]],
+    queue: EventQueue,
+    heartbeat_s: Optional[float] = 15.0,
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """생산자 태스크를 띄우고 큐에서 이벤트를 꺼냄. heartbeat 시점에는 None.
+
+    end 이벤트에는 "stream" 키로 큐 통계를 붙입니다. 소비자가 중간에 멈추면 그래프 실행도 취소됩니다.
+    """
+    producer = asyncio.create_task(pump(events, queue))
+    try:
+        while True:
+            try:
+                event = await queue.get(timeout=heartbeat_s)
+            except EOFError:
+                return
+            if event is None:
+                queue.stats.heartbeats += 1
+                yield None
+                continue
+            if event["event"] == "end":
+                event = {**event, "stream": queue.stats.as_dict()}
+            yield event
+            if event["event"] in ("end", "error"):
+                return
+    finally:
+        if not producer.done():
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+
+async def sse_frames(
+    events: AsyncIterator[Dict[str, Any]],
+    queue: EventQueue,
+    heartbeat_s: Optional[float] = 15.0,
+) -> AsyncIterator[bytes]:
+    """text/event-stream 프레임 (id / event / data). 하트비트는 주석 줄"""
+    ids = itertools.count(1)
+    async for event in drain(events, queue, heartbeat_s):
+        if event is None:
+            yield b": keepalive\n\n"
+            continue
+        yield b"id: %d\nevent: %s\ndata: %s\n\n" % (next(ids), event["event"].encode(), dumps(event))
@@ -0,0 +1,104 @@
+"""
+LLM 을 거치지 않는 규칙 기반 빠른 경로(fast path) 분류기
+
+"국어 85" 처럼 형식이 분명한 입력은 score_example.py 의 input_parser_node 처럼
+결정적으로 파싱할 수 있습니다. 미리 컴파일한 정규식과 과목 → Tool 인덱스로
+입력을 곧바로 Tool 호출({"tool_name", "arguments"})로 바꾸고, 애매한 입력만 LLM 으로 보냅니다.
+normalize_subject(예: SubjectIndex.normalize)를 주면 "수핵", "kor" 같은 변형도 빠른 경로로 처리합니다.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+# 점수 입력을 인식하는 기본 패턴들 (순서대로 시도)
+#   "국어 85", "국어85", "국어 85점", "국어: 85", "85점 국어", "국 어 85"
+DEFAULT_PATTERNS: Tuple[str, ...] = (
+    r"^\s*(?P<subject>[^\d:=]+?)\s*[:=]?\s*(?P<score>\d{1,3})\s*점?\s*$",
+    r"^\s*(?P<score>\d{1,3})\s*점?\s+(?P<subject>[^\d:=]+?)\s*$",
+)
+
+
+@dataclass
+class FastPathStats:
+    """빠른 경로 처리 통계"""
+    total: int = 0
+    fast: int = 0
+
+    @property
+    def llm(self) -> int:
+        return self.total - self.fast
+
+    @property
+    def fast_ratio(self) -> float:
+        """LLM 없이 처리한 트래픽 비율 (0.0 ~ 1.0)"""
+        return self.fast / self.total if self.total else 0.0
+
+    def summary(self) -> str:
+        return f"빠른 경로 {self.fast}/{self.total}건 ({self.fast_ratio:.1%}), LLM {self.llm}건"
+
+
+class FastPathClassifier:
+    """
+    컴파일된 패턴 + 과목 인덱스로 입력을 Tool 호출로 바꾸는 분류기
+
+    - subject_index: 과목 이름(별칭 포함) → tool_name
+    - score_range: 허용 점수 범위. 벗어나면 애매한 입력으로 보고 LLM 에 넘깁니다.
+    - normalize_subject: subject_index 에 없는 과목명을 정식 이름으로 바꾸는 함수 (없으면 None 반환)
+    """
+
+    def __init__(
+        self,
+        subject_index: Dict[str, str],
+        patterns: Iterable[str] = DEFAULT_PATTERNS,
+        score_arg: str = "score",
+        score_range: Tuple[int, int] = (0, 100),
+        normalize_subject: Optional[Callable[[str], Optional[str]]] = None,
+    ):
+        self.subject_index = {self._normalize(k): v for k, v in subject_index.items()}
+        self.normalize_subject = normalize_subject
+        self.patterns: List[Pattern[str]] = [re.compile(p) for p in patterns]
+        self.score_arg = score_arg
+        self.score_range = score_range
+        self.stats = FastPathStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(subject: str) -> str:
+        return subject.strip().lower()
+
+    def _resolve_subject(self, subject: str) -> Optional[str]:
+        tool_name = self.subject_index.get(self._normalize(subject))
+        if tool_name is None and self.normalize_subject is not None:
+            canonical = self.normalize_subject(subject)
+            if canonical is not None:
+                tool_name = self.subject_index.get(self._normalize(canonical))
+        return tool_name
+
+    def match(self, text: str) -> Optional[Dict]:
+        """통계 없이 순수하게 매칭만 수행. 인식하지 못하면 None"""
+        for pattern in self.patterns:
+            m = pattern.match(text)
+            if not m:
+                continue
+            tool_name = self._resolve_subject(m.group("subject"))
+            score = int(m.group("score"))
+            low, high = self.score_range
+            if tool_name is None or not (low <= score <= high):
+                return None
+            return {"tool_name": tool_name, "arguments": {self.score_arg: score}}
+        return None
+
+    def classify(self, text: str) -> Optional[Dict]:
+        """입력을 분류하고 통계를 갱신. None 이면 LLM 경로로 보내야 합니다."""
+        decision = self.match(text)
+        with self._lock:
+            self.stats.total += 1
+            if decision is not None:
+                self.stats.fast += 1
+        return decision
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = FastPathStats()
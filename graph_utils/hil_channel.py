@@ -0,0 +1,143 @@
+"""
+WebSocket 하나로 주고받는 Human-in-the-Loop 세션
+
+HTTP 로 HIL 그래프를 돌리면 클라이언트가 "__interrupt__" 가 생겼는지 확인(폴링)하고,
+답은 Command(resume=...) 를 담은 별도 요청으로 보내야 합니다.
+HILSession 은 thread 하나에 소켓 하나를 열어 두고
+- interrupt 가 updates 스트림에 나타나는 즉시 서버가 push (실행이 끝나기를 기다리지 않음)
+- 같은 소켓으로 들어온 답을 곧바로 Command(resume=...) 로 그래프에 넘김
+으로 폴링과 요청마다의 HTTP 왕복을 없앱니다. 재접속하면 대기 중인 interrupt 를 session 이벤트에 담아 다시 보냅니다.
+
+클라이언트 → 서버 (JSON 텍스트 프레임)
+    {"type": "start", "input": {...}, "config": {...}, "stream_mode": ["updates"]}   stream_mode 는 선택
+    {"type": "resume", "resume": 값}
+    {"type": "state"} / {"type": "ping"}
+서버 → 클라이언트
+    {"event": "session", "thread_id": ..., "interrupts": [...]}    연결 직후
+    {"event": "interrupt", "interrupts": [...], "elapsed_ms": ...}
+    {"event": "done", "state": {...}, "elapsed_ms": ...}
+    {"event": "state", ...} / {"event": "pong"} / {"event": "heartbeat"} / {"event": "error", ...}
+    stream_mode 를 주면 실행 중 이벤트({"event": "updates", "data": ...})도 보냅니다.
+
+세션은 실행 중 이벤트를 소켓에 직접 보냅니다 (클라이언트가 느리면 그래프도 기다리는 block 정책).
+한 thread 에 소켓 하나를 전제로 하며, 같은 thread 의 실행은 GraphService 의 스레드 잠금으로 순서가 보장됩니다.
+
+    session = HILSession(service, "document", thread_id, websocket.send_text, websocket.receive_text)
+    await session.run()
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import orjson
+from langgraph.types import Command
+
+from graph_utils.runner import INTERRUPT_KEY, GraphRun
+from graph_utils.service import GraphService, NoPendingInterrupt, client_config, dumps, stream_event
+
+
+class HILSession:
+    """thread 하나의 HIL 세션 (FastAPI 와 무관하게 send_text / receive_text 함수로 동작)"""
+
+    def __init__(
+        self,
+        service: GraphService,
+        graph: str,
+        thread_id: Optional[str],
+        send_text: Callable[[str], Awaitable[None]],
+        receive_text: Callable[[], Awaitable[str]],
+        heartbeat_s: Optional[float] = 15.0,
+    ):
+        self.service = service
+        self.spec, self.thread_id, _ = service.prepare(graph, thread_id)
+        if not self.spec.stateful:
+            raise LookupError(f"{graph} 은 상태를 저장하지 않는 그래프라 HIL 세션을 열 수 없습니다")
+        self.graph = graph
+        self.heartbeat_s = heartbeat_s
+        self._send_text = send_text
+        self._receive_text = receive_text
+        # 소켓 쪽 예외(끊김 등)가 한 번이라도 나면 True. run() 은 이때만 예외를 호출자에게 올려보냄
+        self.closed = False
+
+    async def send(self, event: Dict[str, Any]) -> None:
+        text = dumps(event).decode()
+        try:
+            await self._send_text(text)
+        except BaseException:
+            self.closed = True
+            raise
+
+    async def receive(self) -> Dict[str, Any]:
+        """다음 클라이언트 메시지 (heartbeat_s 동안 조용하면 heartbeat 를 보내며 계속 기다림)"""
+        while True:
+            try:
+                text = await asyncio.wait_for(self._receive_text(), self.heartbeat_s)
+            except asyncio.TimeoutError:
+                await self.send({"event": "heartbeat"})
+                continue
+            except BaseException:
+                self.closed = True
+                raise
+            message = orjson.loads(text)
+            if not isinstance(message, dict):
+                raise ValueError("메시지는 JSON 객체여야 합니다")
+            return message
+
+    async def run(self) -> None:
+        """연결이 끊길 때까지 메시지를 처리 (끊김 예외는 호출자가 처리)
+
+        잘못된 메시지뿐 아니라 그래프 실행 중 예외도 error 이벤트로 알리고 소켓은 열어 둡니다
+        (체크포인트는 마지막 성공 단계에 남아 있으므로 클라이언트가 state 로 확인하고 다시 시도할 수 있음).
+        """
+        _, _, config = self.service.prepare(self.graph, self.thread_id)
+        pending = await self.service.pending_interrupts(self.spec, config)
+        await self.send({"event": "session", "graph": self.graph, "thread_id": self.thread_id, "interrupts": pending})
+        while True:
+            try:
+                await self.handle(await self.receive())
+            except Exception as e:    # 잘못된 메시지(orjson.JSONDecodeError 는 ValueError), NoPendingInterrupt, 그래프 오류
+                if self.closed:
+                    raise
+                await self.send({"event": "error", "error": type(e).__name__, "message": str(e)})
+
+    async def handle(self, message: Dict[str, Any]) -> None:
+        kind = message.get("type")
+        if kind == "start":
+            await self.execute(message.get("input"), message)
+        elif kind == "resume":
+            await self.execute(Command(resume=message.get("resume")), message, resume=True)
+        elif kind == "state":
+            await self.send({"event": "state", **await self.service.state(self.graph, self.thread_id)})
+        elif kind == "ping":
+            await self.send({"event": "pong"})
+        else:
+            raise ValueError(f"알 수 없는 메시지 종류: {kind}")
+
+    async def execute(self, graph_input: Any, message: Dict[str, Any], resume: bool = False) -> None:
+        """한 번 실행. interrupt 는 생기는 즉시, 끝까지 실행되면 done 을 보냄"""
+        start = time.perf_counter()
+        _, _, config = self.service.prepare(self.graph, self.thread_id, client_config(message.get("config")))
+        stream_mode = message.get("stream_mode") or []
+        modes: List[str] = [stream_mode] if isinstance(stream_mode, str) else list(stream_mode)
+        async with self.service.lock(self.spec, self.thread_id):
+            if resume and not await self.service.pending_interrupts(self.spec, config):
+                raise NoPendingInterrupt(f"thread {self.thread_id} 에 재개할 interrupt 가 없습니다")
+            run = GraphRun(self.spec.app, graph_input, config, stream_mode=list(dict.fromkeys(modes + ["updates"])))
+            async for mode, chunk in run:
+                if mode == "updates" and INTERRUPT_KEY in chunk:
+                    await self.send({
+                        "event": "interrupt",
+                        "thread_id": self.thread_id,
+                        "interrupts": list(chunk[INTERRUPT_KEY]),
+                        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+                    })
+                elif mode in modes:
+                    await self.send(stream_event(mode, chunk))
+        if not run.interrupts:
+            await self.send({
+                "event": "done",
+                "thread_id": self.thread_id,
+                "state": run.final_state,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+            })
@@ -0,0 +1,291 @@
+"""
+MessagesState 기반 ReAct 루프를 위한 메시지 히스토리 관리
+
+agent 노드가 매 턴마다 계속 늘어나는 messages 전체를 모델에 보내면 프롬프트 크기,
+지연 시간, 체크포인트 크기가 끝없이 커집니다. HistoryManager 는 로컬 토큰 추정치로
+예산을 지키면서
+
+1. 오래된 메시지부터 "단위"로 잘라냅니다. tool_calls 가 있는 AIMessage 와 그에 대한
+   ToolMessage 들은 하나의 단위라서 짝이 깨지지 않습니다.
+2. 잘려 나간 메시지는 롤링 요약(SystemMessage)으로 접어 넣습니다. 요약은 캐시되어,
+   새로 잘린 메시지만 기존 요약에 덧붙입니다.
+
+make_history_node() 로 만든 노드를 agent 앞에 두면 상태 자체가 압축되어
+체크포인트도 함께 작아집니다.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+SUMMARY_MESSAGE_ID = "history_summary"
+SUMMARY_PREFIX = "[이전 대화 요약]\n"
+
+# 메시지 하나당 역할/구분자 등에 쓰이는 대략적인 토큰 수
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# previous_summary, 새로 접을 메시지들 → 새 요약
+Summarizer = Callable[[str, Sequence[BaseMessage]], str]
+
+
+# ========================================
+# 토큰 추정
+# ========================================
+
+TIKTOKEN_ENCODING = "o200k_base"
+_TIKTOKEN_BLOB = f"https://openaipublic.blob.core.windows.net/encodings/{TIKTOKEN_ENCODING}.tiktoken"
+_UNLOADED = object()
+_ENCODER = _UNLOADED
+_ENCODER_LOCK = threading.Lock()
+
+
+def _tiktoken_cache_file() -> Optional[str]:
+    """tiktoken 이 BPE 파일을 캐시하는 경로 (tiktoken.load.read_file_cached 와 같은 규칙)"""
+    if "TIKTOKEN_CACHE_DIR" in os.environ:
+        cache_dir = os.environ["TIKTOKEN_CACHE_DIR"]
+    elif "DATA_GYM_CACHE_DIR" in os.environ:
+        cache_dir = os.environ["DATA_GYM_CACHE_DIR"]
+    else:
+        cache_dir = os.path.join(tempfile.gettempdir(), "data-gym-cache")
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, hashlib.sha1(_TIKTOKEN_BLOB.encode()).hexdigest())
+
+
+def _load_tiktoken_encoder():
+    """tiktoken 이 설치되어 있고 BPE 파일이 로컬 캐시에 있을 때만 사용 (네트워크로 내려받지 않음)"""
+    cache_file = _tiktoken_cache_file()
+    if cache_file is None or not os.path.exists(cache_file):
+        return None
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TIKTOKEN_ENCODING)
+    except Exception:
+        return None
+
+
+def _encoder():
+    """처음 토큰을 셀 때 한 번만 불러옴 (import 시점에는 아무것도 읽지 않음)"""
+    global _ENCODER
+    if _ENCODER is _UNLOADED:
+        with _ENCODER_LOCK:
+            if _ENCODER is _UNLOADED:
+                _ENCODER = _load_tiktoken_encoder()
+    return _ENCODER
+
+
+def estimate_text_tokens(text: str) -> int:
+    """텍스트의 토큰 수 추정
+
+    tiktoken 과 캐시된 BPE 파일이 없으면 ASCII 는 4글자당 1토큰, 한글 등 비 ASCII 문자는
+    1글자당 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    encoder = _encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def estimate_message_tokens(message: BaseMessage) -> int:
+    content = message.content
+    if not isinstance(content, str):
+        content = json.dumps(content, ensure_ascii=False)
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_text_tokens(content)
+    for call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_text_tokens(call["name"])
+        tokens += estimate_text_tokens(json.dumps(call.get("args", {}), ensure_ascii=False))
+    return tokens
+
+
+def estimate_messages_tokens(messages: Sequence[BaseMessage]) -> int:
+    return sum(estimate_message_tokens(m) for m in messages)
+
+
+# ========================================
+# 메시지 단위 묶기 / 요약
+# ========================================
+
+def group_units(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """tool_calls 를 가진 AIMessage 와 뒤따르는 ToolMessage 들을 하나의 단위로 묶음"""
+    units: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, ToolMessage) and units:
+            head = units[-1][0]
+            if isinstance(head, AIMessage) and head.tool_calls:
+                units[-1].append(message)
+                continue
+        units.append([message])
+    return units
+
+
+def extractive_summarizer(previous: str, messages: Sequence[BaseMessage], max_chars: int = 80) -> str:
+    """LLM 없이 각 메시지의 앞부분만 모아 요약하는 기본 요약기"""
+    lines = [previous] if previous else []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            role = "사용자"
+        elif isinstance(message, ToolMessage):
+            role = "도구"
+        else:
+            role = "AI"
+        text = message.content if isinstance(message.content, str) else str(message.content)
+        if not text and getattr(message, "tool_calls", None):
+            text = ", ".join(f"{c['name']}({c.get('args', {})})" for c in message.tool_calls)
+        text = " ".join(text.split())
+        if len(text) > max_chars:
+            text = text[:max_chars] + "…"
+        lines.append(f"- {role}: {text}")
+    return "\n".join(lines)
+
+
+def _message_key(message: BaseMessage) -> str:
+    return message.id or f"{message.type}:{hash(str(message.content))}"
+
+
+class HistoryManager:
+    """
+    토큰 예산 기반 히스토리 트리밍 + 롤링 요약
+
+    - max_tokens: 모델에 보낼 메시지 전체(요약 포함)의 토큰 예산
+    - min_recent_units: 예산을 넘더라도 항상 남겨둘 최근 단위 수
+    - max_summary_tokens: 요약이 이 크기를 넘으면 가장 오래된 줄부터 버립니다
+    - summarizer: (이전 요약, 새로 접을 메시지) → 새 요약. LLM 요약기를 넣을 수도 있습니다.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        min_recent_units: int = 2,
+        max_summary_tokens: int = 400,
+        summarizer: Summarizer = extractive_summarizer,
+        token_counter: Callable[[BaseMessage], int] = estimate_message_tokens,
+    ):
+        self.max_tokens = max_tokens
+        self.min_recent_units = min_recent_units
+        self.max_summary_tokens = max_summary_tokens
+        self.summarizer = summarizer
+        self.token_counter = token_counter
+        # 접힌 메시지 키 목록 → 요약. 스레드마다 이어지는 롤링 요약을 재사용합니다.
+        self._summary_cache: Dict[Tuple[str, ...], str] = {}
+        self._cache_lock = threading.Lock()
+        self._max_cache_entries = 256
+
+    # ----------------------------------------
+    # 요약 캐시
+    # ----------------------------------------
+
+    def _fold(self, previous: str, folded: Sequence[BaseMessage]) -> str:
+        """previous 요약 뒤에 folded 를 접어 넣은 요약 (캐시 사용)"""
+        keys = tuple(_message_key(m) for m in folded)
+        cache_key = (previous,) + keys
+        with self._cache_lock:
+            cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # 가장 긴 캐시된 접두사를 찾아 나머지만 요약
+        summary, start = previous, 0
+        with self._cache_lock:
+            for end in range(len(keys) - 1, 0, -1):
+                hit = self._summary_cache.get((previous,) + keys[:end])
+                if hit is not None:
+                    summary, start = hit, end
+                    break
+        summary = self._shrink_summary(self.summarizer(summary, folded[start:]))
+
+        with self._cache_lock:
+            if len(self._summary_cache) >= self._max_cache_entries:
+                self._summary_cache.pop(next(iter(self._summary_cache)))
+            self._summary_cache[cache_key] = summary
+        return summary
+
+    def _shrink_summary(self, summary: str) -> str:
+        lines = summary.split("\n")
+        while len(lines) > 1 and estimate_text_tokens("\n".join(lines)) > self.max_summary_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    # ----------------------------------------
+    # 트리밍
+    # ----------------------------------------
+
+    def compact(self, messages: Sequence[BaseMessage]) -> Tuple[List[BaseMessage], bool]:
+        """예산에 맞게 줄인 메시지 목록과 변경 여부를 반환
+
+        결과 순서: [시스템 프롬프트들, 요약(있다면), 최근 메시지들]
+        """
+        system: List[BaseMessage] = []
+        previous_summary = ""
+        body: List[BaseMessage] = []
+        for message in messages:
+            if isinstance(message, SystemMessage):
+                if message.id == SUMMARY_MESSAGE_ID:
+                    previous_summary = message.content[len(SUMMARY_PREFIX):]
+                else:
+                    system.append(message)
+            else:
+                body.append(message)
+
+        units = group_units(body)
+        unit_tokens = [sum(self.token_counter(m) for m in unit) for unit in units]
+        fixed_tokens = sum(self.token_counter(m) for m in system)
+        summary_tokens = estimate_text_tokens(previous_summary) + MESSAGE_OVERHEAD_TOKENS if previous_summary else 0
+
+        total = fixed_tokens + summary_tokens + sum(unit_tokens)
+        if total <= self.max_tokens:
+            return list(messages), False
+
+        # 오래된 단위부터 예산에 들어올 때까지 잘라냄 (요약이 차지할 자리도 고려)
+        cut = 0
+        remaining = sum(unit_tokens)
+        summary_budget = self.max_summary_tokens + MESSAGE_OVERHEAD_TOKENS
+        while cut < len(units) - self.min_recent_units and fixed_tokens + summary_budget + remaining > self.max_tokens:
+            remaining -= unit_tokens[cut]
+            cut += 1
+        # 최근 구간은 사람 메시지로 시작하도록 맞춤 (AI/Tool 로 시작하지 않게)
+        while cut < len(units) - self.min_recent_units and not isinstance(units[cut][0], HumanMessage):
+            cut += 1
+        if cut == 0:
+            return list(messages), False
+
+        folded = [m for unit in units[:cut] for m in unit]
+        summary = self._fold(previous_summary, folded)
+        summary_message = SystemMessage(content=SUMMARY_PREFIX + summary, id=SUMMARY_MESSAGE_ID)
+        recent = [m for unit in units[cut:] for m in unit]
+        return system + [summary_message] + recent, True
+
+    def prepare(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """모델에 보낼 메시지만 줄여서 반환 (상태는 건드리지 않음)"""
+        return self.compact(messages)[0]
+
+
+def make_history_node(manager: HistoryManager, key: str = "messages"):
+    """상태의 messages 를 압축하는 노드 생성
+
+    압축이 일어나면 REMOVE_ALL_MESSAGES 로 기존 목록을 지우고 압축된 목록으로 교체하므로
+    add_messages 리듀서를 쓰는 MessagesState 에서 체크포인트 크기도 함께 제한됩니다.
+    """
+    from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+    def history_node(state: dict) -> dict:
+        compacted, changed = manager.compact(state[key])
+        if not changed:
+            return {}
+        return {key: [RemoveMessage(id=REMOVE_ALL_MESSAGES)] + compacted}
+
+    return history_node
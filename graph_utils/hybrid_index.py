@@ -0,0 +1,326 @@
+"""
+프로세스 내 하이브리드 검색 인덱스 (한국어 BM25 역색인 + 벡터 검색, RRF 결합)
+
+벡터 검색만으로는 "타이레놀정 500mg", "ATC-N02BE01" 같은 정확한 약품명/코드를 놓치고,
+별도 전문 검색 서버를 두면 네트워크 홉이 하나 늘어납니다.
+
+- tokenize_ko: 조사/어미를 떼어 낸 한글 어절 + 한글 음절 bigram + 영숫자 코드(하이픈 포함 원형과 조각)
+- BM25Index: 배치마다 만든 세그먼트를 NumPy 배열(CSR: 용어 → [시작, 끝) → 문서 번호/빈도)로 보관.
+  세그먼트가 max_segments 개를 넘으면 하나로 합칩니다. 점수는 np.bincount 로 누적.
+- VectorIndex: 인코더 임베딩을 증가형 float32 행렬에 보관하고 행렬곱 한 번으로 top-k
+- reciprocal_rank_fusion: 순위 목록들을 sum(1 / (rrf_k + 순위)) 로 결합 (점수 척도가 달라도 됨)
+- HybridRetriever: 키워드 검색기 + 아무 벡터 검색기(ChromaRetriever 포함)를 RRF 로 결합
+- HybridIndex: BM25Index + VectorIndex 를 함께 관리 (add 로 문서를 점진적으로 추가)
+
+모든 검색기는 query(text, k, where) → List[RetrievedChunk] 이므로 RerankPipeline 에 그대로 넣을 수 있습니다.
+where 는 {"source": "뉴스 기사"} 같은 메타데이터 일치 조건(여러 키는 AND)입니다.
+
+    index = HybridIndex()
+    index.add(["d1", "d2"], ["타이레놀정 500mg (ATC-N02BE01) 해열진통제", "이부프로펜 400mg 소염진통제"])
+    index.query("N02BE01", k=5)
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from graph_utils.embeddings import Encoder, default_encoder
+from graph_utils.retrieval import DocumentTable, RetrievedChunk
+
+# ========================================
+# 한국어 토크나이저
+# ========================================
+
+_WORD_RE = re.compile(r"[가-힣]+|[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+_CODE_PART_RE = re.compile(r"[a-z0-9]+")
+
+# 어절 끝에서 떼어 낼 조사/어미 (긴 것부터 검사)
+_SUFFIXES = sorted(
+    ["은", "는", "이", "가", "을", "를", "의", "에", "에서", "에게", "께서", "으로", "로", "와", "과", "도", "만",
+     "까지", "부터", "보다", "처럼", "이나", "나", "랑", "이랑", "하고", "이다", "입니다", "이며", "하며", "하는",
+     "했다", "한다", "합니다", "된다", "됩니다", "되는", "에는", "에서는", "으로는", "로는", "과의", "와의"],
+    key=len,
+    reverse=True,
+)
+
+
+def _strip_suffix(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize_ko(text: str) -> List[str]:
+    """검색용 토큰 목록 (중복 포함, 순서 유지)"""
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(text.lower()):
+        if "가" <= word[0] <= "힣":
+            stem = _strip_suffix(word)
+            tokens.append(stem)
+            # 복합어("해열진통제")의 일부("진통")로도 찾을 수 있도록 음절 bigram 추가
+            if len(stem) > 2:
+                tokens.extend(stem[i:i + 2] for i in range(len(stem) - 1))
+        else:
+            tokens.append(word)
+            parts = _CODE_PART_RE.findall(word)
+            if len(parts) > 1:
+                tokens.extend(parts)
+    return tokens
+
+
+# ========================================
+# 공통: top-k
+# ========================================
+
+def _top_k(scores: np.ndarray, k: int, valid: Optional[np.ndarray] = None) -> np.ndarray:
+    """점수 내림차순 상위 k 개 위치 (valid 가 False 인 위치 제외)"""
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.flatnonzero(valid) if valid is not None else np.arange(len(scores))
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+# ========================================
+# BM25
+# ========================================
+
+@dataclass
+class _Segment:
+    """한 번의 add 로 만든 역색인 조각 (용어 번호 오름차순 CSR)"""
+    terms: np.ndarray      # int32, 고유 용어 번호
+    offsets: np.ndarray    # int64, len(terms) + 1
+    doc_ids: np.ndarray    # int32, 문서 번호 (구간마다 오름차순)
+    tfs: np.ndarray        # uint16, 용어 빈도
+
+    def postings(self, term: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        i = int(np.searchsorted(self.terms, term))
+        if i == len(self.terms) or self.terms[i] != term:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.doc_ids[start:end], self.tfs[start:end]
+
+
+def _build_segment(term_ids: np.ndarray, doc_ids: np.ndarray, tfs: np.ndarray) -> _Segment:
+    order = np.argsort(term_ids, kind="stable")  # 같은 용어 안에서는 문서 번호 순서 유지
+    term_ids, doc_ids, tfs = term_ids[order], doc_ids[order], tfs[order]
+    terms, starts = np.unique(term_ids, return_index=True)
+    offsets = np.append(starts, len(term_ids)).astype(np.int64)
+    return _Segment(terms.astype(np.int32), offsets, doc_ids.astype(np.int32), tfs.astype(np.uint16))
+
+
+class BM25Index:
+    """배열 기반 세그먼트 역색인 위의 Okapi BM25"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_segments: int = 8, tokenizer=tokenize_ko):
+        self.k1 = k1
+        self.b = b
+        self.max_segments = max_segments
+        self.tokenizer = tokenizer
+        self.docs = DocumentTable()
+        self.vocab: Dict[str, int] = {}
+        self._df: List[int] = []
+        self._segments: List[_Segment] = []
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._total_length = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Mapping[str, Any]]] = None,
+    ) -> None:
+        """문서를 추가 (새 세그먼트 하나를 만들고 필요하면 병합)"""
+        if not ids:
+            return
+        counts = [Counter(self.tokenizer(text)) for text in texts]
+        with self._lock:
+            start = self.docs.append(ids, texts, metadatas)
+            term_ids, doc_ids, tfs = [], [], []
+            for offset, counter in enumerate(counts):
+                for token, tf in counter.items():
+                    term = self.vocab.get(token)
+                    if term is None:
+                        term = self.vocab[token] = len(self._df)
+                        self._df.append(0)
+                    self._df[term] += 1
+                    term_ids.append(term)
+                    doc_ids.append(start + offset)
+                    tfs.append(min(tf, 65535))
+            lengths = np.fromiter((sum(counter.values()) for counter in counts), dtype=np.float32, count=len(counts))
+            end = start + len(counts)
+            if end > len(self._lengths):
+                grown = np.zeros(max(end, len(self._lengths) * 2), dtype=np.float32)
+                grown[:start] = self._lengths[:start]
+                self._lengths = grown
+            self._lengths[start:end] = lengths
+            self._total_length += float(lengths.sum())
+            self._segments.append(_build_segment(
+                np.asarray(term_ids, dtype=np.int32), np.asarray(doc_ids, dtype=np.int32), np.asarray(tfs, dtype=np.uint16)
+            ))
+            if len(self._segments) > self.max_segments:
+                self._merge()
+
+    def _merge(self) -> None:
+        """모든 세그먼트를 하나로 합침 (세그먼트가 문서 순서대로 쌓이므로 정렬만 다시 하면 됨)"""
+        term_ids = np.concatenate([np.repeat(s.terms, np.diff(s.offsets)) for s in self._segments])
+        doc_ids = np.concatenate([s.doc_ids for s in self._segments])
+        tfs = np.concatenate([s.tfs for s in self._segments])
+        self._segments = [_build_segment(term_ids, doc_ids, tfs)]
+
+    def scores(self, text: str) -> np.ndarray:
+        """전체 문서의 BM25 점수 (질의 용어가 하나도 없는 문서는 0)"""
+        with self._lock:
+            segments = list(self._segments)
+            size = len(self.docs)
+            lengths = self._lengths[:size]
+            average = self._total_length / size if size else 0.0
+            terms = [(self.vocab[token], self._df[self.vocab[token]])
+                     for token in dict.fromkeys(self.tokenizer(text)) if token in self.vocab]
+        scores = np.zeros(size, dtype=np.float32)
+        for term, df in terms:
+            idf = math.log(1.0 + (size - df + 0.5) / (df + 0.5))
+            for segment in segments:
+                found = segment.postings(term)
+                if found is None:
+                    continue
+                doc_ids, tfs = found
+                tf = tfs.astype(np.float32)
+                norm = self.k1 * (1.0 - self.b + self.b * lengths[doc_ids] / average)
+                scores += np.bincount(doc_ids, weights=idf * tf * (self.k1 + 1.0) / (tf + norm), minlength=size).astype(np.float32)
+        return scores
+
+    def query(self, text: str, k: int = 10, where: Optional[Mapping[str, Any]] = None) -> List[RetrievedChunk]:
+        scores = self.scores(text)
+        valid = scores > 0
+        mask = self.docs.mask(where, len(scores))
+        if mask is not None:
+            valid &= mask
+        return [self.docs.chunk(int(i), float(scores[i])) for i in _top_k(scores, k, valid)]
+
+
+# ========================================
+# 벡터
+# ========================================
+
+class VectorIndex:
+    """인코더 임베딩을 메모리 행렬에 보관하는 전수 코사인 검색"""
+
+    def __init__(self, encoder: Optional[Encoder] = None, batch_size: int = 256):
+        self.encoder = encoder or default_encoder()
+        self.batch_size = batch_size
+        self.docs = DocumentTable()
+        self._vectors = np.zeros((1024, self.encoder.dim), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Mapping[str, Any]]] = None,
+        vectors: Optional[np.ndarray] = None,
+    ) -> None:
+        """문서를 추가 (vectors 가 없으면 batch_size 단위로 인코딩)"""
+        if not ids:
+            return
+        if vectors is None:
+            vectors = np.concatenate([
+                self.encoder.encode(texts[i:i + self.batch_size], batch_size=self.batch_size)
+                for i in range(0, len(texts), self.batch_size)
+            ])
+        with self._lock:
+            start = self.docs.append(ids, texts, metadatas)
+            end = start + len(ids)
+            if end > len(self._vectors):
+                grown = np.zeros((max(end, len(self._vectors) * 2), self.encoder.dim), dtype=np.float32)
+                grown[:start] = self._vectors[:start]
+                self._vectors = grown
+            self._vectors[start:end] = vectors
+
+    def query(self, text: str, k: int = 10, where: Optional[Mapping[str, Any]] = None) -> List[RetrievedChunk]:
+        query_vector = self.encoder.encode([text])[0]
+        with self._lock:
+            size = len(self.docs)
+            vectors = self._vectors[:size]
+        scores = vectors @ query_vector
+        mask = self.docs.mask(where, size)
+        return [self.docs.chunk(int(i), float(scores[i])) for i in _top_k(scores, k, mask)]
+
+
+# ========================================
+# 결합
+# ========================================
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Sequence[RetrievedChunk]],
+    rrf_k: int = 60,
+    limit: Optional[int] = None,
+) -> List[RetrievedChunk]:
+    """이름 → 순위 목록을 RRF 점수로 결합. 메타데이터에 "<이름>_rank" (1부터) 를 기록"""
+    fused: Dict[str, float] = {}
+    first: Dict[str, RetrievedChunk] = {}
+    ranks: Dict[str, Dict[str, int]] = {}
+    for name, hits in rankings.items():
+        for rank, hit in enumerate(hits):
+            fused[hit.id] = fused.get(hit.id, 0.0) + 1.0 / (rrf_k + rank + 1)
+            first.setdefault(hit.id, hit)
+            ranks.setdefault(hit.id, {})[f"{name}_rank"] = rank + 1
+    order = sorted(fused, key=fused.get, reverse=True)[:limit]
+    return [replace(first[i], score=fused[i], metadata={**first[i].metadata, **ranks[i]}) for i in order]
+
+
+class HybridRetriever:
+    """키워드 검색기와 벡터 검색기의 상위 candidates 개를 RRF 로 결합"""
+
+    def __init__(self, keyword: Any, vector: Any, rrf_k: int = 60, candidates: int = 50):
+        self.keyword = keyword
+        self.vector = vector
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+
+    def query(self, text: str, k: int = 10, where: Optional[Mapping[str, Any]] = None) -> List[RetrievedChunk]:
+        depth = max(k, self.candidates)
+        rankings = {
+            "bm25": self.keyword.query(text, k=depth, where=where),
+            "vector": self.vector.query(text, k=depth, where=where),
+        }
+        return reciprocal_rank_fusion(rankings, rrf_k=self.rrf_k, limit=k)
+
+
+class HybridIndex(HybridRetriever):
+    """BM25Index + VectorIndex 를 함께 관리하는 하이브리드 인덱스"""
+
+    def __init__(self, encoder: Optional[Encoder] = None, rrf_k: int = 60, candidates: int = 50, **bm25_options: Any):
+        super().__init__(BM25Index(**bm25_options), VectorIndex(encoder), rrf_k=rrf_k, candidates=candidates)
+
+    def __len__(self) -> int:
+        return len(self.keyword)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Mapping[str, Any]]] = None,
+    ) -> None:
+        """두 인덱스에 같은 문서를 추가 (텍스트/메타데이터 객체는 공유)"""
+        self.vector.add(ids, texts, metadatas)
+        self.keyword.add(ids, texts, metadatas)
+
+    def add_chunks(self, chunks: Iterable[Any]) -> None:
+        """graph_utils.retrieval.Chunk 목록 추가"""
+        chunks = list(chunks)
+        self.add([c.id for c in chunks], [c.text for c in chunks], [c.metadata for c in chunks])
@@ -0,0 +1,215 @@
+"""
+임베딩 센트로이드 기반 의도 라우터
+
+키워드 라우팅은 "오늘 밖에 우산 필요해?" 같은 바꿔 말한 질문을 놓치고,
+LLM 으로 분류하면 질의마다 수백 ms 가 걸립니다.
+
+EmbeddingIntentRouter 는 의도별 예시 문장의 임베딩 평균(센트로이드)을 미리 계산해 두고,
+질의 임베딩과 센트로이드 행렬의 곱 한 번으로 가장 가까운 의도를 고릅니다.
+최고 유사도가 threshold 보다 낮으면 fallback(보통 LLM 분류)에 맡깁니다.
+
+- route(text) / route_batch(texts): 동기 라우팅 (배치는 인코딩과 행렬곱을 한 번에)
+- aroute(text): 동시에 들어온 요청을 max_wait_ms 또는 max_batch 까지 모아 인코딩 + 행렬곱을 한 번에 (MicroBatcher).
+  fallback 은 배치 밖에서 요청마다 따로 (asyncio.to_thread) 실행하므로, 느리거나 실패한 LLM 호출이
+  함께 배치된 다른 요청을 붙잡거나 실패시키지 않습니다.
+- save(path) / load(path): 센트로이드를 .npz 로 저장해 시작 시 예시를 다시 인코딩하지 않음
+- calibrated_router(examples): 임계값이 있는 인코더일 때만 라우터를 만듦 (아니면 경고 한 번과 함께 None)
+
+유사도 분포는 임베딩 모델마다 달라서 임계값을 다른 모델에 그대로 옮겨 쓸 수 없습니다.
+benchmarks/intent_router_bench.py 로 측정한 값을 CALIBRATED_THRESHOLDS 에 model_id 로 등록하거나,
+INTENT_ROUTER_THRESHOLD 환경 변수(또는 calibrated_router 의 threshold 인자)로 직접 지정합니다.
+
+    router = EmbeddingIntentRouter.from_examples({
+        "weather": ["서울 날씨 알려줘", "내일 비 와?"],
+        "calculate": ["10+5 계산해줘", "3 곱하기 4는?"],
+    }, threshold=0.45, fallback=classify_with_llm, default="end")
+    router.route("우산 챙겨야 할까?").intent  # "weather"
+"""
+
+import asyncio
+import os
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from graph_utils.batching import MicroBatcher, token_counter
+from graph_utils.embeddings import DEFAULT_EMBEDDING_MODEL, Encoder, default_encoder, normalize_rows
+
+# 질의 → 의도 이름 (없으면 None). 보통 LLM 분류 함수
+Fallback = Callable[[str], Optional[str]]
+
+# model_id → benchmarks/intent_router_bench.py 의 권장 임계값 (키워드가 없는 질의 기준)
+CALIBRATED_THRESHOLDS = {
+    "hashing-512-13": 0.1,
+}
+
+# 등록되지 않은 모델(기본 nlpai-lab/KURE-v1 포함)에 쓸 임계값. 벤치마크의 권장 임계값을 넣음
+INTENT_ROUTER_THRESHOLD = os.environ.get("INTENT_ROUTER_THRESHOLD")
+
+_warned_models: set = set()
+
+
+def calibrated_threshold(model_id: str) -> Optional[float]:
+    """측정해 둔 임계값 (이 인코더로 측정한 적이 없으면 None)"""
+    return CALIBRATED_THRESHOLDS.get(model_id)
+
+
+@dataclass(frozen=True)
+class IntentDecision:
+    """라우팅 결과. source 는 "embedding" / "fallback" / "default" 중 하나"""
+    intent: Optional[str]
+    score: float
+    source: str
+
+
+class EmbeddingIntentRouter:
+    """센트로이드 행렬과의 코사인 유사도로 의도를 고르는 라우터"""
+
+    def __init__(
+        self,
+        intents: Sequence[str],
+        centroids: np.ndarray,
+        encoder: Optional[Encoder] = None,
+        threshold: float = 0.5,
+        fallback: Optional[Fallback] = None,
+        default: Optional[str] = None,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.intents = list(intents)
+        self.centroids = normalize_rows(np.asarray(centroids, dtype=np.float32))
+        if self.centroids.shape[0] != len(self.intents):
+            raise ValueError("의도 수와 센트로이드 행 수가 다릅니다")
+        self.encoder = encoder or default_encoder()
+        self.threshold = threshold
+        self.fallback = fallback
+        self.default = default
+        # 인코딩 + 행렬곱만 배치 워커 스레드에서 실행 (fallback 은 aroute 가 요청마다 따로)
+        self.batcher: MicroBatcher[str, Tuple[int, float]] = MicroBatcher(
+            self._best_batch, max_batch=max_batch, max_wait_ms=max_wait_ms,
+            length=token_counter(self.encoder), name="intent-router",
+        )
+
+    @classmethod
+    def from_examples(
+        cls,
+        examples: Mapping[str, Sequence[str]],
+        encoder: Optional[Encoder] = None,
+        **kwargs,
+    ) -> "EmbeddingIntentRouter":
+        """의도 → 예시 문장들로 센트로이드를 계산"""
+        encoder = encoder or default_encoder()
+        intents = list(examples)
+        texts = [text for intent in intents for text in examples[intent]]
+        vectors = encoder.encode(texts)
+        centroids = []
+        start = 0
+        for intent in intents:
+            count = len(examples[intent])
+            if not count:
+                raise ValueError(f"예시 문장이 없는 의도: {intent}")
+            centroids.append(vectors[start:start + count].mean(axis=0))
+            start += count
+        return cls(intents, np.stack(centroids), encoder=encoder, **kwargs)
+
+    # ----------------------------------------
+    # 저장 / 불러오기
+    # ----------------------------------------
+
+    def save(self, path: Union[str, Path]) -> None:
+        np.savez(
+            path,
+            intents=np.array(self.intents),
+            centroids=self.centroids,
+            model_id=np.array(self.encoder.model_id),
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path], encoder: Optional[Encoder] = None, **kwargs) -> "EmbeddingIntentRouter":
+        encoder = encoder or default_encoder()
+        data = np.load(path, allow_pickle=False)
+        model_id = str(data["model_id"])
+        if model_id != encoder.model_id:
+            raise ValueError(f"센트로이드를 만든 모델({model_id})과 인코더({encoder.model_id})가 다릅니다")
+        return cls([str(i) for i in data["intents"]], data["centroids"], encoder=encoder, **kwargs)
+
+    # ----------------------------------------
+    # 동기 라우팅
+    # ----------------------------------------
+
+    def scores(self, texts: Sequence[str]) -> np.ndarray:
+        """(질의 수, 의도 수) 코사인 유사도 행렬"""
+        return self.encoder.encode(texts) @ self.centroids.T
+
+    def _best_batch(self, texts: Sequence[str]) -> List[Tuple[int, float]]:
+        """질의별 (가장 가까운 의도 번호, 유사도)"""
+        if not texts:
+            return []
+        scores = self.scores(texts)
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(texts)), best]
+        return [(int(b), float(s)) for b, s in zip(best, best_scores)]
+
+    def _from_fallback(self, intent: Optional[str], score: float) -> IntentDecision:
+        if intent in self.intents:
+            return IntentDecision(intent, score, "fallback")
+        return IntentDecision(self.default, score, "default")
+
+    def _decide(self, text: str, best: int, score: float) -> IntentDecision:
+        if score >= self.threshold:
+            return IntentDecision(self.intents[best], score, "embedding")
+        return self._from_fallback(self.fallback(text) if self.fallback is not None else None, score)
+
+    def route_batch(self, texts: Sequence[str]) -> List[IntentDecision]:
+        return [self._decide(text, best, score) for text, (best, score) in zip(texts, self._best_batch(texts))]
+
+    def route(self, text: str) -> IntentDecision:
+        return self.route_batch([text])[0]
+
+    # ----------------------------------------
+    # 비동기 마이크로 배치
+    # ----------------------------------------
+
+    async def aroute(self, text: str) -> IntentDecision:
+        """동시에 들어온 질의를 모아 한 번의 인코딩/행렬곱으로 라우팅 (애매한 질의의 fallback 은 이 요청만 따로)"""
+        best, score = await self.batcher.acall(text)
+        if score >= self.threshold or self.fallback is None:
+            return self._decide(text, best, score)
+        return self._from_fallback(await asyncio.to_thread(self.fallback, text), score)
+
+
+def calibrated_router(
+    examples: Mapping[str, Sequence[str]],
+    encoder: Optional[Encoder] = None,
+    threshold: Optional[float] = None,
+    **kwargs,
+) -> Optional[EmbeddingIntentRouter]:
+    """측정된 임계값으로 라우터를 만듦. 임계값이 없으면 None (호출자는 키워드 규칙만 사용)
+
+    임계값은 threshold 인자 → INTENT_ROUTER_THRESHOLD 환경 변수 → CALIBRATED_THRESHOLDS[model_id] 순으로 정합니다.
+    encoder 를 주지 않으면 DEFAULT_EMBEDDING_MODEL 로 먼저 찾아보고, 임계값이 없으면 모델을 불러오지 않습니다.
+    모델을 불러올 수 없어 default_encoder() 가 HashingEncoder 로 대신하면 그 인코더의 등록값을 다시 찾습니다.
+    """
+    if threshold is None and INTENT_ROUTER_THRESHOLD:
+        threshold = float(INTENT_ROUTER_THRESHOLD)
+    model_id = encoder.model_id if encoder is not None else DEFAULT_EMBEDDING_MODEL
+    resolved = threshold if threshold is not None else calibrated_threshold(model_id)
+    if resolved is not None and encoder is None:
+        encoder = default_encoder()
+        if threshold is None and encoder.model_id != model_id:
+            model_id = encoder.model_id
+            resolved = calibrated_threshold(model_id)
+    if resolved is None:
+        if model_id not in _warned_models:
+            _warned_models.add(model_id)
+            warnings.warn(
+                f"{model_id} 의 의도 라우터 임계값이 없어 임베딩 라우터를 쓰지 않습니다 (키워드 규칙 / fallback 만 사용). "
+                "benchmarks/intent_router_bench.py 의 권장 임계값을 INTENT_ROUTER_THRESHOLD 로 지정하세요.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        return None
+    return EmbeddingIntentRouter.from_examples(examples, encoder=encoder, threshold=resolved, **kwargs)
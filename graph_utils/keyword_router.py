@@ -0,0 +1,130 @@
+"""
+Aho-Corasick 기반 키워드 라우터
+
+select_tool_node, classify_intent, analyze_query_node 등은
+if "날씨" in query: ... elif "계산" in query: ... 처럼 부분 문자열 검사를 차례로 이어 붙입니다.
+의도마다 키워드가 수천 개가 되면 질의 하나에 수천 번의 `in` 검사가 일어납니다.
+
+KeywordRouter 는 의도 → 키워드 표로 Aho-Corasick 오토마톤을 한 번만 만들어 두고,
+질의 문자열을 한 번 훑으면서 일치한 의도 중 우선순위가 가장 높은 것을 고릅니다.
+표에 적은 순서가 우선순위이므로 기존 if/elif 체인과 결과가 같습니다.
+
+    router = KeywordRouter({
+        "weather": ["날씨"],
+        "calculator": ["계산", "더하기"],
+    }, default="search")
+    router.route("오늘 날씨 어때?")  # "weather"
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+class AhoCorasick:
+    """여러 패턴을 한 번의 순회로 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        if not pattern:
+            raise ValueError("빈 패턴은 등록할 수 없습니다")
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (len(self.patterns),)
+        self.patterns.append(pattern)
+
+    def _build(self) -> None:
+        """BFS 로 실패 링크를 만들고, 실패 링크 쪽 출력을 미리 합쳐 둠"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(끝 위치, 패턴 번호) 를 등장 순서대로 반환"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                yield i, index
+
+
+class KeywordRouter:
+    """의도 → 키워드 표로 만든 한 번 순회 라우터 (표 순서 = 우선순위)"""
+
+    def __init__(
+        self,
+        table: Mapping[str, Iterable[str]],
+        default: Optional[str] = None,
+        lowercase: bool = True,
+    ):
+        self.intents: List[str] = list(table)
+        self.default = default
+        self.lowercase = lowercase
+        keywords: List[str] = []
+        self._keyword_intent: List[int] = []
+        for priority, intent in enumerate(self.intents):
+            for keyword in table[intent]:
+                keywords.append(keyword.lower() if lowercase else keyword)
+                self._keyword_intent.append(priority)
+        self.automaton = AhoCorasick(keywords)
+        # 상태별로 도달 가능한 가장 높은 우선순위(작은 값)를 미리 계산
+        none = len(self.intents)
+        self._best = [
+            min((self._keyword_intent[i] for i in outputs), default=none)
+            for outputs in self.automaton._out
+        ]
+
+    def route(self, text: str) -> Optional[str]:
+        """가장 우선순위가 높은 일치 의도 (없으면 default)"""
+        if self.lowercase:
+            text = text.lower()
+        goto, fail, best_of = self.automaton._goto, self.automaton._fail, self._best
+        best = len(self.intents)
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if best_of[state] < best:
+                best = best_of[state]
+                if best == 0:
+                    break
+        return self.intents[best] if best < len(self.intents) else self.default
+
+    def matches(self, text: str) -> Dict[str, List[str]]:
+        """의도별로 일치한 키워드 목록 (디버깅/로그용)"""
+        if self.lowercase:
+            text = text.lower()
+        found: Dict[str, List[str]] = {}
+        for _, index in self.automaton.iter_matches(text):
+            intent = self.intents[self._keyword_intent[index]]
+            keyword = self.automaton.patterns[index]
+            if keyword not in found.setdefault(intent, []):
+                found[intent].append(keyword)
+        return found
@@ -0,0 +1,154 @@
+"""
+벤치마크/부하 테스트용 로컬 LLM 스텁
+
+OpenAI 를 호출하지 않고도 그래프를 끝까지 돌려볼 수 있도록, 프롬프트 길이에 비례한
+지연과 가끔 발생하는 느린 응답을 흉내 내는 채팅 모델입니다. bind_tools() 를 지원하므로
+예제 그래프의 ChatOpenAI 자리에 그대로 끼워 넣을 수 있습니다.
+
+    model = StubChatModel(base_latency=0.05, per_token_latency=0.0001)
+    model.invoke([HumanMessage(content="안녕")])
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from graph_utils.history import estimate_messages_tokens
+
+Responder = Callable[[List[BaseMessage]], AIMessage]
+
+
+def echo_responder(messages: List[BaseMessage]) -> AIMessage:
+    """마지막 사람 메시지를 그대로 되돌려주는 기본 응답기"""
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return AIMessage(content=f"응답: {message.content}")
+    return AIMessage(content="응답: (입력 없음)")
+
+
+def make_tool_responder(tool_name: str, build_args: Callable[[str], dict]) -> Responder:
+    """사람 메시지에는 Tool 호출로, ToolMessage 에는 결과 요약으로 답하는 응답기"""
+    counter = {"n": 0}
+    lock = threading.Lock()
+
+    def responder(messages: List[BaseMessage]) -> AIMessage:
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=f"결과는 {last.content} 입니다.")
+        with lock:
+            counter["n"] += 1
+            call_id = f"call_{counter['n']}"
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": tool_name, "args": build_args(str(last.content)), "id": call_id}],
+        )
+
+    return responder
+
+
+class StubChatModel(BaseChatModel):
+    """
+    지연을 흉내 내는 로컬 채팅 모델
+
+    - base_latency / per_token_latency: 호출마다 base + 프롬프트 토큰 수 × per_token 만큼 대기
+    - slow_probability / slow_latency: 일정 확률로 느린 응답(꼬리 지연)을 주입
+    - responder: 메시지 목록 → AIMessage. 없으면 echo_responder 를 사용합니다.
+    - stream_delay: 스트리밍(stream / messages 모드) 시 어절 하나를 보낼 때마다 기다리는 시간
+    """
+
+    base_latency: float = 0.0
+    per_token_latency: float = 0.0
+    slow_probability: float = 0.0
+    slow_latency: float = 0.0
+    seed: Optional[int] = None
+    model_name: str = "stub"
+    responder: Optional[Responder] = None
+    stream_delay: float = 0.0
+
+    _rng: random.Random = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default=None)
+    _calls: int = PrivateAttr(default=0)
+    _last_prompt_tokens: int = PrivateAttr(default=0)
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def last_prompt_tokens(self) -> int:
+        return self._last_prompt_tokens
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "StubChatModel":
+        # 응답은 responder 가 결정하므로 Tool 스키마는 필요 없습니다.
+        return self
+
+    def _delay(self, messages: List[BaseMessage]) -> float:
+        tokens = estimate_messages_tokens(messages)
+        with self._lock:
+            self._calls += 1
+            self._last_prompt_tokens = tokens
+            slow = self._rng.random() < self.slow_probability
+        delay = self.base_latency + tokens * self.per_token_latency
+        return delay + (self.slow_latency if slow else 0.0)
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=(self.responder or echo_responder)(messages))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._delay(messages))
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._delay(messages))
+        return self._result(messages)
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[ChatGenerationChunk]:
+        """응답을 어절 단위 청크로 (Tool 호출은 첫 청크에 담음)"""
+        message = (self.responder or echo_responder)(messages)
+        words = str(message.content).split(" ") if message.content else [""]
+        chunks = [ChatGenerationChunk(message=AIMessageChunk(content=word if i == 0 else " " + word))
+                  for i, word in enumerate(words)]
+        if message.tool_calls:
+            chunks[0] = ChatGenerationChunk(message=AIMessageChunk(
+                content=chunks[0].message.content,
+                tool_call_chunks=[{"name": call["name"], "args": json.dumps(call["args"], ensure_ascii=False),
+                                   "id": call["id"], "index": i} for i, call in enumerate(message.tool_calls)],
+            ))
+        return chunks
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self._delay(messages))
+        for chunk in self._chunks(messages):
+            if run_manager is not None:
+                run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+            time.sleep(self.stream_delay)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._delay(messages))
+        for chunk in self._chunks(messages):
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+            await asyncio.sleep(self.stream_delay)
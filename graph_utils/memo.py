@@ -0,0 +1,209 @@
+"""
+순수(pure) Tool 결과 메모이제이션
+
+evaluate_korean, add, search_db 처럼 같은 인자에 항상 같은 결과를 내는 Tool 도
+에이전트는 턴과 스레드를 넘나들며 같은 인자로 다시 호출합니다.
+@pure 로 표시한 Tool 은 ToolRegistry 에 등록될 때 MemoCache 로 감싸져서,
+
+- 검증을 마친 인자를 정렬된 JSON 으로 만든 뒤 해시한 값을 키로 쓰고 ("85" 와 85 는 같은 키)
+- 크기 제한이 있는 LRU 에 결과를 보관하며 (선택적으로 SQLite 파일에 영구 저장)
+- 캐시 적중 시 Tool 을 실행하지 않고 같은 결과(→ 같은 ToolMessage 내용)를 돌려줍니다.
+  결과는 복사본을 돌려주므로 호출자가 리스트/딕셔너리를 수정해도 다음 적중에는 영향이 없습니다.
+
+영구 저장소의 키에는 함수 소스의 해시(version)가 들어가므로, 코드를 고치면 예전 코드의 결과를 쓰지 않습니다.
+
+    @pure
+    @tool
+    def add(a: int, b: int) -> int:
+        ...
+
+    @pure(maxsize=256, persist="tool_memo.sqlite")
+    def evaluate_korean(score: int) -> str:
+        ...
+"""
+
+import copy
+import hashlib
+import inspect
+import json
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 옵션은 Tool 의 metadata 가 아니라 비공개 속성에 둠 (metadata 는 콜백/트레이서로 전달되어 직렬화됨)
+_MEMO_ATTR = "__memo_options__"
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class MemoOptions:
+    """@pure 에 지정한 메모이제이션 옵션"""
+    maxsize: int = 1024
+    persist: Optional[str] = None
+    # 영구 저장소 키에 붙는 버전 (기본: 함수 소스의 해시)
+    version: Optional[str] = None
+
+
+def source_version(func: Any) -> str:
+    """함수 소스의 짧은 해시 (소스를 읽을 수 없으면 바이트코드와 상수로)"""
+    try:
+        source = inspect.getsource(func).encode("utf-8")
+    except (OSError, TypeError):
+        code = getattr(func, "__code__", None)
+        source = code.co_code + repr(code.co_consts).encode("utf-8") if code is not None else repr(func).encode("utf-8")
+    return hashlib.blake2b(source, digest_size=8).hexdigest()
+
+
+def pure(obj: Any = None, *, maxsize: int = 1024, persist: Optional[str] = None, version: Optional[str] = None) -> Any:
+    """Tool(또는 Tool 로 등록될 일반 함수)을 순수 함수로 표시
+
+    @pure, @pure() 와 @pure(maxsize=..., persist=..., version=...) 모두 사용할 수 있습니다.
+    version 을 주지 않으면 함수 소스의 해시를 씁니다 (함수가 부르는 다른 코드가 바뀌면 직접 올려야 함).
+    """
+    options = MemoOptions(maxsize=maxsize, persist=persist, version=version)
+
+    def mark(target: Any) -> Any:
+        func = getattr(target, "func", None) or getattr(target, "coroutine", None) or target
+        # pydantic 모델인 BaseTool 에도 필드 검증 없이 붙도록 object.__setattr__ 사용
+        object.__setattr__(target, _MEMO_ATTR, replace(options, version=options.version or source_version(func)))
+        return target
+
+    return mark if obj is None else mark(obj)
+
+
+def memo_options_of(tool_or_func: Any) -> Optional[MemoOptions]:
+    """@pure 로 표시된 경우 그 옵션, 아니면 None"""
+    options = getattr(tool_or_func, _MEMO_ATTR, None)
+    if options is None:
+        func = getattr(tool_or_func, "func", None) or tool_or_func
+        options = getattr(func, _MEMO_ATTR, None)
+    return options
+
+
+def canonical_key(args: Dict[str, Any]) -> str:
+    """인자 딕셔너리의 정규화된 해시 (키 순서와 무관)"""
+    payload = json.dumps(args, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=repr)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ========================================
+# 영구 저장소
+# ========================================
+
+class MemoStore:
+    """SQLite 파일 하나에 여러 Tool 의 메모를 저장하는 영구 저장소 (tool 열은 "이름@버전")"""
+
+    _instances: Dict[str, "MemoStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_memo (tool TEXT, key TEXT, value BLOB, PRIMARY KEY (tool, key))"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def open(cls, path: str) -> "MemoStore":
+        """같은 경로는 하나의 연결을 공유"""
+        with cls._instances_lock:
+            store = cls._instances.get(path)
+            if store is None:
+                store = cls._instances[path] = cls(path)
+            return store
+
+    def get(self, tool: str, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM tool_memo WHERE tool = ? AND key = ?", (tool, key)).fetchone()
+        return _MISSING if row is None else pickle.loads(row[0])
+
+    def put(self, tool: str, key: str, value: Any) -> None:
+        blob = pickle.dumps(value)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO tool_memo VALUES (?, ?, ?)", (tool, key, blob))
+            self._conn.commit()
+
+
+# ========================================
+# LRU 메모 캐시
+# ========================================
+
+class MemoCache:
+    """Tool 하나의 LRU 메모 캐시 + 적중률 지표"""
+
+    def __init__(self, name: str, options: MemoOptions):
+        self.name = name
+        self.options = options
+        self.store = MemoStore.open(options.persist) if options.persist else None
+        # 코드가 바뀌면 (version 이 다르면) 예전 결과를 읽지 않도록 영구 저장소 키에 버전을 붙임
+        self.store_name = f"{name}@{options.version}" if options.version else name
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+        if self.store is not None:
+            value = self.store.get(self.store_name, key)
+            if value is not _MISSING:
+                self._remember(key, value)
+                with self._lock:
+                    self.hits += 1
+                    self.persistent_hits += 1
+                return True, value
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.options.maxsize:
+                self._entries.popitem(last=False)
+
+    def call(self, args: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """검증된 args 로 캐시를 조회하고, 없으면 compute() 결과를 저장
+
+        저장한 값과 돌려주는 값은 서로 다른 복사본입니다 (호출자가 결과를 수정해도 캐시는 그대로).
+        """
+        key = canonical_key(args)
+        found, value = self._lookup(key)
+        if found:
+            return copy.deepcopy(value)
+        value = compute()
+        self._remember(key, copy.deepcopy(value))
+        if self.store is not None:
+            self.store.put(self.store_name, key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "persistent_hits": self.persistent_hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return f"{self.name} 캐시 적중 {stats['hits']}/{stats['hits'] + stats['misses']} ({stats['hit_rate']:.1%})"
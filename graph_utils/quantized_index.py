@@ -0,0 +1,246 @@
+"""
+NumPy 만으로 동작하는 int8 양자화 벡터 인덱스 (Chroma 없이 단일 노드 배포용)
+
+- 양자화: 행마다 최대 절댓값으로 나눠 int8 로 저장 (float32 대비 1/4 크기).
+  질의는 float32 그대로 두고 블록을 float32 로 풀어 행렬곱하므로 질의 쪽 오차는 없습니다.
+- 검색: block_size 행씩 (질의 묶음 x 블록) 행렬곱 → 블록별 argpartition top-k → 병합.
+  블록은 ThreadPoolExecutor 로 코어마다 나눠 처리합니다 (NumPy 행렬곱은 GIL 을 놓음).
+- rescore: keep_float=True 로 만든 인덱스는 원본 float32 도 저장해 두고,
+  int8 로 고른 상위 k * rescore 개만 원본으로 다시 점수 매겨 재현율을 올립니다.
+- 저장/불러오기: codes.npy / scales.npy / vectors.npy(선택) 를 np.load(mmap_mode="r") 로 열어
+  시작 시간과 메모리를 아낍니다. 문서 id/텍스트/메타데이터는 docs.jsonl.
+
+query(text, k, where) 는 ChromaRetriever / VectorIndex 와 같은 인터페이스라 검색 노드에서 바꿔 끼울 수 있습니다.
+
+    index = QuantizedVectorIndex(keep_float=True)
+    index.add(ids, texts, metadatas)
+    index.save("vector_index")
+    index = QuantizedVectorIndex.load("vector_index")
+    index.query("LangGraph 체크포인트", k=5, where={"source": "학술 자료"})
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from graph_utils.embeddings import Encoder, default_encoder
+from graph_utils.retrieval import DocumentTable, RetrievedChunk
+
+INDEX_FORMAT_VERSION = 1
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """행별 대칭 int8 양자화 → (codes, scales). 복원은 codes * scales[:, None]"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def _merge_top_k(scores: np.ndarray, indices: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(질의 수, 후보 수) 점수/위치에서 질의마다 상위 k 개를 점수 내림차순으로"""
+    if scores.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, part, axis=1)
+        indices = np.take_along_axis(indices, part, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+
+class QuantizedVectorIndex:
+    """int8 양자화 + 블록 행렬곱 top-k 벡터 인덱스"""
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        keep_float: bool = False,
+        block_size: int = 4096,
+        workers: Optional[int] = None,
+        batch_size: int = 256,
+    ):
+        """
+        Args:
+            keep_float: 원본 float32 도 보관해 rescore 에 사용 (저장 시 vectors.npy)
+            block_size: 한 번에 float32 로 풀어 행렬곱할 행 수 (풀린 블록이 CPU 캐시에 머물도록 작게)
+            workers: 블록 병렬 처리 스레드 수 (기본: CPU 수)
+        """
+        self.encoder = encoder or default_encoder()
+        self.dim = self.encoder.dim
+        self.keep_float = keep_float
+        self.block_size = block_size
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.docs = DocumentTable()
+        self._codes = np.zeros((0, self.dim), dtype=np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._floats = np.zeros((0, self.dim), dtype=np.float32) if keep_float else None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """벡터 저장에 쓰는 바이트 수 (codes + scales + 원본)"""
+        size = self._size * (self.dim + 4)
+        return size + (self._size * self.dim * 4 if self.keep_float else 0)
+
+    # ----------------------------------------
+    # 추가
+    # ----------------------------------------
+
+    @staticmethod
+    def _grow(array: np.ndarray, size: int) -> np.ndarray:
+        """용량이 모자라면 두 배로 늘린 메모리 배열로 복사 (mmap 으로 연 배열도 여기서 메모리로 옮겨짐)"""
+        if len(array) >= size and not isinstance(array, np.memmap):
+            return array
+        grown = np.zeros((max(size, len(array) * 2, 1024),) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def add(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Mapping[str, Any]]] = None,
+        vectors: Optional[np.ndarray] = None,
+    ) -> None:
+        """문서를 추가 (vectors 가 없으면 batch_size 단위로 인코딩)"""
+        if not ids:
+            return
+        if vectors is None:
+            vectors = np.concatenate([
+                self.encoder.encode(texts[i:i + self.batch_size], batch_size=self.batch_size)
+                for i in range(0, len(texts), self.batch_size)
+            ])
+        vectors = np.asarray(vectors, dtype=np.float32)
+        codes, scales = quantize(vectors)
+        with self._lock:
+            start = self.docs.append(ids, texts, metadatas)
+            end = start + len(ids)
+            self._codes = self._grow(self._codes, end)
+            self._scales = self._grow(self._scales, end)
+            self._codes[start:end] = codes
+            self._scales[start:end] = scales
+            if self._floats is not None:
+                self._floats = self._grow(self._floats, end)
+                self._floats[start:end] = vectors
+            self._size = end
+
+    # ----------------------------------------
+    # 검색
+    # ----------------------------------------
+
+    def _search_block(
+        self, queries: np.ndarray, start: int, end: int, k: int, mask: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        scores = (self._codes[start:end].astype(np.float32) @ queries.T).T
+        scores *= self._scales[start:end]
+        if mask is not None:
+            scores[:, ~mask[start:end]] = -np.inf
+        indices = np.broadcast_to(np.arange(start, end), scores.shape)
+        return _merge_top_k(scores, indices, min(k, end - start))
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        mask: Optional[np.ndarray] = None,
+        rescore: int = 0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """질의 벡터 (n, dim) → (점수, 위치) 각각 (n, k). 결과가 k 개보다 적으면 위치 -1
+
+        Args:
+            mask: 검색할 문서의 bool 마스크 (길이 = 문서 수)
+            rescore: 0 보다 크면 int8 로 k * rescore 개를 고른 뒤 원본 float32 로 다시 점수 매김
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        size = self._size
+        if size == 0 or k <= 0:
+            return np.zeros((len(queries), 0), dtype=np.float32), np.zeros((len(queries), 0), dtype=np.int64)
+        rescore = rescore if rescore and self._floats is not None else 0
+        depth = min(k * rescore if rescore else k, size)
+        blocks = [(start, min(start + self.block_size, size)) for start in range(0, size, self.block_size)]
+        if len(blocks) > 1 and self.workers > 1:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="vector-search")
+            parts = list(self._pool.map(lambda block: self._search_block(queries, *block, depth, mask), blocks))
+        else:
+            parts = [self._search_block(queries, start, end, depth, mask) for start, end in blocks]
+        scores, indices = _merge_top_k(
+            np.concatenate([p[0] for p in parts], axis=1), np.concatenate([p[1] for p in parts], axis=1), depth
+        )
+        if rescore:
+            exact = np.einsum("qkd,qd->qk", self._floats[indices], queries)
+            exact[~np.isfinite(scores)] = -np.inf
+            scores, indices = _merge_top_k(exact, indices, min(k, depth))
+        indices = np.where(np.isfinite(scores), indices, -1)
+        return scores[:, :k], indices[:, :k]
+
+    def query(
+        self,
+        text: str,
+        k: int = 10,
+        where: Optional[Mapping[str, Any]] = None,
+        rescore: int = 4,
+    ) -> List[RetrievedChunk]:
+        scores, indices = self.search(self.encoder.encode([text]), k, self.docs.mask(where, self._size), rescore)
+        return [self.docs.chunk(int(i), float(s)) for s, i in zip(scores[0], indices[0]) if i >= 0]
+
+    # ----------------------------------------
+    # 저장 / 불러오기
+    # ----------------------------------------
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            size = self._size
+            np.save(path / "codes.npy", self._codes[:size])
+            np.save(path / "scales.npy", self._scales[:size])
+            if self._floats is not None:
+                np.save(path / "vectors.npy", self._floats[:size])
+            with open(path / "docs.jsonl", "w", encoding="utf-8") as f:
+                for position in range(size):
+                    record = {"id": self.docs.ids[position], "text": self.docs.texts[position],
+                              "metadata": self.docs.metadatas[position]}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            meta = {"version": INDEX_FORMAT_VERSION, "model_id": self.encoder.model_id, "dim": self.dim,
+                    "count": size, "keep_float": self._floats is not None}
+            (path / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path], encoder: Optional[Encoder] = None, mmap: bool = True, **kwargs: Any
+    ) -> "QuantizedVectorIndex":
+        """저장한 인덱스를 열기 (mmap=True 면 벡터 파일을 메모리 맵으로 읽기 전용 공유)"""
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        if meta["version"] != INDEX_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 포맷: {meta['version']}")
+        encoder = encoder or default_encoder()
+        if meta["model_id"] != encoder.model_id:
+            raise ValueError(f"인덱스를 만든 모델({meta['model_id']})과 인코더({encoder.model_id})가 다릅니다")
+        index = cls(encoder, keep_float=meta["keep_float"], **kwargs)
+        mode = "r" if mmap else None
+        index._codes = np.load(path / "codes.npy", mmap_mode=mode)
+        index._scales = np.load(path / "scales.npy", mmap_mode=mode)
+        if meta["keep_float"]:
+            index._floats = np.load(path / "vectors.npy", mmap_mode=mode)
+        ids, texts, metadatas = [], [], []
+        with open(path / "docs.jsonl", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                ids.append(record["id"])
+                texts.append(record["text"])
+                metadatas.append(record["metadata"])
+        index.docs.append(ids, texts, metadatas)
+        index._size = meta["count"]
+        return index
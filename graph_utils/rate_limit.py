@@ -0,0 +1,398 @@
+"""
+프로세스 전체에서 공유하는 모델 호출 속도 제한 + 동시성 제어(governor)
+
+여러 스레드가 동시에 그래프를 실행하면 진행 중인 모델 요청 수에 상한이 없어
+provider 의 rate limit 에 걸리고, 이어서 재시도 폭주가 일어납니다.
+ModelGovernor 는 모델별 / 테넌트별로
+
+- 토큰 버킷 (초당 요청 수 rps, 순간 허용량 burst)
+- 동시 실행 상한 (max_concurrency)
+- 대기열 길이 상한 (max_queue) 과 마감 시간(deadline)
+
+을 함께 적용하고, 대기 시간 지표를 모읍니다. 그래프 노드에서는 governed() 로 감싼
+채팅 모델을 쓰면 invoke / stream / ainvoke / astream 호출이 모두 governor 를 거칩니다.
+감싼 모델은 Runnable 이라 bind / bind_tools / with_structured_output / 파이프(|) 로 만든 것도 governor 를 거칩니다.
+
+default_governor 는 설정하지 않은 모델에 DEFAULT_MODEL_BUDGET (OpenAI 가장 낮은 등급의 분당 요청 한도 수준)을 적용합니다.
+계정 한도에 맞게 모델별 / 테넌트별 예산을 덮어쓰세요 (실행 중에 바꿔도 진행 중인 호출 수는 유지됩니다).
+
+    model = governed(ChatOpenAI(model="gpt-4o-mini"))
+    default_governor.configure_model("gpt-4o-mini", rps=20, burst=5, max_concurrency=8)
+    default_governor.configure_tenant("team-a", rps=5, max_concurrency=2)
+
+테넌트는 config["configurable"]["tenant_id"] 로 전달합니다 (그래프 실행 config 가 노드 안까지 전파됩니다).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.runnables import Runnable
+
+DEFAULT_TENANT = "default"
+
+
+class GovernorTimeout(TimeoutError):
+    """마감 시간 안에 실행 슬롯을 얻지 못함"""
+
+
+class GovernorQueueFull(RuntimeError):
+    """대기열이 가득 차서 요청을 즉시 거절함 (부하 차단)"""
+
+
+@dataclass
+class Budget:
+    """하나의 키(모델 또는 테넌트)에 대한 예산. None 은 제한 없음"""
+    rps: Optional[float] = None
+    burst: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    max_queue: Optional[int] = None
+
+
+class _BudgetState:
+    """Budget 의 런타임 상태 (governor 의 lock 안에서만 접근)"""
+
+    def __init__(self, budget: Budget, now: float):
+        self.budget = budget
+        self.capacity = self._capacity(budget)
+        self.tokens = self.capacity
+        self.updated = now
+        self.in_flight = 0
+        self.waiting = 0
+
+    @staticmethod
+    def _capacity(budget: Budget) -> float:
+        return budget.burst if budget.burst is not None else max(1.0, budget.rps or 1.0)
+
+    def reconfigure(self, budget: Budget, now: float) -> None:
+        """예산만 바꾸고 진행 중 / 대기 중 카운트는 유지 (상태를 버리면 반환되는 슬롯이 새 상태를 음수로 만듦)"""
+        self.refill(now)
+        self.budget = budget
+        self.capacity = self._capacity(budget)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def refill(self, now: float) -> None:
+        if self.budget.rps is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.budget.rps)
+        self.updated = now
+
+    def wait_hint(self) -> Optional[float]:
+        """지금 바로 실행할 수 없다면 다시 확인해 볼 시간. 가능하면 0, 슬롯 반환을 기다려야 하면 None"""
+        if self.budget.max_concurrency is not None and self.in_flight >= self.budget.max_concurrency:
+            return None
+        if self.budget.rps is not None and self.tokens < 1.0:
+            return (1.0 - self.tokens) / self.budget.rps
+        return 0.0
+
+
+@dataclass
+class GovernorMetrics:
+    """키별 대기 시간 / 처리 지표"""
+    acquired: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    recent_waits: Deque[float] = field(default_factory=lambda: deque(maxlen=2048))
+
+    def record(self, wait: float) -> None:
+        self.acquired += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent_waits.append(wait)
+
+    def percentile(self, q: float) -> float:
+        if not self.recent_waits:
+            return 0.0
+        ordered = sorted(self.recent_waits)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_wait_ms": self.total_wait / self.acquired * 1000 if self.acquired else 0.0,
+            "p95_wait_ms": self.percentile(0.95) * 1000,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+class ModelGovernor:
+    """모델별 / 테넌트별 토큰 버킷 + 동시성 세마포어"""
+
+    def __init__(self, default_model_budget: Optional[Budget] = None, default_tenant_budget: Optional[Budget] = None):
+        self._cond = threading.Condition()
+        self._model_budgets: Dict[str, Budget] = {}
+        self._tenant_budgets: Dict[str, Budget] = {}
+        self._default_model_budget = default_model_budget or Budget()
+        self._default_tenant_budget = default_tenant_budget or Budget()
+        self._states: Dict[Tuple[str, str], _BudgetState] = {}
+        self._metrics: Dict[Tuple[str, str], GovernorMetrics] = {}
+
+    # ----------------------------------------
+    # 설정
+    # ----------------------------------------
+
+    def configure_model(self, model_id: str, **budget: Any) -> None:
+        self._configure("model", model_id, Budget(**budget))
+
+    def configure_tenant(self, tenant_id: str, **budget: Any) -> None:
+        self._configure("tenant", tenant_id, Budget(**budget))
+
+    def _configure(self, kind: str, key: str, budget: Budget) -> None:
+        with self._cond:
+            (self._model_budgets if kind == "model" else self._tenant_budgets)[key] = budget
+            state = self._states.get((kind, key))
+            if state is not None:
+                state.reconfigure(budget, time.monotonic())
+            # 한도가 늘었으면 기다리던 스레드가 바로 다시 확인하도록
+            self._cond.notify_all()
+
+    def _state(self, kind: str, key: str, now: float) -> _BudgetState:
+        state = self._states.get((kind, key))
+        if state is None:
+            budgets = self._model_budgets if kind == "model" else self._tenant_budgets
+            default = self._default_model_budget if kind == "model" else self._default_tenant_budget
+            state = _BudgetState(budgets.get(key, default), now)
+            self._states[(kind, key)] = state
+        return state
+
+    def _metric(self, kind: str, key: str) -> GovernorMetrics:
+        metric = self._metrics.get((kind, key))
+        if metric is None:
+            metric = self._metrics[(kind, key)] = GovernorMetrics()
+        return metric
+
+    # ----------------------------------------
+    # 슬롯 획득 / 반환 (lock 안에서 호출)
+    # ----------------------------------------
+
+    def _enqueue(self, states: List[_BudgetState], keys: List[Tuple[str, str]]) -> None:
+        for state, key in zip(states, keys):
+            if state.budget.max_queue is not None and state.waiting >= state.budget.max_queue:
+                for k in keys:
+                    self._metric(*k).rejected += 1
+                raise GovernorQueueFull(f"대기열이 가득 찼습니다: {key[0]}={key[1]}")
+        for state in states:
+            state.waiting += 1
+
+    def _try_take(self, states: List[_BudgetState], now: float) -> Optional[float]:
+        """모든 예산에서 슬롯을 얻으면 None, 아니면 다시 확인할 때까지의 대기 시간(모르면 inf)"""
+        wait = 0.0
+        for state in states:
+            state.refill(now)
+            hint = state.wait_hint()
+            wait = max(wait, float("inf") if hint is None else hint)
+        if wait > 0.0:
+            return wait
+        for state in states:
+            if state.budget.rps is not None:
+                state.tokens -= 1.0
+            state.in_flight += 1
+            state.waiting -= 1
+        return None
+
+    def _give_up(self, states: List[_BudgetState], keys: List[Tuple[str, str]], timed_out: bool = True) -> None:
+        for state in states:
+            state.waiting -= 1
+        if timed_out:
+            for key in keys:
+                self._metric(*key).timeouts += 1
+
+    def _release(self, model_id: str, tenant_id: str) -> None:
+        with self._cond:
+            now = time.monotonic()
+            for kind, key in (("model", model_id), ("tenant", tenant_id)):
+                self._state(kind, key, now).in_flight -= 1
+            self._cond.notify_all()
+
+    def _prepare(self, model_id: str, tenant_id: str, now: float):
+        keys = [("model", model_id), ("tenant", tenant_id)]
+        states = [self._state(kind, key, now) for kind, key in keys]
+        self._enqueue(states, keys)
+        return keys, states
+
+    def _record(self, keys: List[Tuple[str, str]], wait: float) -> None:
+        for key in keys:
+            self._metric(*key).record(wait)
+
+    # ----------------------------------------
+    # 공개 API
+    # ----------------------------------------
+
+    @contextmanager
+    def acquire(self, model_id: str, tenant_id: str = DEFAULT_TENANT, timeout: Optional[float] = None) -> Iterator[float]:
+        """슬롯을 얻을 때까지 대기 (스레드용). 대기한 시간(초)을 돌려줌"""
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._cond:
+            keys, states = self._prepare(model_id, tenant_id, start)
+            while True:
+                now = time.monotonic()
+                wait = self._try_take(states, now)
+                if wait is None:
+                    break
+                if deadline is not None and now >= deadline:
+                    self._give_up(states, keys)
+                    raise GovernorTimeout(f"{timeout:.3f}s 안에 {model_id}/{tenant_id} 슬롯을 얻지 못했습니다")
+                remaining = None if deadline is None else deadline - now
+                wait = None if wait == float("inf") else wait
+                candidates = [w for w in (wait, remaining) if w is not None]
+                self._cond.wait(min(candidates) if candidates else None)
+            waited = time.monotonic() - start
+            self._record(keys, waited)
+        try:
+            yield waited
+        finally:
+            self._release(model_id, tenant_id)
+
+    @asynccontextmanager
+    async def acquire_async(self, model_id: str, tenant_id: str = DEFAULT_TENANT,
+                            timeout: Optional[float] = None, poll_interval: float = 0.005) -> AsyncIterator[float]:
+        """acquire() 의 asyncio 버전. 이벤트 루프를 막지 않도록 짧게 잠들며 재시도"""
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._cond:
+            keys, states = self._prepare(model_id, tenant_id, start)
+        try:
+            while True:
+                with self._cond:
+                    now = time.monotonic()
+                    wait = self._try_take(states, now)
+                    if wait is None:
+                        waited = now - start
+                        self._record(keys, waited)
+                        break
+                    if deadline is not None and now >= deadline:
+                        raise GovernorTimeout(f"{timeout:.3f}s 안에 {model_id}/{tenant_id} 슬롯을 얻지 못했습니다")
+                sleep = min(wait, poll_interval) if wait != float("inf") else poll_interval
+                if deadline is not None:
+                    sleep = min(sleep, max(0.0, deadline - now))
+                await asyncio.sleep(sleep)
+        except BaseException as e:
+            # 시간 초과뿐 아니라 대기 중 취소(CancelledError)에도 대기열 자리를 돌려줌
+            with self._cond:
+                self._give_up(states, keys, timed_out=isinstance(e, GovernorTimeout))
+            raise
+        try:
+            yield waited
+        finally:
+            self._release(model_id, tenant_id)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """{"model:gpt-4o-mini": {...}, "tenant:team-a": {...}} 형태의 지표 스냅샷"""
+        with self._cond:
+            result = {}
+            for (kind, key), metric in self._metrics.items():
+                snapshot = metric.snapshot()
+                state = self._states.get((kind, key))
+                snapshot["in_flight"] = state.in_flight if state else 0
+                snapshot["waiting"] = state.waiting if state else 0
+                result[f"{kind}:{key}"] = snapshot
+            return result
+
+
+# 설정하지 않은 모델의 기본 예산: 분당 500 요청(OpenAI tier 1) ≈ 초당 8, 동시 8
+DEFAULT_MODEL_BUDGET = Budget(rps=8.0, burst=8.0, max_concurrency=8)
+
+# 프로세스 전체에서 공유하는 기본 governor
+default_governor = ModelGovernor(default_model_budget=DEFAULT_MODEL_BUDGET)
+
+
+# ========================================
+# 채팅 모델 래퍼
+# ========================================
+
+def _tenant_from_config(config: Optional[dict]) -> str:
+    # 그래프 노드 안에서는 실행 config 가 contextvar 로 전파되므로 ensure_config 로 읽을 수 있음
+    from langchain_core.runnables.config import ensure_config
+    return ensure_config(config).get("configurable", {}).get("tenant_id", DEFAULT_TENANT)
+
+
+def _model_id_of(model: Any) -> str:
+    bound = getattr(model, "bound", model)
+    return getattr(bound, "model_name", None) or getattr(bound, "model", None) or type(bound).__name__
+
+
+class GovernedChatModel(Runnable):
+    """채팅 모델의 invoke / stream 호출을 governor 로 감싸는 Runnable
+
+    bind / with_config / 파이프는 Runnable 기본 구현이 이 래퍼를 감싸므로 그대로 governor 를 거치고,
+    bind_tools / with_structured_output 처럼 모델이 새 Runnable 을 돌려주는 메서드는 결과를 다시 감쌉니다.
+    """
+
+    def __init__(self, model: Any, governor: Optional[ModelGovernor] = None,
+                 model_id: Optional[str] = None, timeout: Optional[float] = None):
+        self.model = model
+        self.governor = governor or default_governor
+        self.model_id = model_id or _model_id_of(model)
+        self.timeout = timeout
+
+    def _wrap(self, result: Any) -> Any:
+        if isinstance(result, Runnable) and not isinstance(result, GovernedChatModel):
+            return GovernedChatModel(result, self.governor, self.model_id, self.timeout)
+        return result
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "GovernedChatModel":
+        return self._wrap(self.model.bind_tools(tools, **kwargs))
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> "GovernedChatModel":
+        return self._wrap(self.model.with_structured_output(schema, **kwargs))
+
+    @property
+    def InputType(self) -> Any:
+        return self.model.InputType
+
+    @property
+    def OutputType(self) -> Any:
+        return self.model.OutputType
+
+    def get_input_schema(self, config: Optional[dict] = None) -> Any:
+        return self.model.get_input_schema(config)
+
+    def get_output_schema(self, config: Optional[dict] = None) -> Any:
+        return self.model.get_output_schema(config)
+
+    def get_name(self, suffix: Optional[str] = None, *, name: Optional[str] = None) -> str:
+        return self.model.get_name(suffix, name=name)
+
+    def invoke(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Any:
+        with self.governor.acquire(self.model_id, _tenant_from_config(config), self.timeout):
+            return self.model.invoke(input, config, **kwargs)
+
+    def stream(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Iterator[Any]:
+        # 스트림이 끝나거나 호출자가 중간에 멈출 때까지 슬롯을 유지
+        with self.governor.acquire(self.model_id, _tenant_from_config(config), self.timeout):
+            yield from self.model.stream(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> Any:
+        async with self.governor.acquire_async(self.model_id, _tenant_from_config(config), self.timeout):
+            return await self.model.ainvoke(input, config, **kwargs)
+
+    async def astream(self, input: Any, config: Optional[dict] = None, **kwargs: Any) -> AsyncIterator[Any]:
+        async with self.governor.acquire_async(self.model_id, _tenant_from_config(config), self.timeout):
+            async for chunk in self.model.astream(input, config, **kwargs):
+                yield chunk
+
+    def __getattr__(self, name: str) -> Any:
+        # model_name 같은 속성은 그대로, 모델 메서드가 돌려주는 Runnable 은 다시 감싸서 governor 를 우회하지 않도록
+        if name == "model":
+            raise AttributeError(name)
+        attr = getattr(self.model, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self._wrap(attr(*args, **kwargs))
+        return call
+
+
+def governed(model: Any, governor: Optional[ModelGovernor] = None,
+             model_id: Optional[str] = None, timeout: Optional[float] = None) -> GovernedChatModel:
+    """채팅 모델을 governor 로 감싸 반환 (기본값: 프로세스 공유 default_governor)"""
+    return GovernedChatModel(model, governor, model_id, timeout)
@@ -0,0 +1,252 @@
+"""
+2단계 검색 파이프라인: 벡터 top-k → 가지치기 → 크로스 인코더 리랭크
+
+벡터 검색 결과는 잡음이 많고, 후보 전부를 bge-reranker-ko 로 점수 매기면 느립니다.
+RerankPipeline 은 단계마다 예산을 두고 후보를 줄여 가며 마지막 단계만 비싼 모델을 씁니다.
+
+1. retrieve: 벡터 검색으로 candidate_k 개 (메타데이터 필터 적용)
+2. prune:    벡터 점수 min_score 미만 제거 → 문자 3-gram 자카드 유사도로 중복 청크 제거
+             → 문서당 max_per_doc 개 → 상위 rerank_k 개만 남김
+3. rerank:   남은 후보만 (질의, 청크) 쌍으로 크로스 인코더에 배치 입력 → 상위 top_n
+             rerank_timeout_ms 를 넘기거나 리랭커가 실패하면 벡터 점수 순서로 대체합니다.
+
+단계별 지연(ms)과 후보 수는 PipelineResult.metadata() 로 상태/실행 메타데이터에 남깁니다.
+
+    pipeline = RerankPipeline(retriever, default_reranker(), PipelineConfig(candidate_k=50, rerank_k=10))
+    result = pipeline.run("LangGraph 체크포인트", where={"source": "학술 자료"})
+    result.hits, result.metadata()
+"""
+
+import os
+import re
+import threading
+import time
+import warnings
+from concurrent.futures import Future, wait
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from graph_utils.batching import MicroBatcher, token_counter
+from graph_utils.retrieval import RetrievedChunk
+
+DEFAULT_RERANKER_MODEL = os.environ.get("RERANKER_MODEL", "dragonkue/bge-reranker-v2-m3-ko")
+
+
+# ========================================
+# 리랭커
+# ========================================
+
+class Reranker(Protocol):
+    """(질의, 청크) 쌍의 관련도 점수. submit 은 청크마다 Future 를 반환"""
+    model_id: str
+
+    def submit(self, query: str, passages: Sequence[str]) -> List["Future[float]"]:
+        ...
+
+
+class CrossEncoderReranker:
+    """sentence-transformers CrossEncoder (동시 호출은 MicroBatcher 로 묶어 한 번에 추론)"""
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_RERANKER_MODEL,
+        device: Optional[str] = None,
+        max_length: int = 512,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+        model: Any = None,
+    ):
+        """
+        Args:
+            model: 이미 불러온 CrossEncoder 호환 객체 (predict(pairs, batch_size=...) 제공). 없으면 model_name 으로 생성
+        """
+        if model is None:
+            from sentence_transformers import CrossEncoder
+
+            model = CrossEncoder(model_name, device=device, max_length=max_length)
+        self.model = model
+        self.model_id = model_name
+        tokens = token_counter(model)
+        self.batcher: MicroBatcher[Tuple[str, str], float] = MicroBatcher(
+            self._predict,
+            max_batch=max_batch,
+            max_wait_ms=max_wait_ms,
+            length=lambda pair: tokens(pair[0]) + tokens(pair[1]),
+            name=f"rerank-{model_name}",
+        )
+
+    def _predict(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        scores = self.model.predict(pairs, batch_size=len(pairs), show_progress_bar=False, convert_to_numpy=True)
+        return np.asarray(scores, dtype=np.float32).reshape(len(pairs)).tolist()
+
+    def submit(self, query: str, passages: Sequence[str]) -> List["Future[float]"]:
+        return [self.batcher.submit((query, passage)) for passage in passages]
+
+
+def _shingles(text: str, n: int = 3) -> frozenset:
+    text = " ".join(text.lower().split())
+    return frozenset(text[i:i + n] for i in range(max(len(text) - n + 1, 1)))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class LexicalReranker:
+    """문자 bigram 겹침 비율로 점수를 매기는 가벼운 리랭커 (모델을 쓸 수 없을 때의 대체)"""
+
+    model_id = "lexical-bigram"
+
+    def submit(self, query: str, passages: Sequence[str]) -> List["Future[float]"]:
+        query_grams = _shingles(re.sub(r"\s+", "", query), n=2)
+        futures = []
+        for passage in passages:
+            future: Future = Future()
+            passage_grams = _shingles(re.sub(r"\s+", "", passage), n=2)
+            future.set_result(len(query_grams & passage_grams) / len(query_grams) if query_grams else 0.0)
+            futures.append(future)
+        return futures
+
+
+_default_reranker: Optional[Reranker] = None
+_default_lock = threading.Lock()
+
+
+def default_reranker() -> Reranker:
+    """프로세스 전체에서 공유하는 기본 리랭커 (처음 호출할 때 한 번만 생성)"""
+    global _default_reranker
+    with _default_lock:
+        if _default_reranker is None:
+            try:
+                _default_reranker = CrossEncoderReranker()
+            except (ImportError, OSError) as e:
+                warnings.warn(
+                    f"리랭커 모델({DEFAULT_RERANKER_MODEL})을 불러올 수 없어 LexicalReranker 를 사용합니다: "
+                    f"{type(e).__name__}.",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+                _default_reranker = LexicalReranker()
+        return _default_reranker
+
+
+# ========================================
+# 파이프라인
+# ========================================
+
+class Retriever(Protocol):
+    def query(self, text: str, k: int = 5, where: Optional[Mapping[str, Any]] = None) -> List[RetrievedChunk]:
+        ...
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """단계별 예산"""
+    candidate_k: int = 50                       # 1단계 벡터 검색 후보 수
+    min_score: float = 0.2                      # 2단계 벡터 점수 하한
+    dedup_threshold: float = 0.9                # 3-gram 자카드 유사도가 이 이상이면 중복으로 보고 제거
+    max_per_doc: Optional[int] = 2              # 같은 doc_id 에서 남길 최대 청크 수
+    rerank_k: int = 20                          # 리랭커에 넘길 최대 후보 수
+    top_n: int = 5                              # 최종 결과 수
+    rerank_timeout_ms: Optional[float] = None   # 리랭크가 이보다 오래 걸리면 벡터 순서로 대체
+
+
+@dataclass
+class PipelineResult:
+    hits: List[RetrievedChunk]
+    timings_ms: Dict[str, float]
+    counts: Dict[str, int]
+    reranked: bool
+
+    def metadata(self) -> Dict[str, Any]:
+        """상태나 실행 메타데이터에 넣을 요약"""
+        return {
+            "timings_ms": {stage: round(ms, 3) for stage, ms in self.timings_ms.items()},
+            "counts": dict(self.counts),
+            "reranked": self.reranked,
+        }
+
+
+def prune(
+    candidates: Sequence[RetrievedChunk],
+    min_score: float,
+    dedup_threshold: float,
+    max_per_doc: Optional[int],
+    limit: int,
+) -> List[RetrievedChunk]:
+    """점수 하한 → 중복 제거 → 문서당 개수 제한 → 상위 limit 개 (입력은 점수 내림차순)
+
+    dedup_threshold 가 1 보다 크면 중복 제거를 건너뜁니다.
+    """
+    dedup = dedup_threshold <= 1.0
+    kept: List[RetrievedChunk] = []
+    kept_shingles: List[frozenset] = []
+    per_doc: Dict[Any, int] = {}
+    for hit in candidates:
+        if len(kept) >= limit:
+            break
+        if hit.score < min_score:
+            continue
+        doc_id = hit.metadata.get("doc_id")
+        if max_per_doc is not None and doc_id is not None and per_doc.get(doc_id, 0) >= max_per_doc:
+            continue
+        if dedup:
+            grams = _shingles(hit.text)
+            if any(jaccard(grams, other) >= dedup_threshold for other in kept_shingles):
+                continue
+            kept_shingles.append(grams)
+        kept.append(hit)
+        if doc_id is not None:
+            per_doc[doc_id] = per_doc.get(doc_id, 0) + 1
+    return kept
+
+
+class RerankPipeline:
+    """벡터 검색 → 가지치기 → 리랭크 3단계 검색"""
+
+    def __init__(self, retriever: Retriever, reranker: Optional[Reranker] = None, config: Optional[PipelineConfig] = None):
+        self.retriever = retriever
+        self.reranker = reranker or default_reranker()
+        self.config = config or PipelineConfig()
+
+    def run(self, query: str, where: Optional[Mapping[str, Any]] = None, **overrides: Any) -> PipelineResult:
+        """overrides 로 이번 실행의 예산만 바꿀 수 있습니다 (예: top_n=3)"""
+        config = replace(self.config, **overrides) if overrides else self.config
+        timings: Dict[str, float] = {}
+
+        start = time.perf_counter()
+        candidates = self.retriever.query(query, k=config.candidate_k, where=where)
+        timings["retrieve"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        survivors = prune(candidates, config.min_score, config.dedup_threshold, config.max_per_doc, config.rerank_k)
+        timings["prune"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        reranked = False
+        hits = survivors[:config.top_n]
+        if survivors:
+            futures = self.reranker.submit(query, [hit.text for hit in survivors])
+            timeout = config.rerank_timeout_ms / 1000 if config.rerank_timeout_ms is not None else None
+            _, not_done = wait(futures, timeout=timeout)
+            if not not_done and not any(future.exception() for future in futures):
+                scored = [
+                    replace(hit, score=float(future.result()), metadata={**hit.metadata, "vector_score": round(hit.score, 4)})
+                    for hit, future in zip(survivors, futures)
+                ]
+                scored.sort(key=lambda hit: hit.score, reverse=True)
+                hits = scored[:config.top_n]
+                reranked = True
+            else:
+                for future in not_done:
+                    future.cancel()
+        timings["rerank"] = (time.perf_counter() - start) * 1000
+        timings["total"] = sum(timings.values())
+
+        counts = {"candidates": len(candidates), "survivors": len(survivors), "returned": len(hits)}
+        return PipelineResult(hits, timings, counts, reranked)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"reranker": self.reranker.model_id, **asdict(self.config)}
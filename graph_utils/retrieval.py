@@ -0,0 +1,231 @@
+"""
+로컬 벡터 검색 (영구 저장 Chroma 컬렉션)
+
+research_node 는 소스마다 "관련 정보 발견" 이라는 문자열만 만들고 실제 자료를 찾지 않습니다.
+ChromaRetriever 는 requirements.txt 의 chromadb 로 디스크에 컬렉션을 두고,
+graph_utils.embeddings 의 인코더로 직접 임베딩을 계산해 넣고 찾습니다.
+
+- ingest(chunks): 청크를 batch_size 단위로 한 번에 인코딩해 upsert (같은 id 는 덮어씀)
+- query(text, k, where): 상위 k 개 청크를 메타데이터 필터와 함께 검색 (예: {"source": "뉴스 기사"})
+- 컬렉션 메타데이터에 인코더 model_id 를 기록해 다른 모델의 벡터와 섞이지 않도록 확인합니다.
+- DocumentTable: Chroma 없이 NumPy 로 검색하는 프로세스 내 인덱스(hybrid_index, quantized_index)가
+  함께 쓰는 문서 보관 + 메타데이터 일치 필터
+
+    retriever = ChromaRetriever("chroma_data", collection="documents")
+    retriever.ingest(chunk_document("doc-1", text, {"source": "학술 자료"}))
+    hits = retriever.query("LangGraph 체크포인트", k=5, where={"source": "학술 자료"})
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from graph_utils.embeddings import Encoder, default_encoder
+
+Metadata = Dict[str, Union[str, int, float, bool]]
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """색인할 문서 조각"""
+    id: str
+    text: str
+    metadata: Metadata = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class RetrievedChunk:
+    """검색 결과. score 는 코사인 유사도 (1 - 코사인 거리)"""
+    id: str
+    text: str
+    score: float
+    metadata: Metadata
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "text": self.text, "score": round(self.score, 4), "metadata": dict(self.metadata)}
+
+
+def chunk_document(
+    doc_id: str,
+    text: str,
+    metadata: Optional[Mapping[str, Any]] = None,
+    size: int = 500,
+    overlap: int = 50,
+) -> List[Chunk]:
+    """문서를 글자 수 기준으로 겹치게 나눔. 청크 id 는 "문서id#순번" 이고 메타데이터에 doc_id 를 넣음"""
+    if overlap >= size:
+        raise ValueError("overlap 은 size 보다 작아야 합니다")
+    base = dict(metadata or {})
+    base["doc_id"] = doc_id
+    chunks = []
+    step = size - overlap
+    for index, start in enumerate(range(0, max(len(text) - overlap, 1), step)):
+        piece = text[start:start + size].strip()
+        if piece:
+            chunks.append(Chunk(f"{doc_id}#{index}", piece, {**base, "chunk": index}))
+    return chunks
+
+
+def _batched(items: Iterable[Chunk], size: int) -> Iterator[List[Chunk]]:
+    batch: List[Chunk] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class DocumentTable:
+    """프로세스 내 인덱스용 문서 번호 → (id, text, metadata) 와 메타데이터 값별 문서 번호 목록"""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._facets: Dict[Tuple[str, Any], List[int]] = {}
+        self._facet_arrays: Dict[Tuple[str, Any], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, ids: Sequence[str], texts: Sequence[str], metadatas: Optional[Sequence[Mapping[str, Any]]]) -> int:
+        """문서를 추가하고 첫 문서 번호를 반환 (이미 있는 id 는 ValueError)"""
+        if len(ids) != len(texts) or (metadatas is not None and len(metadatas) != len(ids)):
+            raise ValueError("ids, texts, metadatas 의 길이가 다릅니다")
+        duplicated = [doc_id for doc_id in ids if doc_id in self._positions]
+        if duplicated or len(set(ids)) != len(ids):
+            raise ValueError(f"이미 있는 문서 id: {duplicated[:5] or '배치 안에서 중복'}")
+        start = len(self.ids)
+        for offset, doc_id in enumerate(ids):
+            metadata = metadatas[offset] if metadatas is not None else {}
+            self._positions[doc_id] = start + offset
+            self.ids.append(doc_id)
+            self.texts.append(texts[offset])
+            self.metadatas.append(metadata)
+            for key, value in metadata.items():
+                self._facets.setdefault((key, value), []).append(start + offset)
+        return start
+
+    def mask(self, where: Optional[Mapping[str, Any]], size: int) -> Optional[np.ndarray]:
+        """where 조건을 만족하는 문서의 bool 마스크 (조건이 없으면 None)"""
+        if not where:
+            return None
+        mask = np.ones(size, dtype=bool)
+        for key, value in where.items():
+            if isinstance(value, Mapping):
+                raise ValueError(f"지원하지 않는 필터 연산: {key}={value} (값 일치만 지원)")
+            matched = np.zeros(size, dtype=bool)
+            positions = self._facet_positions((key, value))
+            matched[positions[:np.searchsorted(positions, size)]] = True
+            mask &= matched
+        return mask
+
+    def _facet_positions(self, facet: Tuple[str, Any]) -> np.ndarray:
+        """값별 문서 번호 배열 (목록이 늘어났을 때만 다시 만듦)"""
+        positions = self._facets.get(facet, [])
+        cached = self._facet_arrays.get(facet)
+        if cached is None or len(cached) != len(positions):
+            cached = self._facet_arrays[facet] = np.asarray(positions, dtype=np.int64)
+        return cached
+
+    def chunk(self, position: int, score: float) -> RetrievedChunk:
+        return RetrievedChunk(self.ids[position], self.texts[position], score, self.metadatas[position])
+
+
+class ChromaRetriever:
+    """영구 저장 Chroma 컬렉션 위의 상위 k 검색기 (임베딩은 encoder 로 직접 계산)"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        collection: str = "documents",
+        encoder: Optional[Encoder] = None,
+        batch_size: int = 256,
+    ):
+        import chromadb
+
+        self.encoder = encoder or default_encoder()
+        self.client = chromadb.PersistentClient(path=str(path))
+        self.collection = self.client.get_or_create_collection(
+            collection,
+            metadata={"hnsw:space": "cosine", "model_id": self.encoder.model_id},
+            embedding_function=None,
+        )
+        model_id = (self.collection.metadata or {}).get("model_id")
+        if model_id != self.encoder.model_id:
+            raise ValueError(f"컬렉션을 만든 모델({model_id})과 인코더({self.encoder.model_id})가 다릅니다")
+        # Chroma 한 번의 요청 크기 제한을 넘지 않도록 배치 크기를 맞춤
+        self.batch_size = min(batch_size, self.client.get_max_batch_size())
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    # ----------------------------------------
+    # 색인
+    # ----------------------------------------
+
+    def ingest(self, chunks: Iterable[Chunk], batch_size: Optional[int] = None) -> int:
+        """청크를 배치 단위로 인코딩해 upsert 하고 넣은 개수를 반환"""
+        total = 0
+        for batch in _batched(chunks, min(batch_size or self.batch_size, self.batch_size)):
+            embeddings = self.encoder.encode([chunk.text for chunk in batch], batch_size=len(batch))
+            self.collection.upsert(
+                ids=[chunk.id for chunk in batch],
+                embeddings=embeddings,
+                documents=[chunk.text for chunk in batch],
+                # Chroma 는 빈 메타데이터를 허용하지 않으므로 None 으로 넘김
+                metadatas=[chunk.metadata or None for chunk in batch],
+            )
+            total += len(batch)
+        return total
+
+    def delete(self, where: Mapping[str, Any]) -> None:
+        """메타데이터 조건에 맞는 청크 삭제 (예: {"doc_id": "doc-1"})"""
+        self.collection.delete(where=dict(where))
+
+    # ----------------------------------------
+    # 검색
+    # ----------------------------------------
+
+    def query_batch(
+        self,
+        texts: Sequence[str],
+        k: int = 5,
+        where: Optional[Mapping[str, Any]] = None,
+        min_score: Optional[float] = None,
+    ) -> List[List[RetrievedChunk]]:
+        """질의 여러 개를 한 번에 인코딩/검색. min_score 보다 낮은 결과는 제외"""
+        if not texts:
+            return []
+        result = self.collection.query(
+            query_embeddings=self.encoder.encode(texts),
+            n_results=k,
+            where=dict(where) if where else None,
+            include=["documents", "metadatas", "distances"],
+        )
+        batches = []
+        for ids, documents, metadatas, distances in zip(
+            result["ids"], result["documents"], result["metadatas"], result["distances"]
+        ):
+            hits = [
+                RetrievedChunk(id_, document, 1.0 - float(distance), dict(metadata or {}))
+                for id_, document, metadata, distance in zip(ids, documents, metadatas, distances)
+            ]
+            if min_score is not None:
+                hits = [hit for hit in hits if hit.score >= min_score]
+            batches.append(hits)
+        return batches
+
+    def query(
+        self,
+        text: str,
+        k: int = 5,
+        where: Optional[Mapping[str, Any]] = None,
+        min_score: Optional[float] = None,
+    ) -> List[RetrievedChunk]:
+        return self.query_batch([text], k=k, where=where, min_score=min_score)[0]
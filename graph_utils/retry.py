@@ -0,0 +1,219 @@
+"""
+노드 실행을 위한 재시도 / 헤징(hedging) 정책
+
+conditional_edge_examples.py 의 LOOP 패턴은 재시도 한 번마다 retry 노드를 거치며
+superstep 과 체크포인트를 하나씩 더 쓰고, langgraph_hil_integrated.py 의
+error_handler_node 는 time.sleep(0.5) 로 워커 스레드를 붙잡습니다.
+
+RetryPolicy 는 노드 함수 자체를 감싸서 한 번의 노드 실행 안에서
+
+- 지수 백오프 + 지터(full jitter) 로 재시도하고 (async 노드에서는 asyncio.sleep 이라 스레드를 막지 않음)
+- 선택적으로, 최근 지연 시간의 p95 가 지나도 응답이 없으면 같은 요청을 하나 더 보내
+  먼저 끝난 쪽을 사용합니다 (hedged request, 꼬리 지연 감소).
+
+    policy = RetryPolicy(max_attempts=3, retry_if=lambda r: "오류" in r["messages"][-1].content)
+    graph.add_node("agent", policy.wrap_async(agent_loop))    # 비동기 노드 (ainvoke 로 실행, 권장)
+    graph.add_node("agent", policy.wrap(agent_loop))          # 동기 노드 (백오프 동안 워커 스레드를 막음)
+
+동기 경로(call / wrap)의 백오프는 time.sleep 이라 그동안 노드를 실행하는 워커 스레드가 묶입니다.
+동시 실행이 많은 서버에서는 wrap_async 를 쓰세요.
+"""
+
+import asyncio
+import contextvars
+import functools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Optional, Tuple, Type
+
+# 헤징용 중복 요청을 실행하는 공유 스레드 풀 (동기 노드용)
+_HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+
+def _is_control_flow(exc: BaseException) -> bool:
+    """interrupt() 등 LangGraph 제어 흐름 예외는 재시도하지 않고 그대로 올려보냄"""
+    try:
+        from langgraph.errors import GraphBubbleUp
+    except ImportError:
+        return False
+    return isinstance(exc, GraphBubbleUp)
+
+
+class LatencyTracker:
+    """최근 성공한 호출의 지연 시간을 모아 분위수를 계산"""
+
+    def __init__(self, window: int = 512):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class RetryPolicy:
+    """
+    재시도 + 헤징 정책
+
+    - max_attempts: 첫 시도를 포함한 최대 시도 횟수
+    - base_delay / max_delay: 백오프 지연은 min(max_delay, base_delay * 2^(n-1)) 범위의 무작위 값 (full jitter)
+    - retry_on: 재시도할 예외 타입들
+    - retry_if: 결과를 보고 재시도 여부를 판단하는 함수 (예: 응답에 "오류"가 있으면 True)
+    - hedge: True 면 hedge_quantile 지연이 지나도 응답이 없을 때 중복 요청을 보냄
+    - hedge_min_samples: 분위수를 믿을 수 있을 만큼 표본이 모이기 전에는 헤징하지 않음
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+    retry_if: Optional[Callable[[Any], bool]] = None
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+    rng: random.Random = field(default_factory=random.Random)
+
+    # ----------------------------------------
+    # 정책 계산
+    # ----------------------------------------
+
+    def backoff_delay(self, attempt: int) -> float:
+        """attempt 번째(1부터) 실패 뒤 기다릴 시간"""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self.rng.uniform(0, cap)
+
+    def hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_quantile)
+
+    def _should_retry_result(self, result: Any) -> bool:
+        return self.retry_if is not None and self.retry_if(result)
+
+    # ----------------------------------------
+    # 동기 실행
+    # ----------------------------------------
+
+    def _timed(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        start = time.monotonic()
+        result = func(*args, **kwargs)
+        self.latency.record(time.monotonic() - start)
+        return result
+
+    def _call_hedged(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._timed(func, *args, **kwargs)
+        # 노드 안의 config contextvar 가 중복 요청 스레드에도 전달되도록 컨텍스트를 복사
+        submit = lambda: _HEDGE_EXECUTOR.submit(contextvars.copy_context().run, self._timed, func, *args, **kwargs)
+        primary = submit()
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        pending = {primary, submit()}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """동기 함수에 정책을 적용해 실행. 백오프 동안에는 호출 스레드가 대기합니다."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = self._call_hedged(func, *args, **kwargs)
+            except self.retry_on as exc:
+                if attempt == self.max_attempts or _is_control_flow(exc):
+                    raise
+            else:
+                if attempt == self.max_attempts or not self._should_retry_result(result):
+                    return result
+            time.sleep(self.backoff_delay(attempt))
+        raise AssertionError("unreachable")
+
+    # ----------------------------------------
+    # 비동기 실행 (워커 스레드를 막지 않음)
+    # ----------------------------------------
+
+    async def _atimed(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        start = time.monotonic()
+        if asyncio.iscoroutinefunction(func):
+            result = await func(*args, **kwargs)
+        else:
+            result = await asyncio.to_thread(func, *args, **kwargs)
+        self.latency.record(time.monotonic() - start)
+        return result
+
+    async def _acall_hedged(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._atimed(func, *args, **kwargs)
+        primary = asyncio.ensure_future(self._atimed(func, *args, **kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        pending = {primary, asyncio.ensure_future(self._atimed(func, *args, **kwargs))}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def acall(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """비동기 실행. 백오프는 asyncio.sleep 이므로 이벤트 루프/스레드를 막지 않습니다."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = await self._acall_hedged(func, *args, **kwargs)
+            except self.retry_on as exc:
+                if attempt == self.max_attempts or _is_control_flow(exc):
+                    raise
+            else:
+                if attempt == self.max_attempts or not self._should_retry_result(result):
+                    return result
+            await asyncio.sleep(self.backoff_delay(attempt))
+        raise AssertionError("unreachable")
+
+    # ----------------------------------------
+    # 노드 래퍼
+    # ----------------------------------------
+
+    def wrap(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """노드 함수를 정책이 적용된 동기 노드로 감쌈 (백오프 동안 워커 스레드를 막으므로 가능하면 wrap_async)"""
+        @functools.wraps(func)
+        def node(*args: Any, **kwargs: Any) -> Any:
+            return self.call(func, *args, **kwargs)
+        return node
+
+    def wrap_async(self, func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+        """노드 함수를 정책이 적용된 비동기 노드로 감쌈 (그래프는 ainvoke/astream 으로 실행)"""
+        @functools.wraps(func)
+        async def node(*args: Any, **kwargs: Any) -> Any:
+            return await self.acall(func, *args, **kwargs)
+        return node
@@ -0,0 +1,178 @@
+"""
+한 번의 실행으로 스트리밍 이벤트와 최종 상태를 함께 얻는 러너
+
+app.stream() 으로 중간 과정을 출력한 뒤 app.invoke() 로 최종 상태를 다시 구하면
+LLM 호출과 Tool 실행이 모두 두 번 일어납니다. GraphRun 은 내부적으로 "values"
+모드를 함께 구독해서, 같은 실행에서 나온 마지막 values 청크를 최종 상태로 보관합니다.
+
+    run = GraphRun(app, {"messages": [HumanMessage(content="국어 85")]})
+    for event in run:
+        print(event)
+    print(run.final_state["messages"][-1].content)
+"""
+
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Sequence, Union
+
+StreamMode = Union[str, Sequence[str]]
+
+INTERRUPT_KEY = "__interrupt__"
+
+
+def _normalize_modes(stream_mode: StreamMode) -> List[str]:
+    """stream_mode 를 중복 없는 리스트로 정리"""
+    modes = [stream_mode] if isinstance(stream_mode, str) else list(stream_mode)
+    if not modes:
+        raise ValueError("stream_mode 가 비어 있습니다")
+    return list(dict.fromkeys(modes))
+
+
+class GraphRun:
+    """
+    그래프를 한 번만 실행하면서 이벤트를 흘려보내고 최종 상태를 모으는 실행 단위
+
+    - stream_mode: 호출자가 받고 싶은 모드 ("updates", "values", "messages", "custom", "debug")
+      문자열 하나면 청크만, 여러 개면 (mode, chunk) 튜플을 돌려줍니다 (app.stream 과 동일한 규칙).
+    - final_state: 반복이 끝난 뒤 읽을 수 있는 최종 상태. interrupt 로 멈췄다면
+      app.invoke() 와 같이 "__interrupt__" 키에 Interrupt 목록이 담깁니다.
+    - 한 GraphRun 은 한 번만 반복할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        graph_input: Any,
+        config: Optional[dict] = None,
+        stream_mode: StreamMode = "updates",
+        **stream_kwargs: Any,
+    ):
+        self.app = app
+        self.graph_input = graph_input
+        self.config = config
+        self.modes = _normalize_modes(stream_mode)
+        self._single_mode = isinstance(stream_mode, str)
+        self.stream_kwargs = stream_kwargs
+
+        self._final_state: Optional[dict] = None
+        self._interrupts: List[Any] = []
+        self._started = False
+        self._finished = False
+
+    # ----------------------------------------
+    # 내부 처리
+    # ----------------------------------------
+
+    def _internal_modes(self) -> List[str]:
+        # 최종 상태(values)와 interrupt 감지(updates)는 사용자가 요청하지 않아도 구독
+        return list(dict.fromkeys(self.modes + ["values", "updates"]))
+
+    def _start(self) -> None:
+        if self._started:
+            raise RuntimeError("GraphRun 은 한 번만 실행할 수 있습니다. 새 GraphRun 을 만드세요.")
+        self._started = True
+
+    def _consume(self, mode: str, chunk: Any) -> Optional[Any]:
+        """내부 청크를 기록하고, 호출자에게 넘길 이벤트(없으면 None)를 돌려줌"""
+        if mode == "values" and isinstance(chunk, dict):
+            self._final_state = chunk
+        elif mode == "updates" and isinstance(chunk, dict) and INTERRUPT_KEY in chunk:
+            self._interrupts.extend(chunk[INTERRUPT_KEY])
+
+        if mode not in self.modes:
+            return None
+        return chunk if self._single_mode else (mode, chunk)
+
+    def _finish(self) -> None:
+        self._finished = True
+
+    # ----------------------------------------
+    # 동기 / 비동기 반복
+    # ----------------------------------------
+
+    def __iter__(self) -> Iterator[Any]:
+        self._start()
+        for mode, chunk in self.app.stream(
+            self.graph_input,
+            self.config,
+            stream_mode=self._internal_modes(),
+            **self.stream_kwargs,
+        ):
+            event = self._consume(mode, chunk)
+            if event is not None:
+                yield event
+        self._finish()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        self._start()
+        async for mode, chunk in self.app.astream(
+            self.graph_input,
+            self.config,
+            stream_mode=self._internal_modes(),
+            **self.stream_kwargs,
+        ):
+            event = self._consume(mode, chunk)
+            if event is not None:
+                yield event
+        self._finish()
+
+    # ----------------------------------------
+    # 결과 조회
+    # ----------------------------------------
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    @property
+    def interrupts(self) -> List[Any]:
+        return list(self._interrupts)
+
+    @property
+    def final_state(self) -> dict:
+        """app.invoke() 가 돌려주는 것과 같은 형태의 최종 상태"""
+        if not self._finished:
+            raise RuntimeError("아직 실행이 끝나지 않았습니다. 먼저 이벤트를 끝까지 반복하세요.")
+        state = dict(self._final_state or {})
+        if self._interrupts:
+            state[INTERRUPT_KEY] = list(self._interrupts)
+        return state
+
+    def run(self, on_event: Optional[Callable[[Any], None]] = None) -> dict:
+        """이벤트마다 on_event 를 호출하며 끝까지 실행하고 최종 상태를 반환"""
+        for event in self:
+            if on_event is not None:
+                on_event(event)
+        return self.final_state
+
+    async def arun(self, on_event: Optional[Callable[[Any], Any]] = None) -> dict:
+        """run() 의 비동기 버전. on_event 가 코루틴 함수여도 됩니다."""
+        async for event in self:
+            if on_event is not None:
+                result = on_event(event)
+                if hasattr(result, "__await__"):
+                    await result
+        return self.final_state
+
+
+def stream_and_collect(
+    app: Any,
+    graph_input: Any,
+    config: Optional[dict] = None,
+    stream_mode: StreamMode = "updates",
+    on_event: Optional[Callable[[Any], None]] = None,
+    **stream_kwargs: Any,
+) -> dict:
+    """스트리밍 이벤트를 on_event 로 넘기면서 한 번 실행하고 최종 상태를 반환"""
+    return GraphRun(app, graph_input, config, stream_mode, **stream_kwargs).run(on_event)
+
+
+async def astream_and_collect(
+    app: Any,
+    graph_input: Any,
+    config: Optional[dict] = None,
+    stream_mode: StreamMode = "updates",
+    on_event: Optional[Callable[[Any], Any]] = None,
+    **stream_kwargs: Any,
+) -> dict:
+    """stream_and_collect() 의 비동기 버전 (HTTP 엔드포인트 등에서 사용)"""
+    return await GraphRun(app, graph_input, config, stream_mode, **stream_kwargs).arun(on_event)
+
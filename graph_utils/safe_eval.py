@@ -0,0 +1,177 @@
+"""
+eval() 을 대신하는 안전한 산술식 평가기
+
+calculate Tool 은 모델이 만든 문자열을 그대로 eval(expression) 합니다.
+"__import__('os').system(...)" 같은 입력이 실행될 수 있고, 같은 수식도 매번 다시 파싱합니다.
+
+compile_expression() 은
+
+1. ast.parse 결과를 허용된 노드(숫자, 사칙연산/거듭제곱/나머지, 단항 부호, 허용된 함수와 변수)만
+   있는지 검사하고,
+2. 거듭제곱을 크기 제한이 있는 _safe_pow 호출로 바꾼 뒤 code 객체로 한 번만 컴파일하며,
+3. 수식 텍스트를 키로 LRU 캐시에 보관합니다.
+
+스칼라 평가 결과는 파이썬 eval 과 같고, NumPy 배열을 변수로 넘기면 벡터화 평가가 됩니다.
+
+    safe_eval("10 + 5 * 2")                       # 20
+    evaluate_many("a * 2 + b", a=np.arange(5), b=1)  # array([1, 3, 5, 7, 9])
+"""
+
+import ast
+import math
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet
+
+try:
+    import numpy as np
+except ImportError:  # 벡터화 평가를 쓰지 않으면 NumPy 는 필요 없음
+    np = None
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_POW_EXPONENT = 10_000
+MAX_POW_BASE_DIGITS = 1_000
+
+_BINARY_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub)
+
+# 허용된 함수: 스칼라 구현 / NumPy 구현
+_SCALAR_FUNCTIONS: Dict[str, Any] = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "sqrt": math.sqrt,
+}
+_VECTOR_FUNCTION_NAMES = {
+    "abs": "abs",
+    "min": "minimum",
+    "max": "maximum",
+    "round": "round",
+    "sqrt": "sqrt",
+}
+
+
+class UnsafeExpressionError(ValueError):
+    """허용되지 않은 구문이 포함된 수식"""
+
+
+def _safe_pow(base: Any, exponent: Any) -> Any:
+    """지수/밑이 지나치게 커서 계산이 멈추는 것(예: 9**9**9)을 막는 거듭제곱"""
+    if np is not None and (isinstance(base, np.ndarray) or isinstance(exponent, np.ndarray)):
+        return np.power(base, exponent)
+    if isinstance(exponent, int) and isinstance(base, int):
+        if abs(exponent) > MAX_POW_EXPONENT and abs(base) > 1:
+            raise OverflowError("지수가 너무 큽니다")
+        if abs(base).bit_length() * max(exponent, 0) > MAX_POW_EXPONENT * MAX_POW_BASE_DIGITS:
+            raise OverflowError("결과가 너무 큽니다")
+    return base ** exponent
+
+
+class _Validator(ast.NodeVisitor):
+    """허용된 노드만 있는지 검사하고 사용된 변수 이름을 모음"""
+
+    def __init__(self):
+        self.names: set = set()
+
+    def generic_visit(self, node: ast.AST) -> None:
+        raise UnsafeExpressionError(f"허용되지 않은 구문: {type(node).__name__}")
+
+    def visit_Expression(self, node: ast.Expression) -> None:
+        self.visit(node.body)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise UnsafeExpressionError(f"허용되지 않은 상수: {node.value!r}")
+
+    def visit_BinOp(self, node: ast.BinOp) -> None:
+        if not isinstance(node.op, _BINARY_OPS):
+            raise UnsafeExpressionError(f"허용되지 않은 연산자: {type(node.op).__name__}")
+        self.visit(node.left)
+        self.visit(node.right)
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> None:
+        if not isinstance(node.op, _UNARY_OPS):
+            raise UnsafeExpressionError(f"허용되지 않은 연산자: {type(node.op).__name__}")
+        self.visit(node.operand)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id.startswith("_"):
+            raise UnsafeExpressionError(f"허용되지 않은 이름: {node.id}")
+        self.names.add(node.id)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if not isinstance(node.func, ast.Name) or node.func.id not in _SCALAR_FUNCTIONS:
+            raise UnsafeExpressionError("허용되지 않은 함수 호출")
+        if node.keywords:
+            raise UnsafeExpressionError("키워드 인자는 허용되지 않습니다")
+        for arg in node.args:
+            self.visit(arg)
+
+
+class _PowRewriter(ast.NodeTransformer):
+    """a ** b → _safe_pow(a, b)"""
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            call = ast.Call(func=ast.Name(id="_safe_pow", ctx=ast.Load()), args=[node.left, node.right], keywords=[])
+            return ast.copy_location(call, node)
+        return node
+
+
+class CompiledExpression:
+    """검증과 컴파일을 마친 수식. 여러 번 평가해도 다시 파싱하지 않습니다."""
+
+    __slots__ = ("text", "code", "variables")
+
+    def __init__(self, text: str, code: Any, variables: FrozenSet[str]):
+        self.text = text
+        self.code = code
+        self.variables = variables
+
+    def _namespace(self, functions: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+        missing = self.variables - set(values) - set(functions)
+        if missing:
+            raise NameError(f"정의되지 않은 변수: {', '.join(sorted(missing))}")
+        namespace = {"__builtins__": {}, "_safe_pow": _safe_pow}
+        namespace.update(functions)
+        namespace.update(values)
+        return namespace
+
+    def __call__(self, **values: Any) -> Any:
+        """스칼라 평가 (파이썬 eval 과 같은 결과)"""
+        return eval(self.code, self._namespace(_SCALAR_FUNCTIONS, values))
+
+    def evaluate_many(self, **arrays: Any) -> Any:
+        """NumPy 배열(또는 스칼라)을 변수로 받아 벡터화 평가"""
+        if np is None:
+            raise ImportError("벡터화 평가에는 numpy 가 필요합니다")
+        functions = {name: getattr(np, np_name) for name, np_name in _VECTOR_FUNCTION_NAMES.items()}
+        values = {k: np.asarray(v) for k, v in arrays.items()}
+        return eval(self.code, self._namespace(functions, values))
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(text: str) -> CompiledExpression:
+    """수식을 검증/컴파일 (텍스트 기준 LRU 캐시)"""
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise UnsafeExpressionError("수식이 너무 깁니다")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise UnsafeExpressionError(f"수식 구문 오류: {e.msg}") from None
+    validator = _Validator()
+    validator.visit(tree)
+    tree = ast.fix_missing_locations(_PowRewriter().visit(tree))
+    code = compile(tree, "<expression>", "eval")
+    return CompiledExpression(text, code, frozenset(validator.names))
+
+
+def safe_eval(text: str, **values: Any) -> Any:
+    """eval(text) 대신 사용하는 안전한 스칼라 평가"""
+    return compile_expression(text)(**values)
+
+
+def evaluate_many(text: str, **arrays: Any) -> Any:
+    """같은 수식을 NumPy 배열 전체에 대해 한 번에 평가"""
+    return compile_expression(text).evaluate_many(**arrays)
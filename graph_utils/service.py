@@ -0,0 +1,568 @@
+"""
+컴파일된 그래프를 HTTP 로 노출하는 FastAPI 서비스 계층
+
+예제 그래프는 모듈 안의 app.invoke() 나 input() 반복문으로만 실행할 수 있습니다.
+GraphRegistry 에 이름으로 그래프를 등록하고 create_app() 으로 서비스 앱을 만들면
+thread_id 단위 세션으로 invoke / stream / resume 을 호출할 수 있습니다.
+
+- 그래프는 이름 → GraphSpec. 상태가 있는 그래프(HIL 등)는 factory(checkpointer) 로 등록해
+  서비스 전체가 공유하는 체크포인터 하나로 컴파일합니다 (요청마다 새로 만들지 않음).
+- 모든 실행은 app.ainvoke / app.astream (비동기). 동기 노드는 LangGraph 가 스레드 풀에서 실행합니다.
+- 같은 thread_id 로 동시에 들어온 요청은 스레드별 asyncio.Lock 으로 순서대로 실행해
+  체크포인트가 서로 덮어쓰지 않도록 합니다. 다른 thread_id 끼리는 병렬입니다.
+- 응답은 orjson 으로 직렬화합니다 (메시지, Interrupt 등은 to_jsonable 로 변환).
+- coalesce=True 면 상태 없는 그래프에 같은 입력의 invoke 가 동시에 몰릴 때 한 번만 실행하고
+  결과를 나눠 줍니다 (InvocationCoalescer, 선택적으로 result_ttl 동안 결과 재사용).
+- 클라이언트 config 는 configurable 의 사용자 키와 상한이 있는 recursion_limit 만 받습니다 (client_config).
+  잘못된 입력 / config (그래프 입력 검증 오류 포함) 는 422 로 응답합니다.
+
+엔드포인트
+    GET  /health
+    GET  /graphs
+    POST /graphs/{name}/invoke                      {"input": ..., "thread_id": ..., "config": {...}}
+    POST /graphs/{name}/stream                      위 + "stream_mode" → NDJSON 한 줄에 이벤트 하나
+    GET|POST /graphs/{name}/sse                     Server-Sent Events (연결별 제한 큐 + keepalive)
+    WS   /graphs/{name}/ws                          요청 JSON 을 보낼 때마다 이벤트를 push (같은 큐 정책)
+         /graphs/{name}/ws?thread_id=...            소켓을 thread 하나에 고정 (워커 라우터가 이 값으로 워커를 고름)
+    WS   /graphs/{name}/hil                         HIL 세션 (새 thread). interrupt push + 같은 소켓으로 resume
+    WS   /graphs/{name}/threads/{thread_id}/hil     기존 thread 에 재접속 (대기 중인 interrupt 를 바로 받음)
+    POST /graphs/{name}/threads/{thread_id}/resume  {"resume": ...}  (Command(resume=...) 로 재개)
+    GET  /graphs/{name}/threads/{thread_id}         현재 상태와 대기 중인 interrupt
+
+    registry = GraphRegistry()
+    registry.register("sequential", basic_sequential.app)
+    registry.register_factory("document", create_document_assistant, description="문서 작성 HIL")
+    app = create_app(registry)          # uvicorn.run(app)
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import time
+import uuid
+import weakref
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, Optional, Tuple, Union
+
+import orjson
+from langgraph.errors import EmptyInputError, InvalidUpdateError
+from langgraph.types import Command
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from graph_utils.memo import canonical_key
+from graph_utils.runner import INTERRUPT_KEY, GraphRun
+from graph_utils.ttl_cache import TTLCache
+
+# ========================================
+# 직렬화
+# ========================================
+
+
+def to_jsonable(value: Any) -> Any:
+    """orjson 이 바로 처리하지 못하는 객체(메시지, Interrupt, pydantic 모델 등)를 변환"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return repr(value)
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=to_jsonable, option=orjson.OPT_NON_STR_KEYS)
+
+
+def split_interrupts(state: Any) -> Tuple[Any, List[Any]]:
+    """ainvoke 결과에서 "__interrupt__" 를 떼어 (상태, interrupt 목록) 으로"""
+    if isinstance(state, dict) and INTERRUPT_KEY in state:
+        state = dict(state)
+        return state, list(state.pop(INTERRUPT_KEY))
+    return state, []
+
+
+def stream_event(mode: str, chunk: Any) -> Dict[str, Any]:
+    """(mode, 청크) → {"event": mode, "data": 청크}. messages 는 {"node": 노드 이름, "message": 청크} 로 줄임"""
+    if mode == "messages":
+        message, metadata = chunk
+        chunk = {"node": metadata.get("langgraph_node"), "message": message}
+    return {"event": mode, "data": chunk}
+
+
+# ========================================
+# 그래프 등록
+# ========================================
+
+@dataclass
+class GraphSpec:
+    name: str
+    app: Any
+    stateful: bool
+    description: str = ""
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, "stateful": self.stateful, "description": self.description}
+
+
+class GraphRegistry:
+    """이름 → 컴파일된 그래프. 상태 있는 그래프는 공유 체크포인터로 컴파일"""
+
+    def __init__(self, checkpointer: Any = None):
+        """
+        Args:
+            checkpointer: register_factory 로 등록하는 그래프가 함께 쓸 체크포인터 (기본: InMemorySaver)
+        """
+        if checkpointer is None:
+            from langgraph.checkpoint.memory import InMemorySaver
+
+            checkpointer = InMemorySaver()
+        self.checkpointer = checkpointer
+        self._specs: Dict[str, GraphSpec] = {}
+
+    def register(self, name: str, app: Any, description: str = "") -> GraphSpec:
+        """이미 컴파일된 그래프를 등록 (체크포인터가 있으면 thread_id 세션을 사용)"""
+        if name in self._specs:
+            raise ValueError(f"이미 등록된 그래프: {name}")
+        spec = GraphSpec(name, app, getattr(app, "checkpointer", None) is not None, description)
+        self._specs[name] = spec
+        return spec
+
+    def register_factory(self, name: str, factory: Callable[[Any], Any], description: str = "") -> GraphSpec:
+        """factory(checkpointer) → 컴파일된 그래프. 등록할 때 한 번만 호출"""
+        return self.register(name, factory(self.checkpointer), description)
+
+    def get(self, name: str) -> GraphSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(name)
+        return spec
+
+    def __iter__(self):
+        return iter(self._specs.values())
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+
+@contextlib.asynccontextmanager
+async def sqlite_checkpointer(path: str, timeout: float = 30.0) -> AsyncIterator[Any]:
+    """여러 프로세스가 함께 쓰는 SQLite 체크포인터 (WAL, 실행 중인 이벤트 루프 안에서 열어야 함)
+
+    WAL 모드라 읽기는 쓰기를 막지 않고, 쓰기끼리는 SQLite 파일 잠금으로 직렬화됩니다.
+    다른 프로세스가 쓰는 중이면 timeout 초까지 기다립니다 (busy timeout).
+    langgraph-checkpoint-sqlite / aiosqlite 가 필요합니다.
+
+        async with sqlite_checkpointer("checkpoints.sqlite") as checkpointer:
+            app = create_app(build_registry(checkpointer))
+    """
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    async with aiosqlite.connect(path, timeout=timeout) as conn:
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        checkpointer = AsyncSqliteSaver(conn)
+        await checkpointer.setup()
+        yield checkpointer
+
+
+class ThreadLocks:
+    """(그래프, thread_id) 별 asyncio.Lock. 사용하는 요청이 없어지면 자동으로 정리"""
+
+    def __init__(self):
+        self._locks: "weakref.WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def get(self, graph: str, thread_id: str) -> asyncio.Lock:
+        key = (graph, thread_id)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+# ========================================
+# 동일 요청 합치기
+# ========================================
+
+# 실행 결과에 영향을 주는 config 항목 (callbacks / tags / metadata 등 추적용 항목은 키에서 제외)
+COALESCE_CONFIG_KEYS = ("configurable", "recursion_limit")
+
+
+def invocation_key(name: str, graph_input: Any, config: Dict[str, Any]) -> str:
+    """(그래프, 입력, 결과에 영향을 주는 config) 의 정규화된 해시"""
+    relevant = {key: config[key] for key in COALESCE_CONFIG_KEYS if config.get(key)}
+    return canonical_key({"graph": name, "input": graph_input, "config": relevant})
+
+
+class InvocationCoalescer:
+    """상태 없는 그래프의 동일한 동시 invoke 를 한 번의 실행으로 합침 (TTLCache 의 single-flight 사용)
+
+    같은 키의 실행이 진행 중이면 새 요청은 그 결과를 함께 기다립니다. result_ttl 초 동안은
+    끝난 결과를 그대로 돌려줍니다 (0 이면 진행 중인 실행만 공유). 예외는 공유하되 저장하지 않습니다.
+    합쳐진 호출자들은 같은 상태 객체를 받으므로 결과를 수정하지 말아야 합니다.
+    """
+
+    def __init__(self, result_ttl: float = 0.0, maxsize: int = 1024):
+        self.cache = TTLCache(self._run, ttl=result_ttl, maxsize=maxsize,
+                              key=lambda spec, graph_input, config: invocation_key(spec.name, graph_input, config))
+
+    @staticmethod
+    async def _run(spec: "GraphSpec", graph_input: Any, config: Dict[str, Any]) -> Any:
+        return await spec.app.ainvoke(graph_input, config)
+
+    async def ainvoke(self, spec: "GraphSpec", graph_input: Any, config: Dict[str, Any]) -> Any:
+        if spec.stateful:
+            raise ValueError(f"{spec.name} 은 thread 상태가 있는 그래프라 요청을 합칠 수 없습니다")
+        return await self.cache.aget(spec, graph_input, config)
+
+    def stats(self) -> Dict[str, Any]:
+        """misses = 실제 실행 수, coalesced = 진행 중인 실행에 합류한 수, hits = result_ttl 안에서 재사용한 수"""
+        return self.cache.stats.snapshot()
+
+
+# ========================================
+# 요청 / 실행
+# ========================================
+
+# 클라이언트가 바꿀 수 없는 configurable 키 (체크포인트 위치는 서버가 thread_id 로 정함)
+RESERVED_CONFIGURABLE_KEYS = frozenset({"thread_id", "checkpoint_id", "checkpoint_ns", "checkpoint_map"})
+MAX_RECURSION_LIMIT = 100
+
+
+class InvalidRequest(ValueError):
+    """클라이언트가 보낸 입력이나 config 가 잘못됨 (HTTP 422)"""
+
+
+# 그래프가 실행 전에 입력을 검증하다 내는 오류: 서버 오류(500)가 아니라 잘못된 요청(422)
+CLIENT_ERRORS = (InvalidRequest, EmptyInputError, InvalidUpdateError, ValidationError)
+
+
+def client_config(config: Optional[Dict[str, Any]], max_recursion_limit: int = MAX_RECURSION_LIMIT) -> Dict[str, Any]:
+    """클라이언트 config 에서 허용하는 항목만 검증해 반환
+
+    configurable 의 사용자 키(예약 키와 "__" 로 시작하는 내부 키 제외)와 1 ~ max_recursion_limit 의
+    recursion_limit 만 받습니다. callbacks / tags / 체크포인트 위치 등은 받지 않습니다.
+    """
+    if not config:
+        return {}
+    if not isinstance(config, dict):
+        raise InvalidRequest("config 는 JSON 객체여야 합니다")
+    unknown = sorted(set(config) - {"configurable", "recursion_limit"})
+    if unknown:
+        raise InvalidRequest(f"허용하지 않는 config 항목: {unknown} (configurable, recursion_limit 만 가능)")
+    result: Dict[str, Any] = {}
+    configurable = config.get("configurable") or {}
+    if not isinstance(configurable, dict):
+        raise InvalidRequest("config.configurable 은 JSON 객체여야 합니다")
+    reserved = sorted(key for key in configurable if key in RESERVED_CONFIGURABLE_KEYS or key.startswith("__"))
+    if reserved:
+        raise InvalidRequest(f"config.configurable 에 서버가 정하는 키가 있습니다: {reserved}")
+    if configurable:
+        result["configurable"] = dict(configurable)
+    if "recursion_limit" in config:
+        limit = config["recursion_limit"]
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= max_recursion_limit:
+            raise InvalidRequest(f"recursion_limit 은 1 ~ {max_recursion_limit} 의 정수여야 합니다")
+        result["recursion_limit"] = limit
+    return result
+
+
+class InvokeRequest(BaseModel):
+    input: Any = None
+    thread_id: Optional[str] = None
+    config: Dict[str, Any] = Field(default_factory=dict)
+
+    @field_validator("config")
+    @classmethod
+    def _client_config(cls, config: Dict[str, Any]) -> Dict[str, Any]:
+        return client_config(config)
+
+
+class StreamRequest(InvokeRequest):
+    stream_mode: Union[str, List[str]] = "updates"
+    # SSE / WebSocket 전용: 연결별 큐 정책과 크기 (없으면 서버 기본값)
+    policy: Optional[Literal["block", "drop_oldest", "drop_newest", "coalesce"]] = None
+    queue_size: Optional[int] = Field(default=None, ge=1, le=65536)
+
+
+class ResumeRequest(BaseModel):
+    resume: Any = None
+    config: Dict[str, Any] = Field(default_factory=dict)
+
+    @field_validator("config")
+    @classmethod
+    def _client_config(cls, config: Dict[str, Any]) -> Dict[str, Any]:
+        return client_config(config)
+
+
+class NoPendingInterrupt(RuntimeError):
+    """resume 요청을 받았지만 thread 가 interrupt 로 멈춰 있지 않음"""
+
+
+class GraphService:
+    """등록된 그래프의 실행 (HTTP 와 무관한 부분. 스트리밍 채널 등에서도 재사용)"""
+
+    def __init__(self, registry: GraphRegistry, coalesce: bool = False, result_ttl: float = 0.0):
+        """
+        Args:
+            coalesce: 상태 없는 그래프의 동일한 동시 invoke 를 한 번의 실행으로 합침 (InvocationCoalescer)
+            result_ttl: coalesce 일 때 끝난 결과를 재사용할 시간(초). 0 이면 진행 중인 실행만 공유
+        """
+        self.registry = registry
+        self.locks = ThreadLocks()
+        self.coalescer = InvocationCoalescer(result_ttl) if coalesce else None
+
+    def prepare(self, name: str, thread_id: Optional[str], config: Optional[Dict[str, Any]] = None) -> Tuple[GraphSpec, Optional[str], Dict[str, Any]]:
+        """그래프와 실행 config 준비. 상태 있는 그래프는 thread_id 가 없으면 새로 발급"""
+        spec = self.registry.get(name)
+        config = dict(config or {})
+        if spec.stateful:
+            thread_id = thread_id or uuid.uuid4().hex
+            config["configurable"] = {**config.get("configurable", {}), "thread_id": thread_id}
+        else:
+            thread_id = None
+        return spec, thread_id, config
+
+    def lock(self, spec: GraphSpec, thread_id: Optional[str]):
+        return self.locks.get(spec.name, thread_id) if thread_id else contextlib.nullcontext()
+
+    async def invoke(self, name: str, graph_input: Any, thread_id: Optional[str] = None,
+                     config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        spec, thread_id, config = self.prepare(name, thread_id, config)
+        start = time.perf_counter()
+        if self.coalescer is not None and not spec.stateful:
+            state = await self.coalescer.ainvoke(spec, graph_input, config)
+        else:
+            async with self.lock(spec, thread_id):
+                state = await spec.app.ainvoke(graph_input, config)
+        return self._result(name, thread_id, state, start)
+
+    async def resume(self, name: str, thread_id: str, value: Any,
+                     config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """대기 중인 interrupt 에 value 를 넘겨 재개 (없으면 NoPendingInterrupt)"""
+        spec, thread_id, config = self.prepare(name, thread_id, config)
+        if not spec.stateful:
+            raise LookupError(f"{name} 은 상태를 저장하지 않는 그래프입니다")
+        start = time.perf_counter()
+        async with self.lock(spec, thread_id):
+            if not await self.pending_interrupts(spec, config):
+                raise NoPendingInterrupt(f"thread {thread_id} 에 재개할 interrupt 가 없습니다")
+            state = await spec.app.ainvoke(Command(resume=value), config)
+        return self._result(name, thread_id, state, start)
+
+    @staticmethod
+    def _result(name: str, thread_id: Optional[str], state: Any, start: float) -> Dict[str, Any]:
+        state, interrupts = split_interrupts(state)
+        return {
+            "graph": name,
+            "thread_id": thread_id,
+            "state": state,
+            "interrupts": interrupts,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    async def stream(self, name: str, graph_input: Any, thread_id: Optional[str] = None,
+                     config: Optional[Dict[str, Any]] = None,
+                     stream_mode: Union[str, List[str]] = "updates") -> AsyncIterator[Dict[str, Any]]:
+        """{"event": "start"} → {"event": mode, "data": 청크}... → {"event": "end", "interrupts": [...]}
+
+        messages 모드의 (메시지 청크, 메타데이터) 는 {"node": 노드 이름, "message": 청크} 로 줄여서 보냅니다.
+        """
+        spec, thread_id, config = self.prepare(name, thread_id, config)
+        modes = [stream_mode] if isinstance(stream_mode, str) else list(stream_mode)
+        yield {"event": "start", "graph": name, "thread_id": thread_id}
+        async with self.lock(spec, thread_id):
+            run = GraphRun(spec.app, graph_input, config, stream_mode=modes)
+            async for mode, chunk in run:
+                yield stream_event(mode, chunk)
+        yield {"event": "end", "thread_id": thread_id, "interrupts": run.interrupts}
+
+    async def state(self, name: str, thread_id: str) -> Dict[str, Any]:
+        spec, thread_id, config = self.prepare(name, thread_id)
+        if not spec.stateful:
+            raise LookupError(f"{name} 은 상태를 저장하지 않는 그래프입니다")
+        snapshot = await spec.app.aget_state(config)
+        return {
+            "graph": name,
+            "thread_id": thread_id,
+            "values": snapshot.values,
+            "next": list(snapshot.next),
+            "interrupts": [item for task in snapshot.tasks for item in task.interrupts],
+        }
+
+    async def pending_interrupts(self, spec: GraphSpec, config: Dict[str, Any]) -> List[Any]:
+        snapshot = await spec.app.aget_state(config)
+        return [item for task in snapshot.tasks for item in task.interrupts]
+
+
+# ========================================
+# FastAPI 앱
+# ========================================
+
+def create_app(
+    registry: GraphRegistry,
+    title: str = "LangGraph 서비스",
+    stream_queue_size: int = 256,
+    stream_policy: str = "coalesce",
+    heartbeat_s: float = 15.0,
+    coalesce: bool = False,
+    result_ttl: float = 0.0,
+):
+    """GraphRegistry 의 그래프를 노출하는 FastAPI 앱
+
+    Args:
+        stream_queue_size / stream_policy: SSE / WebSocket 연결별 이벤트 큐 기본값 (graph_utils.event_stream)
+        heartbeat_s: 보낼 이벤트가 없을 때 keepalive 를 보내는 간격
+        coalesce / result_ttl: 상태 없는 그래프의 동일한 동시 invoke 합치기 (GraphService 참고)
+    """
+    from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+    from fastapi.responses import Response, StreamingResponse
+
+    from graph_utils.event_stream import EventQueue, drain, sse_frames
+    from graph_utils.hil_channel import HILSession
+
+    service = GraphService(registry, coalesce, result_ttl)
+    app = FastAPI(title=title)
+    app.state.service = service
+
+    def json_response(content: Any, status_code: int = 200) -> Response:
+        return Response(dumps(content), status_code=status_code, media_type="application/json")
+
+    async def client_error(request: Any, exc: Exception) -> Response:
+        return json_response({"detail": str(exc), "error": type(exc).__name__}, 422)
+
+    for error in CLIENT_ERRORS:
+        app.add_exception_handler(error, client_error)
+
+    def spec_or_404(name: str) -> GraphSpec:
+        try:
+            return registry.get(name)
+        except KeyError:
+            raise HTTPException(404, f"등록되지 않은 그래프: {name}") from None
+
+    @app.get("/health")
+    async def health():
+        status = {"status": "ok", "graphs": len(registry), "active_threads": len(service.locks)}
+        if service.coalescer is not None:
+            status["coalescing"] = service.coalescer.stats()
+        return json_response(status)
+
+    @app.get("/graphs")
+    async def list_graphs():
+        return json_response([spec.describe() for spec in registry])
+
+    @app.post("/graphs/{name}/invoke")
+    async def invoke(name: str, request: InvokeRequest):
+        spec_or_404(name)
+        return json_response(await service.invoke(name, request.input, request.thread_id, request.config))
+
+    @app.post("/graphs/{name}/stream")
+    async def stream(name: str, request: StreamRequest):
+        spec_or_404(name)
+
+        async def lines():
+            async for event in service.stream(name, request.input, request.thread_id, request.config, request.stream_mode):
+                yield dumps(event) + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    def event_queue(request: StreamRequest) -> EventQueue:
+        return EventQueue(request.queue_size or stream_queue_size, request.policy or stream_policy)
+
+    def events(name: str, request: StreamRequest):
+        return service.stream(name, request.input, request.thread_id, request.config, request.stream_mode)
+
+    def sse_response(name: str, request: StreamRequest) -> StreamingResponse:
+        spec_or_404(name)
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        frames = sse_frames(events(name, request), event_queue(request), heartbeat_s)
+        return StreamingResponse(frames, media_type="text/event-stream", headers=headers)
+
+    @app.post("/graphs/{name}/sse")
+    async def sse(name: str, request: StreamRequest):
+        return sse_response(name, request)
+
+    @app.get("/graphs/{name}/sse")
+    async def sse_get(
+        name: str,
+        input: str = Query("null", description="JSON 으로 인코딩한 그래프 입력"),
+        thread_id: Optional[str] = None,
+        stream_mode: List[str] = Query(["updates"]),
+        policy: Optional[str] = None,
+        queue_size: Optional[int] = None,
+    ):
+        """브라우저 EventSource 용 (입력은 쿼리 문자열의 JSON)"""
+        try:
+            request = StreamRequest(input=orjson.loads(input), thread_id=thread_id, stream_mode=stream_mode,
+                                    policy=policy, queue_size=queue_size)
+        except (orjson.JSONDecodeError, ValidationError) as e:
+            raise HTTPException(422, str(e)) from None
+        return sse_response(name, request)
+
+    @app.websocket("/graphs/{name}/ws")
+    async def websocket_stream(websocket: WebSocket, name: str, thread_id: Optional[str] = None):
+        """연결 후 StreamRequest JSON 을 보낼 때마다 한 번 실행하고 이벤트를 보냄 (end 후 다음 요청 대기)
+
+        쿼리에 thread_id 를 주면 그 thread 에 고정됩니다. 요청의 thread_id 가 없으면 그 값을 쓰고,
+        다르면 error 이벤트로 거절합니다 (워커 라우터 뒤에서 같은 thread 가 늘 같은 워커에서 실행되도록).
+        """
+        await websocket.accept()
+        if name not in {spec.name for spec in registry}:
+            await websocket.close(code=4404, reason=f"등록되지 않은 그래프: {name}")
+            return
+        try:
+            while True:
+                try:
+                    request = StreamRequest.model_validate_json(await websocket.receive_text())
+                except ValidationError as e:
+                    await websocket.send_text(dumps({"event": "error", "error": "ValidationError", "message": str(e)}).decode())
+                    continue
+                if thread_id is not None:
+                    if request.thread_id not in (None, thread_id):
+                        await websocket.send_text(dumps({
+                            "event": "error", "error": "InvalidRequest",
+                            "message": f"이 소켓은 thread {thread_id} 에 고정되어 있습니다 (요청: {request.thread_id})",
+                        }).decode())
+                        continue
+                    request.thread_id = thread_id
+                async for event in drain(events(name, request), event_queue(request), heartbeat_s):
+                    await websocket.send_text(dumps(event or {"event": "heartbeat"}).decode())
+        except WebSocketDisconnect:
+            pass
+
+    @app.websocket("/graphs/{name}/hil")
+    @app.websocket("/graphs/{name}/threads/{thread_id}/hil")
+    async def websocket_hil(websocket: WebSocket, name: str, thread_id: Optional[str] = None):
+        """thread 하나의 HIL 세션: interrupt 를 push 하고 같은 소켓으로 resume 을 받음 (graph_utils.hil_channel)"""
+        await websocket.accept()
+        try:
+            session = HILSession(service, name, thread_id, websocket.send_text, websocket.receive_text, heartbeat_s)
+        except LookupError as e:    # 등록되지 않은 그래프(KeyError) 또는 상태 없는 그래프
+            await websocket.close(code=4404, reason=str(e))
+            return
+        try:
+            await session.run()
+        except WebSocketDisconnect:
+            pass
+
+    @app.post("/graphs/{name}/threads/{thread_id}/resume")
+    async def resume(name: str, thread_id: str, request: ResumeRequest):
+        spec = spec_or_404(name)
+        if not spec.stateful:
+            raise HTTPException(404, f"{name} 은 상태를 저장하지 않는 그래프입니다")
+        try:
+            return json_response(await service.resume(name, thread_id, request.resume, request.config))
+        except NoPendingInterrupt as e:
+            raise HTTPException(409, str(e)) from None
+
+    @app.get("/graphs/{name}/threads/{thread_id}")
+    async def thread_state(name: str, thread_id: str):
+        spec = spec_or_404(name)
+        if not spec.stateful:
+            raise HTTPException(404, f"{name} 은 상태를 저장하지 않는 그래프입니다")
+        return json_response(await service.state(name, thread_id))
+
+    return app
@@ -0,0 +1,140 @@
+"""
+모델 토큰을 받는 즉시 Tool 결정을 찾아내는 점진적(streaming) JSON 파서
+
+agent_node 는 {"tool_name": ..., "arguments": {...}} 형식의 응답을 기다렸다가
+json.loads 로 파싱합니다. ToolDecisionParser 는 스트리밍 청크를 한 글자씩 따라가며
+최상위 객체의 멤버가 끝나는 지점마다 지금까지의 내용을 닫아서 파싱해 보고,
+tool_name 과 완성된 arguments 가 나오는 순간 결정을 돌려줍니다.
+나머지 토큰(닫는 괄호, 뒤따르는 설명 등)은 기다리지 않아도 됩니다.
+
+JSON 으로 시작하지 않는 응답(일반 문장)은 첫 글자에서 바로 판별되어,
+호출자는 전체 텍스트를 final_response 로 사용하면 됩니다.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+_FENCE_PREFIXES = ("```json", "```")
+
+
+class ToolDecisionParser:
+    """
+    스트리밍 텍스트에서 {"tool_name", "arguments"} 결정을 점진적으로 파싱
+
+    사용법:
+        parser = ToolDecisionParser()
+        for chunk in model.stream(messages):
+            if parser.feed(chunk.content):
+                break                      # parser.decision 사용
+        else:
+            text = parser.text             # 일반 문장 또는 잘못된 JSON
+    """
+
+    def __init__(self, name_key: str = "tool_name", args_key: str = "arguments"):
+        self.name_key = name_key
+        self.args_key = args_key
+        self.text = ""
+        self.decision: Optional[Dict[str, Any]] = None
+        # 상태: "prefix"(앞 공백/코드펜스 대기) → "object"(JSON 추적) → "done" | "text"
+        self._mode = "prefix"
+        self._start = 0
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def is_text(self) -> bool:
+        """JSON 이 아닌 일반 문장으로 판별되었는지"""
+        return self._mode == "text"
+
+    def feed(self, chunk: Any) -> bool:
+        """청크를 추가하고, 결정이 완성되었으면 True"""
+        if not isinstance(chunk, str):
+            chunk = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in chunk or [])
+        self.text += chunk
+        if self._mode == "prefix":
+            self._scan_prefix()
+        if self._mode == "object":
+            self._scan_object()
+        return self.decision is not None
+
+    # ----------------------------------------
+    # 내부 스캐너
+    # ----------------------------------------
+
+    def _scan_prefix(self) -> None:
+        stripped = self.text.lstrip()
+        if not stripped:
+            return
+        offset = len(self.text) - len(stripped)
+        for fence in _FENCE_PREFIXES:
+            if stripped.startswith(fence):
+                stripped = stripped[len(fence):].lstrip()
+                offset = len(self.text) - len(stripped)
+                break
+            if fence.startswith(stripped):
+                return  # 코드펜스가 아직 덜 들어옴
+        if not stripped:
+            return
+        if stripped[0] != "{":
+            self._mode = "text"
+            return
+        self._mode = "object"
+        self._start = self._pos = offset
+
+    def _try_parse(self, end: int, closed: bool) -> None:
+        candidate = self.text[self._start:end] + ("" if closed else "}")
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            return
+        if not isinstance(parsed, dict):
+            return
+        name = parsed.get(self.name_key)
+        args = parsed.get(self.args_key)
+        if isinstance(name, str) and isinstance(args, dict):
+            self.decision = {self.name_key: name, self.args_key: args}
+            self._mode = "done"
+
+    def _scan_object(self) -> None:
+        text = self.text
+        while self._pos < len(text) and self._mode == "object":
+            ch = text[self._pos]
+            self._pos += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1:
+                    # 최상위 멤버(예: arguments 객체)가 막 끝남
+                    self._try_parse(self._pos, closed=False)
+                elif self._depth == 0:
+                    self._try_parse(self._pos, closed=True)
+                    if self._mode == "object":
+                        self._mode = "text"  # 객체가 끝났는데 결정이 없음 → 일반 응답 취급
+            elif ch == "," and self._depth == 1:
+                self._try_parse(self._pos - 1, closed=False)
+
+
+def parse_tool_decision_stream(chunks: Iterable[Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+    """청크 스트림을 결정이 나올 때까지만 소비하고 (decision, 지금까지의 텍스트) 반환
+
+    decision 이 None 이면 스트림을 끝까지 읽은 것이며 텍스트는 전체 응답입니다.
+    """
+    parser = ToolDecisionParser()
+    for chunk in chunks:
+        content = getattr(chunk, "content", chunk)
+        if parser.feed(content):
+            break
+    return parser.decision, parser.text
@@ -0,0 +1,210 @@
+"""
+오타에 강한 과목명 정규화 인덱스 (동의어 사전 + 한글 자모 삭제 이웃 인덱스)
+
+score_example.py 의 router 는 정확히 "국어" / "수학" 일 때만 분기하므로
+"국 어", "kor", "수핵" 같은 입력은 오류로 끝나고 사용자가 다시 입력하게 됩니다.
+
+SubjectIndex 는 입력을 다음 순서로 과목명(정식 이름)에 대응시킵니다.
+
+1. 공백 제거 + 소문자 변환 후 정식 이름/동의어와 정확히 일치 ("국 어", "KOR")
+2. 한글을 자모 단위로 풀어(복합 모음/겹받침도 분해) 편집 거리 이내의 이름을 검색 ("수핵" → ㅅㅜㅎㅐㄱ)
+   가장 가까운 후보가 서로 다른 과목으로 동률이면 애매하다고 보고 None 을 반환합니다.
+
+    subjects = SubjectIndex({"국어": ["korean", "kor"], "수학": ["math"]})
+    subjects.normalize("수핵")  # "수학"
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# ========================================
+# 한글 자모 분해
+# ========================================
+
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+              "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 복합 모음/겹받침을 기본 자모로 분해 (ㅘ → ㅗㅏ, ㄺ → ㄹㄱ) 해서 한 글자 차이가 거리 1이 되도록 함
+_COMPOUND = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+
+def normalize_text(text: str) -> str:
+    """공백 제거 + 소문자"""
+    return "".join(text.split()).lower()
+
+
+def decompose(text: str) -> str:
+    """한글 음절을 자모 문자열로 분해 (그 외 문자는 그대로)"""
+    out = []
+    for ch in normalize_text(text):
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            index = code - _HANGUL_BASE
+            jamo = (_CHOSEONG[index // 588], _JUNGSEONG[(index % 588) // 28], _JONGSEONG[index % 28])
+            for part in jamo:
+                out.append(_COMPOUND.get(part, part))
+        else:
+            out.append(_COMPOUND.get(ch, ch))
+    return "".join(out)
+
+
+def levenshtein(a: str, b: str) -> int:
+    """편집 거리 (삽입/삭제/치환 1)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+# ========================================
+# 삭제 이웃 인덱스 (SymSpell 방식)
+# ========================================
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """word 에서 문자를 최대 max_distance 개 지운 문자열 전부 (word 자신 포함)"""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - result
+        result |= frontier
+    return result
+
+
+class DeletionIndex:
+    """
+    편집 거리 검색용 삭제 이웃 인덱스
+
+    두 문자열의 편집 거리가 k 이하이면 각각에서 최대 k 개를 지운 변형 중 같은 것이 반드시 있으므로,
+    단어마다 삭제 변형을 미리 등록해 두면 질의의 삭제 변형을 dict 에서 찾는 것만으로 후보가 모입니다.
+    BK-tree 는 짧은 자모 문자열에서 가지치기가 거의 되지 않아 단어 수에 비례해 느려지는 반면,
+    이 방식은 질의당 dict 조회 수십 번 + 후보 몇 개의 편집 거리 계산으로 끝납니다.
+    """
+
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._variants: Dict[str, Set[str]] = {}
+        self._values: Dict[str, List[str]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self._values)
+
+    def add(self, word: str, value: str) -> None:
+        values = self._values.setdefault(word, [])
+        if value not in values:
+            values.append(value)
+        for variant in deletes(word, self.max_distance):
+            self._variants.setdefault(variant, set()).add(word)
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str, str]]:
+        """(거리, 단어, 값) 목록을 거리순으로 반환"""
+        max_distance = min(max_distance, self.max_distance)
+        candidates: Set[str] = set()
+        for variant in deletes(word, max_distance):
+            candidates |= self._variants.get(variant, set())
+        found = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            distance = levenshtein(word, candidate)
+            if distance <= max_distance:
+                found.extend((distance, candidate, value) for value in self._values[candidate])
+        found.sort()
+        return found
+
+
+# ========================================
+# 과목 인덱스
+# ========================================
+
+@dataclass(frozen=True)
+class SubjectMatch:
+    """정규화 결과. source 는 "exact" / "fuzzy" 중 하나"""
+    subject: str
+    matched: str
+    distance: int
+    source: str
+
+
+class SubjectIndex:
+    """동의어 사전 + 자모 삭제 이웃 인덱스로 과목명을 정규화"""
+
+    def __init__(
+        self,
+        subjects: Mapping[str, Iterable[str]],
+        max_distance: Optional[int] = None,
+        cache_size: int = 4096,
+    ):
+        """
+        Args:
+            subjects: 정식 과목명 → 동의어/별칭 목록
+            max_distance: 허용 자모 편집 거리 (None 이면 길이에 따라 1~2)
+        """
+        self.subjects = list(subjects)
+        self.max_distance = max_distance
+        self._exact: Dict[str, str] = {}
+        self._index = DeletionIndex(max_distance if max_distance is not None else 2)
+        for subject, aliases in subjects.items():
+            for name in [subject, *aliases]:
+                key = normalize_text(name)
+                self._exact[key] = subject
+                self._index.add(decompose(key), key)
+        self._cache: "OrderedDict[str, Optional[SubjectMatch]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def _allowed_distance(self, jamo: str) -> int:
+        if self.max_distance is not None:
+            return self.max_distance
+        # 짧은 입력에서 거리 2를 허용하면 엉뚱한 과목과 이어지기 쉬움
+        return 1 if len(jamo) <= 6 else 2
+
+    def _lookup(self, text: str) -> Optional[SubjectMatch]:
+        key = normalize_text(text)
+        if not key:
+            return None
+        subject = self._exact.get(key)
+        if subject is not None:
+            return SubjectMatch(subject, key, 0, "exact")
+        jamo = decompose(key)
+        candidates = self._index.search(jamo, self._allowed_distance(jamo))
+        if not candidates:
+            return None
+        best_distance = candidates[0][0]
+        best_subjects = {self._exact[name] for distance, _, name in candidates if distance == best_distance}
+        if len(best_subjects) > 1:
+            return None
+        distance, _, name = candidates[0]
+        return SubjectMatch(self._exact[name], name, distance, "fuzzy")
+
+    def match(self, text: str) -> Optional[SubjectMatch]:
+        """가장 가까운 과목 (없거나 애매하면 None). 결과는 LRU 로 캐시됩니다."""
+        with self._lock:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                return self._cache[text]
+        result = self._lookup(text)
+        with self._lock:
+            self._cache[text] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def normalize(self, text: str) -> Optional[str]:
+        """정식 과목명 (없거나 애매하면 None)"""
+        result = self.match(text)
+        return result.subject if result else None
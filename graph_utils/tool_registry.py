@@ -0,0 +1,271 @@
+"""
+한 번만 만들어 두고 모든 Tool 노드가 공유하는 Tool 레지스트리
+
+예제들은 Tool 을 실행할 때마다 {t.name: t for t in tools} 나 available_tools 딕셔너리를
+새로 만들고, scroe_example_with_llm.py 는 제거된 ToolExecutor 에 의존합니다.
+ToolRegistry 는 생성 시점에
+
+- 이름 → 실행 함수 딕셔너리 (O(1) 디스패치)
+- pydantic 인자 검증기 (Tool 의 args_schema)
+- bind_tools() 에 넘길 OpenAI 형식 JSON 스키마
+
+를 모두 준비해 두고, 실행할 때는 검증 후 원래 함수를 바로 호출합니다.
+Tool 별 실행 지연은 히스토그램으로 기록되고, @pure 로 표시된 Tool 은
+graph_utils.memo.MemoCache 로 결과를 메모이제이션합니다.
+
+tool_node() 는 ToolNode 처럼 tool_calls 를 스레드 풀에서 동시에 실행하고, 각 호출은
+tool.invoke(tool_call, config) 로 실행하므로 콜백(트레이싱 / 스트리밍), Command 반환,
+interrupt() 가 그대로 동작합니다. 캐시되는 것은 이름 → Tool 디스패치와 스키마입니다.
+
+    registry = ToolRegistry([add, multiply])
+    llm.bind_tools(registry.schemas)
+    graph.add_node("tools", registry.tool_node())
+"""
+
+import bisect
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import get_executor_for_config
+from langchain_core.tools import BaseTool, tool as to_tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.errors import GraphBubbleUp
+from langgraph.types import Command
+
+from graph_utils.memo import MemoCache, memo_options_of
+
+# 지연 히스토그램 버킷 상한 (ms). 마지막 버킷은 그 이상 전부
+LATENCY_BUCKETS_MS: Sequence[float] = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class ToolNotFoundError(KeyError):
+    """레지스트리에 없는 Tool 이름"""
+
+
+def _to_content(output: Any) -> str:
+    """ToolNode 와 같은 규칙으로 Tool 결과를 ToolMessage 내용으로 변환"""
+    if isinstance(output, str):
+        return output
+    try:
+        return json.dumps(output, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return str(output)
+
+
+@dataclass
+class LatencyHistogram:
+    """누적 버킷 없이 구간별 개수를 세는 간단한 지연 히스토그램"""
+    buckets: Sequence[float] = LATENCY_BUCKETS_MS
+    counts: List[int] = field(default_factory=list)
+    total: int = 0
+    sum_ms: float = 0.0
+    errors: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, ms: float, error: bool = False) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+            self.total += 1
+            self.sum_ms += ms
+            self.errors += int(error)
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한 기준 근사 분위수 (ms)"""
+        if not self.total:
+            return 0.0
+        target = q * self.total
+        running = 0
+        for i, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={b}ms" for b in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": self.total,
+            "errors": self.errors,
+            "avg_ms": self.sum_ms / self.total if self.total else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class ToolEntry:
+    """레지스트리에 등록된 Tool 하나의 미리 계산된 정보"""
+    name: str
+    tool: BaseTool
+    func: Optional[Callable[..., Any]]
+    validator: Any
+    schema: Dict[str, Any]
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    memo: Optional[MemoCache] = None
+
+    def validate(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        if self.validator is None:
+            return dict(args)
+        model = self.validator.model_validate(args)
+        return {name: getattr(model, name) for name in type(model).model_fields}
+
+    def run(self, args: Dict[str, Any]) -> Any:
+        if self.func is None:
+            # 원래 함수를 꺼낼 수 없는 Tool(비동기 전용 등)은 Tool 자체의 invoke 사용
+            if self.memo is not None:
+                return self.memo.call(args, lambda: self.tool.invoke(args))
+            return self.tool.invoke(args)
+        validated = self.validate(args)
+        if self.memo is not None:
+            # 검증된 인자를 키로 사용하므로 "85" 와 85 가 같은 캐시 항목을 가리킴
+            return self.memo.call(validated, lambda: self.func(**validated))
+        return self.func(**validated)
+
+
+class ToolRegistry:
+    """이름 → Tool 디스패치, 인자 검증기, JSON 스키마를 한 번만 만들어 두는 레지스트리"""
+
+    def __init__(self, tools: Iterable[Any] = ()):
+        self._entries: Dict[str, ToolEntry] = {}
+        self._lock = threading.Lock()
+        self._schemas: List[Dict[str, Any]] = []
+        for t in tools:
+            self.register(t)
+
+    # ----------------------------------------
+    # 등록 / 조회
+    # ----------------------------------------
+
+    def register(self, tool_or_func: Any) -> ToolEntry:
+        """@tool 로 만든 Tool 이나 일반 함수(docstring 필수)를 등록"""
+        t = tool_or_func if isinstance(tool_or_func, BaseTool) else to_tool(tool_or_func)
+        validator = t.args_schema if hasattr(t.args_schema, "model_validate") else None
+        memo_options = memo_options_of(t)
+        entry = ToolEntry(
+            name=t.name,
+            tool=t,
+            func=getattr(t, "func", None),
+            validator=validator,
+            schema=convert_to_openai_tool(t),
+            memo=MemoCache(t.name, memo_options) if memo_options else None,
+        )
+        with self._lock:
+            self._entries[t.name] = entry
+            self._schemas = [e.schema for e in self._entries.values()]
+        return entry
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entry(self, name: str) -> ToolEntry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise ToolNotFoundError(name) from None
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    @property
+    def tools(self) -> List[BaseTool]:
+        return [e.tool for e in self._entries.values()]
+
+    @property
+    def schemas(self) -> List[Dict[str, Any]]:
+        """bind_tools() 에 그대로 넘길 수 있는 캐시된 OpenAI Tool 스키마 목록"""
+        return self._schemas
+
+    # ----------------------------------------
+    # 실행
+    # ----------------------------------------
+
+    def invoke(self, name: str, args: Dict[str, Any]) -> Any:
+        """검증된 인자로 Tool 을 실행하고 지연 시간을 기록"""
+        entry = self.entry(name)
+        start = time.perf_counter()
+        error = False
+        try:
+            return entry.run(args)
+        except Exception:
+            error = True
+            raise
+        finally:
+            entry.histogram.observe((time.perf_counter() - start) * 1000, error)
+
+    def invoke_tool_call(self, tool_call: Dict[str, Any], handle_errors: bool = True,
+                         config: Optional[RunnableConfig] = None) -> Any:
+        """AIMessage.tool_calls 의 항목 하나를 실행해 ToolMessage (Tool 이 Command 를 돌려주면 Command) 로 반환"""
+        name = tool_call["name"]
+        start = time.perf_counter()
+        entry = None
+        error = False
+        try:
+            entry = self.entry(name)
+            if entry.memo is not None:
+                # 검증된 인자를 키로 원래 출력만 캐시 (ToolMessage 는 tool_call_id 가 호출마다 다름)
+                args = tool_call.get("args", {})
+                output = entry.memo.call(entry.validate(args), lambda: entry.tool.invoke(args, config))
+                return ToolMessage(content=_to_content(output), name=name, tool_call_id=tool_call["id"])
+            return entry.tool.invoke({**tool_call, "type": "tool_call"}, config)
+        except GraphBubbleUp:
+            # interrupt() 등 제어 흐름은 오류 메시지로 바꾸지 않고 그래프로 올려보냄
+            raise
+        except Exception as e:
+            error = True
+            if not handle_errors:
+                raise
+            return ToolMessage(
+                content=f"Error: {type(e).__name__}: {e}",
+                name=name,
+                tool_call_id=tool_call["id"],
+                status="error",
+            )
+        finally:
+            if entry is not None:
+                entry.histogram.observe((time.perf_counter() - start) * 1000, error)
+
+    def tool_node(self, messages_key: str = "messages", handle_errors: bool = True) -> Callable[..., Any]:
+        """ToolNode 대신 사용할 노드: 마지막 AIMessage 의 tool_calls 를 동시에 실행"""
+        def tools(state: dict, config: RunnableConfig) -> Any:
+            last = state[messages_key][-1]
+            calls = last.tool_calls if isinstance(last, AIMessage) else []
+            if len(calls) <= 1:
+                outputs = [self.invoke_tool_call(call, handle_errors, config) for call in calls]
+            else:
+                # 실행 config 의 max_concurrency 를 따르고, 컨텍스트(config contextvar)를 작업 스레드에 복사
+                with get_executor_for_config(config) as executor:
+                    outputs = list(executor.map(lambda call: self.invoke_tool_call(call, handle_errors, config), calls))
+            # ToolNode 와 같은 규칙: Command 가 있으면 Command 들과 나머지 ToolMessage 업데이트를 함께 반환
+            commands = [o for o in outputs if isinstance(o, Command)]
+            messages = [o for o in outputs if not isinstance(o, Command)]
+            if not commands:
+                return {messages_key: messages}
+            return commands + ([{messages_key: messages}] if messages else [])
+        return tools
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Tool 별 지연 히스토그램 스냅샷 (메모이제이션 Tool 은 memo 지표 포함)"""
+        stats = {}
+        for name, entry in self._entries.items():
+            stats[name] = entry.histogram.snapshot()
+            if entry.memo is not None:
+                stats[name]["memo"] = entry.memo.stats()
+        return stats
+
+    def memo_stats(self) -> Dict[str, Dict[str, Any]]:
+        """@pure Tool 별 캐시 적중률"""
+        return {name: entry.memo.stats() for name, entry in self._entries.items() if entry.memo is not None}
@@ -0,0 +1,286 @@
+"""
+외부 조회 Tool 용 TTL 캐시 (stale-while-revalidate + single-flight)
+
+get_weather, check_weather, 날씨/뉴스 노드는 느린 외부 API 를 대신하는 함수입니다.
+"서울" 처럼 자주 묻는 키는 바로 응답하도록 @ttl_cache 로 감쌉니다.
+
+- ttl 동안은 캐시된 값을 그대로 반환합니다 (fresh).
+- ttl 이 지나도 stale_ttl 안이라면 오래된 값을 즉시 반환하고,
+  백그라운드에서 키당 한 번만 새로 고칩니다 (stale-while-revalidate).
+- 캐시에 없는 키를 여러 호출이 동시에 요청하면 한 번만 실행하고
+  나머지는 그 결과를 함께 기다립니다 (single-flight).
+- 예외는 캐시하지 않습니다. 기다리던 호출에는 같은 예외가 전달됩니다.
+- async 함수의 single-flight 호출은 별도 태스크로 실행되므로, 기다리던 호출 하나가 취소돼도
+  실행은 계속되고 나머지 호출은 결과를 받습니다 (모두 취소돼도 끝까지 실행해 결과를 저장).
+
+    @tool
+    @ttl_cache(ttl=60, stale_ttl=300)
+    def get_weather(city: str) -> str:
+        ...
+
+async 함수에도 그대로 쓸 수 있습니다 (새로 고침은 같은 이벤트 루프의 태스크로 실행).
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from graph_utils.memo import canonical_key
+
+# 동기 함수의 백그라운드 새로 고침에 쓰는 공용 스레드 풀
+_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ttl-refresh")
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+
+
+@dataclass
+class TTLCacheStats:
+    """캐시 지표"""
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "hit_rate": (self.hits + self.stale_hits) / total if total else 0.0,
+        }
+
+
+class TTLCache:
+    """함수 하나에 붙는 TTL 캐시 본체 (ttl_cache 데코레이터가 생성)"""
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        ttl: float,
+        stale_ttl: float = 0.0,
+        maxsize: int = 1024,
+        key: Optional[Callable[..., Hashable]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.func = func
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.key_func = key
+        self.clock = clock
+        self.stats = TTLCacheStats()
+        self.is_async = inspect.iscoroutinefunction(func)
+        self._signature = inspect.signature(func)
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, Any] = {}
+        self._refreshing: set = set()
+        self._tasks: set = set()
+        self._lock = threading.Lock()
+
+    # ----------------------------------------
+    # 키 / 저장
+    # ----------------------------------------
+
+    def make_key(self, *args: Any, **kwargs: Any) -> Hashable:
+        if self.key_func is not None:
+            return self.key_func(*args, **kwargs)
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return canonical_key(dict(bound.arguments))
+
+    def _lookup(self, key: Hashable) -> Optional[str]:
+        """'fresh' / 'stale' / None (없음 또는 만료). 호출자가 _lock 을 잡고 있어야 함"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = self.clock() - entry.stored_at
+        if age < self.ttl:
+            self._entries.move_to_end(key)
+            return "fresh"
+        if age < self.ttl + self.stale_ttl:
+            return "stale"
+        del self._entries[key]
+        return None
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if self.ttl + self.stale_ttl <= 0:    # single-flight 만 쓰는 경우 (저장해도 바로 만료)
+            return
+        with self._lock:
+            self._entries[key] = _Entry(value, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.pop(self.make_key(*args, **kwargs), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # ----------------------------------------
+    # 동기 경로
+    # ----------------------------------------
+
+    def _refresh(self, key: Hashable, args: tuple, kwargs: dict) -> None:
+        try:
+            self._store(key, self.func(*args, **kwargs))
+        except Exception:
+            with self._lock:
+                self.stats.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        key = self.make_key(*args, **kwargs)
+        with self._lock:
+            state = self._lookup(key)
+            if state == "fresh":
+                self.stats.hits += 1
+                return self._entries[key].value
+            if state == "stale":
+                self.stats.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self.stats.refreshes += 1
+                    _REFRESH_EXECUTOR.submit(self._refresh, key, args, kwargs)
+                return self._entries[key].value
+            waiting = self._inflight.get(key)
+            if waiting is None:
+                future: Future = Future()
+                self._inflight[key] = future
+                self.stats.misses += 1
+            else:
+                self.stats.coalesced += 1
+
+        if waiting is not None:
+            return waiting.result()
+
+        try:
+            value = self.func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    # ----------------------------------------
+    # 비동기 경로
+    # ----------------------------------------
+
+    async def _arefresh(self, key: Hashable, args: tuple, kwargs: dict) -> None:
+        try:
+            self._store(key, await self.func(*args, **kwargs))
+        except Exception:
+            with self._lock:
+                self.stats.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _afill(self, key: Hashable, flight_key: Hashable, args: tuple, kwargs: dict) -> Any:
+        """single-flight 의 실제 호출. 호출자와 분리된 태스크로 실행되어 첫 호출자가 취소돼도 계속됨"""
+        try:
+            value = await self.func(*args, **kwargs)
+            self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(flight_key, None)
+
+    @staticmethod
+    def _retrieve(task: "asyncio.Task") -> None:
+        # 기다리던 호출이 모두 취소돼 아무도 결과를 가져가지 않을 때 "Task exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    async def aget(self, *args: Any, **kwargs: Any) -> Any:
+        key = self.make_key(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        # asyncio 태스크는 루프를 넘어 기다릴 수 없으므로 루프별로 single-flight
+        flight_key = (id(loop), key)
+        with self._lock:
+            state = self._lookup(key)
+            if state == "fresh":
+                self.stats.hits += 1
+                return self._entries[key].value
+            if state == "stale":
+                self.stats.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self.stats.refreshes += 1
+                    # 태스크가 GC 되지 않도록 끝날 때까지 참조를 유지
+                    task = loop.create_task(self._arefresh(key, args, kwargs))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return self._entries[key].value
+            task = self._inflight.get(flight_key)
+            if task is None:
+                # 첫 호출자도 다른 호출자와 똑같이 태스크를 기다리기만 하므로, 누가 취소되든 나머지는 결과를 받음
+                task = loop.create_task(self._afill(key, flight_key, args, kwargs))
+                self._inflight[flight_key] = task
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                task.add_done_callback(self._retrieve)
+                self.stats.misses += 1
+            else:
+                self.stats.coalesced += 1
+
+        return await asyncio.shield(task)
+
+
+def ttl_cache(
+    ttl: float,
+    stale_ttl: float = 0.0,
+    maxsize: int = 1024,
+    key: Optional[Callable[..., Hashable]] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """TTL + stale-while-revalidate + single-flight 캐시 데코레이터
+
+    Args:
+        ttl: 값을 새것으로 취급하는 시간(초)
+        stale_ttl: ttl 이후에도 오래된 값을 즉시 반환하면서 백그라운드로 새로 고치는 시간(초)
+        maxsize: LRU 로 유지할 최대 키 수
+        key: 캐시 키를 만드는 함수 (기본: 인자 이름/값의 정규화된 해시)
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        cache = TTLCache(func, ttl=ttl, stale_ttl=stale_ttl, maxsize=maxsize, key=key, clock=clock)
+
+        if cache.is_async:
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await cache.aget(*args, **kwargs)
+            wrapper = async_wrapper
+        else:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                return cache.get(*args, **kwargs)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,347 @@
+"""
+여러 워커 프로세스를 리스너 하나 뒤에 두는 배포 모드 (thread_id 일관 해싱 라우팅)
+
+파이썬 프로세스 하나는 CPU 를 많이 쓰는 노드(파싱, 임베딩, 평가)를 코어 하나에서만 실행합니다.
+WorkerPool 이 그래프 서버를 N 개 프로세스로 띄우고, create_router() 앱이 하나의 포트에서 요청을 받아
+워커로 전달합니다. 워커들은 같은 SQLite(WAL) 체크포인트 파일을 공유합니다 (service.sqlite_checkpointer).
+
+라우팅 규칙
+- /graphs/{name}/threads/{thread_id}/...  → HashRing 에서 thread_id 가 가리키는 워커
+- POST /graphs/{name}/invoke|stream|sse, GET /graphs/{name}/sse
+  thread_id 가 없으면 라우터가 발급해 넣은 뒤 같은 규칙으로 보냄 (상태 없는 그래프는 무시하므로 고르게 분산)
+- WS /graphs/{name}/hil 은 thread_id 를 발급해 /graphs/{name}/threads/{thread_id}/hil 로 연결
+- WS /graphs/{name}/ws?thread_id=... 는 쿼리의 thread_id 로 (워커는 소켓을 그 thread 에 고정)
+- 나머지 (/health, /graphs, thread_id 쿼리가 없는 WS /graphs/{name}/ws) 는 순서대로 돌아가며 보냄
+  → 상태 있는 그래프를 /ws 로 스트리밍하려면 thread_id 쿼리를 붙여야 순서가 보장됩니다.
+
+한 thread 의 요청이 늘 같은 워커로 가므로 워커 안의 스레드 잠금(ThreadLocks)이 프로세스 전체에서도
+순서를 보장하고, 워커의 캐시(임베딩, Tool 메모 등)도 계속 재사용됩니다.
+워커가 죽으면 같은 포트로 다시 띄우므로 해시 링은 바뀌지 않습니다.
+
+    pool = WorkerPool(lambda port: [sys.executable, "graph_server.py", "--port", str(port), "--checkpoint", path], 4)
+    uvicorn.run(create_router(pool.urls, pool), port=8000)     # 워커 시작/재시작/정리는 라우터 앱 수명에 맞춤
+"""
+
+import asyncio
+import bisect
+import hashlib
+import itertools
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+import orjson
+
+THREAD_PATH = re.compile(r"^/graphs/[^/]+/threads/([^/]+)(/|$)")
+RUN_PATH = re.compile(r"^/graphs/[^/]+/(invoke|stream|sse)$")
+HIL_PATH = re.compile(r"^/graphs/([^/]+)/hil$")
+WS_PATH = re.compile(r"^/graphs/[^/]+/ws$")
+HOP_HEADERS = frozenset({"connection", "keep-alive", "transfer-encoding", "upgrade", "host", "content-length"})
+STDERR_TAIL_LINES = 50
+
+
+# ========================================
+# 일관 해싱
+# ========================================
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """가상 노드를 둔 일관 해싱 링. 노드가 추가/제거되면 약 1/N 의 키만 옮겨감"""
+
+    def __init__(self, nodes: Sequence[str] = (), replicas: int = 64):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        for i in range(self.replicas):
+            point = _hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        kept = [(p, n) for p, n in zip(self._points, self._owners) if n != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [n for _, n in kept]
+
+    def node(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("해시 링에 노드가 없습니다")
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(dict.fromkeys(self._owners))
+
+
+# ========================================
+# 워커 프로세스
+# ========================================
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class WorkerPool:
+    """command(port) 로 워커 프로세스 N 개를 띄우고, 죽으면 같은 포트로 다시 띄움"""
+
+    def __init__(
+        self,
+        command: Callable[[int], List[str]],
+        workers: int,
+        host: str = "127.0.0.1",
+        startup_timeout: float = 120.0,
+    ):
+        if workers < 1:
+            raise ValueError("workers 는 1 이상이어야 합니다")
+        self.command = command
+        self.host = host
+        self.startup_timeout = startup_timeout
+        self.ports = [free_port(host) for _ in range(workers)]
+        self.processes: Dict[int, subprocess.Popen] = {}
+        self.stderr_tails: Dict[int, Deque[str]] = {}
+        self._drains: Dict[int, threading.Thread] = {}
+        self.restarts = 0
+
+    @property
+    def urls(self) -> List[str]:
+        return [f"http://{self.host}:{port}" for port in self.ports]
+
+    def _spawn(self, port: int) -> None:
+        process = subprocess.Popen(self.command(port), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        tail: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        drain = threading.Thread(target=self._drain, args=(port, process, tail), name=f"worker-stderr-{port}", daemon=True)
+        self.processes[port], self.stderr_tails[port], self._drains[port] = process, tail, drain
+        drain.start()
+
+    @staticmethod
+    def _drain(port: int, process: subprocess.Popen, tail: Deque[str]) -> None:
+        """워커 stderr 를 계속 읽어 라우터 stderr 로 넘기고 마지막 몇 줄만 남김 (파이프가 차서 워커가 멈추지 않도록)"""
+        for raw in process.stderr:
+            line = raw.decode(errors="replace").rstrip()
+            tail.append(line)
+            print(f"[worker {port}] {line}", file=sys.stderr, flush=True)
+        process.stderr.close()
+
+    def _wait_ready(self, ports: Sequence[int]) -> None:
+        import httpx
+
+        waiting = set(ports)
+        deadline = time.time() + self.startup_timeout
+        while waiting and time.time() < deadline:
+            for port in list(waiting):
+                process = self.processes[port]
+                if process.poll() is not None:
+                    self._drains[port].join(timeout=1)    # 남은 출력까지 tail 에 모이도록
+                    raise RuntimeError(f"워커 시작 실패 (포트 {port}): " + "\n".join(self.stderr_tails[port]))
+                try:
+                    if httpx.get(f"http://{self.host}:{port}/health", timeout=1).status_code == 200:
+                        waiting.discard(port)
+                except httpx.TransportError:
+                    pass
+            time.sleep(0.2)
+        if waiting:
+            raise RuntimeError(f"워커가 {self.startup_timeout:.0f}초 안에 뜨지 않았습니다: {sorted(waiting)}")
+
+    def start(self) -> "WorkerPool":
+        """모든 워커를 띄우고 /health 가 응답할 때까지 기다림"""
+        for port in self.ports:
+            self._spawn(port)
+        try:
+            self._wait_ready(self.ports)
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def alive(self) -> Dict[str, bool]:
+        return {f"http://{self.host}:{port}": process.poll() is None for port, process in self.processes.items()}
+
+    async def watch(self, interval: float = 1.0) -> None:
+        """죽은 워커를 같은 포트로 다시 띄우는 감시 루프 (라우터 앱의 수명 동안 실행)
+
+        재시작이 실패해도 루프는 멈추지 않고, 다음 주기에 다시 죽은 것으로 보고 또 띄웁니다.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            for port, process in list(self.processes.items()):
+                if process.poll() is not None:
+                    print(f"⚠️ 워커 종료 감지 (포트 {port}, 코드 {process.returncode}) → 재시작")
+                    try:
+                        self._spawn(port)
+                        self.restarts += 1
+                        await asyncio.to_thread(self._wait_ready, [port])
+                    except Exception as e:
+                        print(f"⚠️ 워커 재시작 실패 (포트 {port}): {type(e).__name__}: {e}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        for process in self.processes.values():
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+# ========================================
+# 라우터 앱
+# ========================================
+
+Query = List[Tuple[str, str]]
+
+
+def route(method: str, path: str, query: Query, body: bytes) -> Tuple[Optional[str], str, Query, bytes]:
+    """요청의 라우팅 키(thread_id)를 정하고, 필요하면 thread_id 를 발급해 넣은 (키, 경로, 쿼리, 본문)
+
+    쿼리는 같은 이름이 여러 번 올 수 있어(stream_mode=messages&stream_mode=custom) (이름, 값) 목록으로 다룹니다.
+    """
+    match = THREAD_PATH.match(path)
+    if match:
+        return match.group(1), path, query, body
+    if RUN_PATH.match(path):
+        if method == "GET":
+            thread_id = dict(query).get("thread_id")
+            if not thread_id:
+                thread_id = uuid.uuid4().hex
+                query = [(name, value) for name, value in query if name != "thread_id"] + [("thread_id", thread_id)]
+            return thread_id, path, query, body
+        try:
+            payload = orjson.loads(body or b"{}")
+        except orjson.JSONDecodeError:
+            return None, path, query, body    # 워커가 422 로 응답
+        if isinstance(payload, dict):
+            if not payload.get("thread_id"):
+                payload["thread_id"] = uuid.uuid4().hex
+                body = orjson.dumps(payload)
+            return str(payload["thread_id"]), path, query, body
+    return None, path, query, body
+
+
+def create_router(worker_urls: Sequence[str], pool: Optional[WorkerPool] = None, replicas: int = 64, title: str = "LangGraph 워커 라우터"):
+    """워커 앞에서 thread_id 일관 해싱으로 HTTP / WebSocket 요청을 전달하는 FastAPI 앱
+
+    Args:
+        pool: 주어지면 앱 시작 시 워커를 띄우고(pool.start), 떠 있는 동안 죽은 워커를 다시 띄우며,
+              종료 시 워커를 정리합니다. /pool 에 상태를 보여줍니다.
+    """
+    import contextlib
+
+    import httpx
+    from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+    from fastapi.responses import Response, StreamingResponse
+    from starlette.background import BackgroundTask
+    from websockets.exceptions import ConnectionClosed
+
+    try:
+        from websockets.asyncio.client import connect    # websockets>=13
+    except ImportError:
+        from websockets.client import connect    # requirements.txt 의 websockets==12.0 (legacy 클라이언트, 같은 close_code / close_reason)
+
+    ring = HashRing(worker_urls, replicas)
+    round_robin = itertools.cycle(worker_urls)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=256)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        # uvicorn 은 종료 신호를 처리한 뒤 같은 신호를 다시 발생시키므로 워커 정리는 uvicorn.run 뒤가 아니라 여기서 함
+        watcher = None
+        if pool is not None:
+            await asyncio.to_thread(pool.start)
+            watcher = asyncio.create_task(pool.watch())
+        app.state.client = httpx.AsyncClient(limits=limits, timeout=None)
+        try:
+            yield
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                await asyncio.to_thread(pool.stop)
+            await app.state.client.aclose()
+
+    app = FastAPI(title=title, lifespan=lifespan)
+    app.state.ring = ring
+
+    def pick(key: Optional[str]) -> str:
+        return ring.node(key) if key is not None else next(round_robin)
+
+    @app.get("/pool")
+    async def pool_status():
+        status = {"workers": list(worker_urls), "replicas": replicas}
+        if pool is not None:
+            status.update(alive=pool.alive(), restarts=pool.restarts)
+        return Response(orjson.dumps(status), media_type="application/json")
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
+    async def forward(request: Request, path: str):
+        key, path, query, body = route(request.method, "/" + path, request.query_params.multi_items(), await request.body())
+        worker = pick(key)
+        url = f"{worker}{path}" + (f"?{urlencode(query)}" if query else "")
+        headers = {name: value for name, value in request.headers.items() if name.lower() not in HOP_HEADERS}
+        client: httpx.AsyncClient = request.app.state.client
+        try:
+            upstream = await client.send(client.build_request(request.method, url, content=body, headers=headers), stream=True)
+        except httpx.TransportError as e:
+            return Response(orjson.dumps({"detail": f"워커 연결 실패 ({worker}): {type(e).__name__}"}),
+                            status_code=502, media_type="application/json")
+        response_headers = {name: value for name, value in upstream.headers.items() if name.lower() not in HOP_HEADERS}
+        return StreamingResponse(upstream.aiter_raw(), status_code=upstream.status_code, headers=response_headers,
+                                 background=BackgroundTask(upstream.aclose))
+
+    @app.websocket("/{path:path}")
+    async def forward_websocket(websocket: WebSocket, path: str):
+        path = "/" + path
+        match = HIL_PATH.match(path)
+        if match:
+            path = f"/graphs/{match.group(1)}/threads/{uuid.uuid4().hex}/hil"
+        thread = THREAD_PATH.match(path)
+        if thread:
+            key = thread.group(1)
+        else:
+            key = websocket.query_params.get("thread_id") if WS_PATH.match(path) else None
+        worker = pick(key or None)
+        query = websocket.url.query
+        url = worker.replace("http", "ws", 1) + path + (f"?{query}" if query else "")
+        await websocket.accept()
+        try:
+            async with connect(url, max_size=None) as upstream:
+                async def upward():
+                    while True:
+                        await upstream.send(await websocket.receive_text())
+
+                async def downward():
+                    async for message in upstream:
+                        await websocket.send_text(message if isinstance(message, str) else message.decode())
+
+                downward_task = asyncio.create_task(downward())
+                tasks = [asyncio.create_task(upward()), downward_task]
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in done:
+                    task.exception()    # 끊김 예외는 여기서 회수
+                if downward_task in done:    # 워커가 먼저 닫음 → 같은 코드로 클라이언트도 닫음 (예: 4404)
+                    await websocket.close(code=upstream.close_code or 1000, reason=upstream.close_reason or "")
+        except (WebSocketDisconnect, ConnectionClosed):
+            pass
+        except OSError as e:
+            await websocket.close(code=1011, reason=f"워커 연결 실패: {type(e).__name__}")
+
+    return app
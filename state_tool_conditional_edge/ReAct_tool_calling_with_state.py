@@ -1,5 +1,11 @@
 from typing import TypedDict, Literal
 from langgraph.graph import StateGraph, END
+import sys
+from pathlib import Path
+
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.keyword_router import KeywordRouter
 
 # State 정의
 class GraphState(TypedDict):
@@ -17,17 +23,18 @@ def calculator_tool(query: str) -> str:
 def search_tool(query: str) -> str:
     return f"검색 결과: Python은 프로그래밍 언어입니다."
 
+# 도구 → 키워드 표 (위에 있을수록 우선순위가 높음). 오토마톤은 한 번만 만듭니다.
+tool_router = KeywordRouter({
+    "weather": ["날씨"],
+    "calculator": ["계산", "더하기"],
+}, default="search")
+
 # Node 1: LLM이 tool을 선택 (Mock)
 def select_tool_node(state: GraphState) -> GraphState:
     query = state["query"]
     
-    # 실제로는 LLM이 선택하지만, 여기서는 간단한 규칙으로 대체
-    if "날씨" in query:
-        state["tool"] = "weather"
-    elif "계산" in query or "더하기" in query:
-        state["tool"] = "calculator"
-    else:
-        state["tool"] = "search"
+    # 실제로는 LLM이 선택하지만, 여기서는 간단한 규칙으로 대체 (질의를 한 번만 훑음)
+    state["tool"] = tool_router.route(query)
     
     print(f"선택된 도구: {state['tool']}")
     return state
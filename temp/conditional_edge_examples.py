@@ -1,31 +1,73 @@
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.prebuilt import ToolNode
-from typing import Literal
+from typing import Literal, Optional
+import asyncio
+import functools
+import sys
+from pathlib import Path
+
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.history import HistoryManager, make_history_node
+from graph_utils.hybrid_index import HybridIndex
+from graph_utils.intent_router import calibrated_router
+from graph_utils.keyword_router import KeywordRouter
+from graph_utils.rate_limit import governed
+from graph_utils.retry import RetryPolicy
+from graph_utils.safe_eval import safe_eval
+from graph_utils.tool_registry import ToolRegistry
+from graph_utils.ttl_cache import ttl_cache
 
 # Tools
 @tool
 def calculate(expression: str) -> str:
     """수식을 계산합니다."""
     try:
-        result = eval(expression)
+        # eval 대신 산술식만 허용하는 안전한 평가기 사용 (컴파일 결과는 캐시됨)
+        result = safe_eval(expression)
         return f"결과: {result}"
     except:
         return "계산 오류"
 
+# 외부 API 를 대신하는 조회 Tool: 인기 도시는 캐시에서 바로 응답
 @tool
+@ttl_cache(ttl=60, stale_ttl=300)
 def check_weather(city: str) -> str:
     """날씨를 확인합니다."""
     return f"{city}의 날씨는 맑음입니다."
 
+# 검색 Tool 이 조회하는 문서 (id, 본문)
+SEARCH_DOCUMENTS = [
+    ("langgraph-intro", "LangGraph 소개: 상태 그래프로 에이전트 워크플로우를 만드는 라이브러리"),
+    ("langgraph-hil", "LangGraph Human-in-the-Loop: interrupt 로 실행을 멈추고 사람의 승인을 받는 방법"),
+    ("rag-basics", "RAG 기초: 벡터 검색으로 찾은 문서를 프롬프트에 넣어 답변 품질을 높이기"),
+    ("tylenol", "타이레놀정 500mg (ATC-N02BE01) 해열진통제 복용 안내"),
+]
+
+@functools.lru_cache(maxsize=None)
+def get_search_index() -> HybridIndex:
+    """프로세스 내 하이브리드 인덱스 (BM25 + 벡터, 문서는 add 로 계속 추가 가능)
+    임베딩 모델은 import 시점이 아니라 첫 검색에서 불러옴"""
+    index = HybridIndex()
+    index.add([doc_id for doc_id, _ in SEARCH_DOCUMENTS], [text for _, text in SEARCH_DOCUMENTS])
+    return index
+
 @tool
 def search_web(query: str) -> str:
     """웹을 검색합니다."""
-    return f"'{query}' 검색 결과입니다."
+    hits = get_search_index().query(query, k=3)
+    if not hits:
+        return f"'{query}' 검색 결과가 없습니다."
+    return f"'{query}' 검색 결과: " + " / ".join(hit.text for hit in hits)
 
 tools = [calculate, check_weather, search_web]
+# 모든 Tool 노드가 공유하는 레지스트리 (디스패치/검증기/스키마를 한 번만 생성)
+registry = ToolRegistry(tools)
+
+# MessagesState 루프에서 메시지가 끝없이 늘어나지 않도록 토큰 예산으로 관리
+history_manager = HistoryManager(max_tokens=2000)
 
 
 # ============================================
@@ -34,8 +76,8 @@ tools = [calculate, check_weather, search_web]
 print("=== 예제 1: IF-ELSE (tool 호출 여부) ===\n")
 
 def agent_ifelse(state: MessagesState):
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-    llm_with_tools = llm.bind_tools(tools)
+    llm = governed(ChatOpenAI(model="gpt-4o-mini", temperature=0))
+    llm_with_tools = llm.bind_tools(registry.schemas)
     response = llm_with_tools.invoke(state["messages"])
     return {"messages": [response]}
 
@@ -48,12 +90,14 @@ def route_ifelse(state: MessagesState) -> Literal["tools", "end"]:
         return "end"
 
 graph_ifelse = StateGraph(MessagesState)
+graph_ifelse.add_node("history", make_history_node(history_manager))
 graph_ifelse.add_node("agent", agent_ifelse)
-graph_ifelse.add_node("tools", ToolNode(tools))
+graph_ifelse.add_node("tools", registry.tool_node())
 
-graph_ifelse.add_edge(START, "agent")
+graph_ifelse.add_edge(START, "history")
+graph_ifelse.add_edge("history", "agent")
 graph_ifelse.add_conditional_edges("agent", route_ifelse, {"tools": "tools", "end": END})
-graph_ifelse.add_edge("tools", "agent")
+graph_ifelse.add_edge("tools", "history")
 
 app_ifelse = graph_ifelse.compile()
 
@@ -66,29 +110,57 @@ print(f"답변: {result['messages'][-1].content}\n")
 # ============================================
 print("=== 예제 2: SWITCH (의도 분류) ===\n")
 
+# 기존 키워드 규칙이 1차 분류 (위에 있을수록 우선순위가 높음)
+intent_keyword_router = KeywordRouter({
+    "calculate": ["계산", "+", "-"],
+    "weather": ["날씨"],
+    "search": ["검색"],
+})
+
+# 의도별 예시 문장 → 센트로이드 (키워드가 없는 바꿔 말한 질문도 분류)
+INTENT_EXAMPLES = {
+    "calculate": ["10+5 계산해줘", "3 곱하기 4는 얼마야?", "100 나누기 7 해줘", "(3+4)*2 값 구해줘", "두 수를 더하면?"],
+    "weather": ["서울 날씨 알려줘", "내일 비 와?", "오늘 우산 챙겨야 할까?", "부산 기온이 몇 도야?", "주말 날씨 어때?"],
+    "search": ["LangGraph 검색해줘", "파이썬 튜토리얼 찾아줘", "최신 AI 논문 알아봐줘", "이 회사 정보 조사해줘", "관련 자료 찾아봐"],
+}
+
+def classify_intent_with_llm(text: str) -> Optional[str]:
+    """임베딩 유사도가 낮을 때만 호출되는 LLM 분류"""
+    llm = governed(ChatOpenAI(model="gpt-4o-mini", temperature=0))
+    answer = llm.invoke([
+        SystemMessage(content="사용자 요청을 calculate, weather, search, end 중 하나로만 분류해 그 단어만 답하세요."),
+        HumanMessage(content=text),
+    ])
+    return str(answer.content).strip().lower()
+
+@functools.lru_cache(maxsize=None)
+def embedding_intent_router():
+    """키워드가 없는 질의가 처음 들어올 때 만드는 센트로이드 라우터
+    (임계값은 CALIBRATED_THRESHOLDS 또는 INTENT_ROUTER_THRESHOLD, 없으면 경고 후 None)"""
+    return calibrated_router(INTENT_EXAMPLES, fallback=classify_intent_with_llm, default="end")
+
 def classify_intent(state: MessagesState) -> Literal["calculate", "weather", "search", "end"]:
-    """SWITCH: 사용자 의도를 분류"""
-    user_message = state["messages"][0].content.lower()
-
-    if "계산" in user_message or "+" in user_message or "-" in user_message:
-        return "calculate"
-    elif "날씨" in user_message:
-        return "weather"
-    elif "검색" in user_message:
-        return "search"
-    else:
-        return "end"
+    """SWITCH: 키워드 규칙 → (키워드가 없으면) 센트로이드와의 행렬곱 한 번 → 애매하면 LLM"""
+    text = state["messages"][0].content
+    intent = intent_keyword_router.route(text)
+    if intent is not None:
+        return intent
+    router = embedding_intent_router()
+    if router is not None:
+        return router.route(text).intent
+    intent = classify_intent_with_llm(text)
+    return intent if intent in INTENT_EXAMPLES else "end"
 
 def calculate_node(state: MessagesState):
-    tool_result = calculate.invoke({"expression": "10+5"})
+    tool_result = registry.invoke("calculate", {"expression": "10+5"})
     return {"messages": [AIMessage(content=f"계산 완료: {tool_result}")]}
 
 def weather_node(state: MessagesState):
-    tool_result = check_weather.invoke({"city": "서울"})
+    tool_result = registry.invoke("check_weather", {"city": "서울"})
     return {"messages": [AIMessage(content=tool_result)]}
 
 def search_node(state: MessagesState):
-    tool_result = search_web.invoke({"query": "LangGraph"})
+    tool_result = registry.invoke("search_web", {"query": "LangGraph"})
     return {"messages": [AIMessage(content=tool_result)]}
 
 def default_node(state: MessagesState):
@@ -135,10 +207,11 @@ class LoopState(TypedDict):
     retry_count: int
     max_retries: int
 
-def agent_loop(state: LoopState):
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-    llm_with_tools = llm.bind_tools(tools)
-    response = llm_with_tools.invoke(state["messages"])
+async def agent_loop(state: LoopState):
+    llm = governed(ChatOpenAI(model="gpt-4o-mini", temperature=0))
+    llm_with_tools = llm.bind_tools(registry.schemas)
+    # LoopState는 add_messages 리듀서가 없으므로 프롬프트만 예산에 맞게 줄여서 보냄
+    response = await llm_with_tools.ainvoke(history_manager.prepare(state["messages"]))
     return {"messages": [response]}
 
 def check_loop(state: LoopState) -> Literal["tools", "retry", "end"]:
@@ -161,9 +234,19 @@ def retry_node(state: LoopState):
         "retry_count": state["retry_count"] + 1
     }
 
+def needs_retry(result: dict) -> bool:
+    """tool 호출 없이 "오류" 응답이 나오면 재시도 대상"""
+    last_message = result["messages"][-1]
+    return not last_message.tool_calls and "오류" in last_message.content
+
+# 재시도를 노드 안에서 백오프+지터로 처리 → 재시도마다 superstep/체크포인트를 쓰지 않음
+# (정책의 시도 횟수를 다 써도 실패하면 기존 retry 경로가 마지막 안전장치로 동작)
+# wrap_async 는 백오프를 asyncio.sleep 으로 기다리므로 워커 스레드를 붙잡지 않음 (그래프는 ainvoke 로 실행)
+agent_retry_policy = RetryPolicy(max_attempts=3, base_delay=0.2, retry_if=needs_retry)
+
 graph_loop = StateGraph(LoopState)
-graph_loop.add_node("agent", agent_loop)
-graph_loop.add_node("tools", ToolNode(tools))
+graph_loop.add_node("agent", agent_retry_policy.wrap_async(agent_loop))
+graph_loop.add_node("tools", registry.tool_node())
 graph_loop.add_node("retry", retry_node)
 
 graph_loop.add_edge(START, "agent")
@@ -177,11 +260,11 @@ graph_loop.add_edge("retry", "agent")
 
 app_loop = graph_loop.compile()
 
-result = app_loop.invoke({
+result = asyncio.run(app_loop.ainvoke({
     "messages": [HumanMessage(content="서울 날씨 알려줘")],
     "retry_count": 0,
     "max_retries": 2
-})
+}))
 
 print("실행 흐름:")
 for msg in result["messages"]:
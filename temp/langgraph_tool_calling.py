@@ -2,19 +2,30 @@ from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.prebuilt import ToolNode
-
-# Tools 정의
+import sys
+from pathlib import Path
+
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.history import HistoryManager, make_history_node
+from graph_utils.memo import pure
+from graph_utils.rate_limit import governed
+from graph_utils.tool_registry import ToolRegistry
+
+# Tools 정의 (@pure: 같은 인자 → 같은 결과이므로 레지스트리에서 메모이제이션)
+@pure
 @tool
 def add(a: int, b: int) -> int:
     """두 숫자를 더합니다."""
     return a + b
 
+@pure
 @tool
 def multiply(a: int, b: int) -> int:
     """두 숫자를 곱합니다."""
     return a * b
 
+@pure
 @tool
 def search_db(query: str) -> str:
     """데이터베이스에서 정보를 검색합니다."""
@@ -25,17 +36,24 @@ def search_db(query: str) -> str:
     return db.get(query, "정보 없음")
 
 tools = [add, multiply, search_db]
+# 디스패치/인자 검증기/스키마를 한 번만 만들어 두는 레지스트리
+registry = ToolRegistry(tools)
 
 
 # Agent 노드 (context에서 LLM 가져옴)
 def agent(state: MessagesState):
     """LLM이 다음 행동을 결정"""
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-    llm_with_tools = llm.bind_tools(tools)
+    llm = governed(ChatOpenAI(model="gpt-4o-mini", temperature=0))
+    llm_with_tools = llm.bind_tools(registry.schemas)
     response = llm_with_tools.invoke(state["messages"])
     return {"messages": [response]}
 
 
+# 히스토리 관리 노드: 토큰 예산을 넘으면 오래된 대화를 요약으로 접어 넣음
+history_manager = HistoryManager(max_tokens=2000)
+history = make_history_node(history_manager)
+
+
 # 라우팅 함수
 def should_continue(state: MessagesState):
     """tool 호출이 필요한지 판단"""
@@ -48,12 +66,14 @@ def should_continue(state: MessagesState):
 # 그래프 구성
 graph = StateGraph(MessagesState)
 
+graph.add_node("history", history)
 graph.add_node("agent", agent)
-graph.add_node("tools", ToolNode(tools))
+graph.add_node("tools", registry.tool_node())
 
-graph.add_edge(START, "agent")
+graph.add_edge(START, "history")
+graph.add_edge("history", "agent")
 graph.add_conditional_edges("agent", should_continue, ["tools", END])
-graph.add_edge("tools", "agent")
+graph.add_edge("tools", "history")
 
 app = graph.compile()
 
@@ -101,7 +121,7 @@ for event in app.stream({
 }):
     for node_name, node_state in event.items():
         print(f"[{node_name}]")
-        if "messages" in node_state:
+        if node_state and "messages" in node_state:
             last_msg = node_state["messages"][-1]
             if hasattr(last_msg, 'tool_calls') and last_msg.tool_calls:
                 print(f"  Tool 호출: {last_msg.tool_calls}")
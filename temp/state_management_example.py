@@ -4,13 +4,20 @@ from langchain_core.messages import HumanMessage, AIMessage
 from langgraph.graph import StateGraph, START, END
 from typing import TypedDict, Annotated, Literal
 import operator
+import sys
+from pathlib import Path
+
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.safe_eval import safe_eval
 
 # Tools
 @tool
 def calculate(expression: str) -> float:
     """수식을 계산합니다."""
     try:
-        return eval(expression)
+        # eval 대신 산술식만 허용하는 안전한 평가기 사용 (컴파일 결과는 캐시됨)
+        return safe_eval(expression)
     except:
         return None
 
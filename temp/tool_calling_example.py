@@ -1,19 +1,34 @@
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, ToolMessage
-
-# 1. 기본 tool 정의
+from langchain_core.messages import HumanMessage
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 저장소 루트의 graph_utils 패키지를 사용하기 위해 경로를 추가합니다.
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from graph_utils.catalog import ProductCatalog, build_catalog
+from graph_utils.memo import pure
+from graph_utils.tool_registry import ToolRegistry
+from graph_utils.ttl_cache import ttl_cache
+
+# 1. 기본 tool 정의 (@pure: 같은 인자 → 같은 결과이므로 레지스트리에서 메모이제이션)
+@pure
 @tool
 def add(a: int, b: int) -> int:
     """두 숫자를 더합니다."""
     return a + b
 
+@pure
 @tool
 def multiply(a: int, b: int) -> int:
     """두 숫자를 곱합니다."""
     return a * b
 
+# 외부 API 를 대신하는 조회 Tool: 60초 TTL + 이후 5분간 오래된 값을 주면서 백그라운드 갱신
 @tool
+@ttl_cache(ttl=60, stale_ttl=300)
 def get_weather(city: str) -> str:
     """도시의 날씨를 조회합니다."""
     weather_data = {
@@ -23,21 +38,35 @@ def get_weather(city: str) -> str:
     }
     return weather_data.get(city, "날씨 정보 없음")
 
+# 상품 카탈로그: 미리 만든 인덱스 파일을 메모리 맵으로 열어 사용
+# (PRODUCT_CATALOG_DIR 이 없으면 임시 디렉터리에 예제용 카탈로그를 만듭니다)
+CATALOG_DIR = Path(os.environ.get("PRODUCT_CATALOG_DIR", Path(tempfile.gettempdir()) / "langgraph_study_catalog"))
+SAMPLE_PRODUCTS = [
+    (f"{keyword} 제품 {grade}", price)
+    for keyword in ["노트북", "키보드", "마우스", "모니터"]
+    for grade, price in [("A", 30000), ("B", 45000), ("C", 60000)]
+]
+if (CATALOG_DIR / "meta.json").exists():
+    catalog = ProductCatalog.open(CATALOG_DIR)
+else:
+    catalog = build_catalog(CATALOG_DIR, SAMPLE_PRODUCTS)
+
+PAGE_SIZE = 10
+
+@pure
 @tool
-def search_product(keyword: str, max_price: int = 50000) -> list:
-    """키워드로 상품을 검색합니다."""
-    products = [
-        {"name": f"{keyword} 제품 A", "price": 30000},
-        {"name": f"{keyword} 제품 B", "price": 45000},
-        {"name": f"{keyword} 제품 C", "price": 60000}
-    ]
-    return [p for p in products if p["price"] <= max_price]
+def search_product(keyword: str, max_price: int = 50000, page: int = 1) -> list:
+    """키워드로 상품을 검색합니다. 가격이 낮은 순으로 한 페이지(10개)씩 반환합니다."""
+    result = catalog.search(keyword, max_price=max_price, limit=PAGE_SIZE, offset=(max(page, 1) - 1) * PAGE_SIZE)
+    return [item.to_dict() for item in result.items]
 
 
 # 2. LLM에 tool 바인딩
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 tools = [add, multiply, get_weather, search_product]
-llm_with_tools = llm.bind_tools(tools)
+# 이름 → Tool 디스패치, 인자 검증기, JSON 스키마를 한 번만 만들어 둠
+registry = ToolRegistry(tools)
+llm_with_tools = llm.bind_tools(registry.schemas)
 
 
 # 케이스 1: 단일 tool 호출
@@ -51,8 +80,7 @@ if ai_msg.tool_calls:
         tool_name = tool_call["name"]
         tool_args = tool_call["args"]
 
-        selected_tool = {t.name: t for t in tools}[tool_name]
-        result = selected_tool.invoke(tool_args)
+        result = registry.invoke(tool_name, tool_args)
         print(f"Tool 실행 결과: {result}")
 
 
@@ -65,8 +93,7 @@ print(f"호출된 tool 수: {len(ai_msg.tool_calls)}")
 for tool_call in ai_msg.tool_calls:
     tool_name = tool_call["name"]
     tool_args = tool_call["args"]
-    selected_tool = {t.name: t for t in tools}[tool_name]
-    result = selected_tool.invoke(tool_args)
+    result = registry.invoke(tool_name, tool_args)
     print(f"{tool_name}({tool_args}) = {result}")
 
 
@@ -77,9 +104,7 @@ ai_msg = llm_with_tools.invoke(messages)
 
 messages.append(ai_msg)
 for tool_call in ai_msg.tool_calls:
-    selected_tool = {t.name: t for t in tools}[tool_call["name"]]
-    result = selected_tool.invoke(tool_call["args"])
-    messages.append(ToolMessage(content=str(result), tool_call_id=tool_call["id"]))
+    messages.append(registry.invoke_tool_call(tool_call))
 
 final_response = llm_with_tools.invoke(messages)
 print(f"최종 답변: {final_response.content}")
@@ -91,8 +116,7 @@ messages = [HumanMessage(content="노트북을 4만원 이하로 검색해줘")]
 ai_msg = llm_with_tools.invoke(messages)
 
 for tool_call in ai_msg.tool_calls:
-    selected_tool = {t.name: t for t in tools}[tool_call["name"]]
-    result = selected_tool.invoke(tool_call["args"])
+    result = registry.invoke(tool_call["name"], tool_call["args"])
     print(f"검색 결과: {result}")
 
 